@@ -38,6 +38,10 @@ cache = Cache()
 def create_app(config_name='development'):
     app = Flask(__name__)
 
+    # Native datetime/Decimal/Enum encoding, backed by orjson when installed
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # Configuration
     app.config['SECRET_KEY'] = os.getenv(
         'SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -56,29 +60,159 @@ def create_app(config_name='development'):
     app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
     app.config['MAIL_USE_TLS'] = os.getenv(
         'MAIL_USE_TLS', 'true').lower() == 'true'
+    app.config['MAIL_USE_SSL'] = os.getenv(
+        'MAIL_USE_SSL', 'false').lower() == 'true'
     app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
     app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
+    app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER')
+
+    # Mail queue worker: emails per batch (one SMTP connection each), retry
+    # attempts and base backoff in seconds, and sends per domain per minute
+    app.config['MAIL_QUEUE_BATCH_SIZE'] = int(os.getenv('MAIL_QUEUE_BATCH_SIZE', 200))
+    app.config['MAIL_QUEUE_POLL_INTERVAL'] = float(os.getenv('MAIL_QUEUE_POLL_INTERVAL', 5))
+    app.config['MAIL_MAX_ATTEMPTS'] = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+    app.config['MAIL_RETRY_BACKOFF'] = int(os.getenv('MAIL_RETRY_BACKOFF', 60))
+    app.config['MAIL_DOMAIN_RATE_LIMIT'] = int(os.getenv('MAIL_DOMAIN_RATE_LIMIT', 100))
+    # Base URL for links in emails
+    app.config['FRONTEND_URL'] = os.getenv('FRONTEND_URL', 'http://localhost:5173')
 
     # Cache configuration
     app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'simple')
+    app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL')
+    from app.utils.caching import is_shared_cache
     app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+    app.config['DASHBOARD_CACHE_TIMEOUT'] = int(
+        os.getenv('DASHBOARD_CACHE_TIMEOUT', 60))
+
+    # Attempt heartbeats: cached attempt data lifetime and how often buffered
+    # activity timestamps are written (seconds)
+    app.config['ATTEMPT_METADATA_CACHE_TTL'] = int(
+        os.getenv('ATTEMPT_METADATA_CACHE_TTL', 60))
+    app.config['ATTEMPT_ACTIVITY_FLUSH_INTERVAL'] = float(
+        os.getenv('ATTEMPT_ACTIVITY_FLUSH_INTERVAL', 5))
+
+    # Responses of at least COMPRESS_MIN_SIZE bytes are gzip/brotli encoded;
+    # pre-compressed copies of hot resources are kept RESPONSE_CACHE_TTL seconds
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', 6))
+    app.config['RESPONSE_CACHE_TTL'] = int(os.getenv('RESPONSE_CACHE_TTL', 600))
+    # Quiz ETags come from a generation token bumped on commit, and encoded
+    # bodies are cached by tag; both need a cache every process shares. With
+    # a process-local cache responses are tagged by their content instead
+    app.config['VERSIONED_RESPONSES'] = (
+        os.getenv('VERSIONED_RESPONSES')
+        or str(is_shared_cache(app.config['CACHE_TYPE']))).lower() == 'true'
+
+    # Quiz access code lookups: shared-cache lifetime of known codes and of
+    # misses, per-process lifetime, and wrong-guess limits per window
+    app.config['QUIZ_CODE_CACHE_TTL'] = int(os.getenv('QUIZ_CODE_CACHE_TTL', 3600))
+    app.config['QUIZ_CODE_NEGATIVE_TTL'] = int(os.getenv('QUIZ_CODE_NEGATIVE_TTL', 30))
+    app.config['QUIZ_CODE_LOCAL_TTL'] = float(os.getenv('QUIZ_CODE_LOCAL_TTL', 5))
+    app.config['QUIZ_CODE_FAILURE_WINDOW'] = int(os.getenv('QUIZ_CODE_FAILURE_WINDOW', 300))
+    app.config['QUIZ_CODE_MAX_FAILURES_PER_USER'] = int(
+        os.getenv('QUIZ_CODE_MAX_FAILURES_PER_USER', 10))
+    app.config['QUIZ_CODE_MAX_FAILURES_PER_IP'] = int(
+        os.getenv('QUIZ_CODE_MAX_FAILURES_PER_IP', 100))
+    # Key of the permutation that turns sequence numbers into access codes.
+    # Must never change once codes are issued, or new codes may collide
+    app.config['QUIZ_CODE_KEY'] = os.getenv('QUIZ_CODE_KEY', app.config['SECRET_KEY'])
+
+    # Seconds a quiz's violation analytics are kept before a full rebuild;
+    # reads in between only aggregate violations newer than the cached ones
+    app.config['VIOLATION_ANALYTICS_CACHE_TTL'] = int(
+        os.getenv('VIOLATION_ANALYTICS_CACHE_TTL', 3600))
+    # Violations younger than this are re-read on every request rather than
+    # cached; must exceed the longest record_violations transaction, which
+    # MySQL bounds with innodb_lock_wait_timeout (50s by default)
+    app.config['VIOLATION_ANALYTICS_SETTLE_SECONDS'] = int(
+        os.getenv('VIOLATION_ANALYTICS_SETTLE_SECONDS', 120))
+
+    # Report card configuration
+    app.config['REPORT_CARD_CACHE_DIR'] = os.getenv(
+        'REPORT_CARD_CACHE_DIR', os.path.join(app.instance_path, 'report_cards'))
+    app.config['REPORT_RENDER_WORKERS'] = int(
+        os.getenv('REPORT_RENDER_WORKERS', 0)) or None  # None = one per CPU
+
+    # Socket.IO message queue, required once more than one process emits
+    # (e.g. redis://localhost:6379/0; memory:// is an in-process stand-in)
+    app.config['SOCKETIO_MESSAGE_QUEUE'] = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    app.config['SOCKETIO_CHANNEL'] = os.getenv(
+        'SOCKETIO_CHANNEL', 'quizmaster-socketio')
+    # Background workers and CLI jobs only publish to the queue
+    app.config['SOCKETIO_WRITE_ONLY'] = os.getenv(
+        'SOCKETIO_WRITE_ONLY', 'False').lower() == 'true'
+    app.config['SOCKETIO_ASYNC_MODE'] = os.getenv('SOCKETIO_ASYNC_MODE')
+
+    # Notification outbox configuration
+    app.config['NOTIFICATION_OUTBOX_BATCH_SIZE'] = int(
+        os.getenv('NOTIFICATION_OUTBOX_BATCH_SIZE', 100))
+    app.config['NOTIFICATION_OUTBOX_POLL_INTERVAL'] = float(
+        os.getenv('NOTIFICATION_OUTBOX_POLL_INTERVAL', 2))
+    # Failed events are retried with exponential backoff (seconds) and given
+    # up on after this many attempts
+    app.config['NOTIFICATION_OUTBOX_MAX_ATTEMPTS'] = int(
+        os.getenv('NOTIFICATION_OUTBOX_MAX_ATTEMPTS', 5))
+    app.config['NOTIFICATION_OUTBOX_RETRY_BACKOFF'] = int(
+        os.getenv('NOTIFICATION_OUTBOX_RETRY_BACKOFF', 30))
+    # Cached unread counters are recounted from the table at least this often.
+    # The worker bumps them, so they need a cache every process shares; with
+    # a process-local cache (the default) counts are read from the tables
+    app.config['NOTIFICATION_UNREAD_COUNT_TTL'] = int(
+        os.getenv('NOTIFICATION_UNREAD_COUNT_TTL', 900))
+    app.config['NOTIFICATION_UNREAD_COUNT_CACHE'] = (
+        os.getenv('NOTIFICATION_UNREAD_COUNT_CACHE')
+        or str(is_shared_cache(app.config['CACHE_TYPE']))).lower() == 'true'
+
+    # Repeats of a violation/reset notification within the window update the
+    # existing notification; its update emits are debounced
+    app.config['NOTIFICATION_COALESCE_WINDOW'] = int(
+        os.getenv('NOTIFICATION_COALESCE_WINDOW', 300))
+    app.config['NOTIFICATION_COALESCE_DEBOUNCE'] = float(
+        os.getenv('NOTIFICATION_COALESCE_DEBOUNCE', 5))
+
+    # Notification retention job: read notifications are kept this many days,
+    # rows are purged in chunks with a pause in between, every interval seconds
+    app.config['NOTIFICATION_READ_RETENTION_DAYS'] = int(
+        os.getenv('NOTIFICATION_READ_RETENTION_DAYS', 30))
+    app.config['NOTIFICATION_RETENTION_CHUNK_SIZE'] = int(
+        os.getenv('NOTIFICATION_RETENTION_CHUNK_SIZE', 500))
+    app.config['NOTIFICATION_RETENTION_PAUSE'] = float(
+        os.getenv('NOTIFICATION_RETENTION_PAUSE', 0.2))
+    app.config['NOTIFICATION_RETENTION_INTERVAL'] = float(
+        os.getenv('NOTIFICATION_RETENTION_INTERVAL', 3600))
+
+    # List queries raise instead of lazy loading anything their field plan
+    # did not load (see app/utils/serializers.py); on under the test suite
+    app.config['SQLALCHEMY_STRICT_LOADING'] = os.getenv(
+        'SQLALCHEMY_STRICT_LOADING',
+        'true' if config_name == 'testing' else 'false').lower() == 'true'
 
     # Disable rate limiting for local development to avoid throttling the SPA
     if app.config.get('ENV', 'production') == 'development' or app.config.get('DEBUG'):
         app.config['RATELIMIT_ENABLED'] = False
 
     # Initialize extensions
+    from app.utils.realtime import socketio_options
+
+    # Socket.IO event handlers must be registered before the first
+    # socketio.init_app; later registrations only reach that one server
+    from app.modules.notifications import notification_socket  # noqa: F401
+    from app.modules.attempts import attempt_socket  # noqa: F401
+
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     bcrypt.init_app(app)
     cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
-    socketio.init_app(app)
+    socketio.init_app(app, **socketio_options(app.config))
     mail.init_app(app)
     ma.init_app(app)
     limiter.init_app(app)
     cache.init_app(app)
 
+    from app.utils.compression import init_compression
+    init_compression(app)
+
     # Register modular blueprints
     from app.modules.auth.auth_controller import auth_bp
     from app.modules.admin.admin_controller import admin_bp
@@ -87,6 +221,8 @@ def create_app(config_name='development'):
     from app.modules.quiz.quiz_controller import quiz_bp
     from app.modules.notifications.notification_controller import notifications_bp
     from app.modules.attempts.attempt_controller import attempts_bp
+    from app.modules.reports.report_controller import reports_bp
+    from app.modules.teacher.access_code_controller import access_codes_bp
 
     # Register routes blueprints
     from app.routes.teacher import teacher_bp as teacher_routes_bp
@@ -99,6 +235,8 @@ def create_app(config_name='development'):
     app.register_blueprint(quiz_bp, url_prefix='/api/quizzes')
     app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
     app.register_blueprint(attempts_bp, url_prefix='/api/attempts')
+    app.register_blueprint(reports_bp, url_prefix='/api/reports')
+    app.register_blueprint(access_codes_bp, url_prefix='/api/access-codes')
     app.register_blueprint(grading_bp, url_prefix='/api/grading')
 
     # Register routes with override (routes take precedence)
@@ -10,10 +10,16 @@ from .student_answer import StudentAnswer
 from .violation import Violation, ViolationType
 from .notification import Notification
 from .notification_event import NotificationEvent
+from .broadcast_notification import BroadcastNotification
+from .notification_receipt import NotificationReceipt
+from .notification_tombstone import NotificationTombstone
+from .queued_email import QueuedEmail
 from .password_reset_token import PasswordResetToken
 from .refresh_token import RefreshToken
 from .audit_log import AuditLog
 from .attempt_history import AttemptHistory
+from .attempt_access_code import AttemptAccessCode
+from .access_code_sequence import AccessCodeSequence
 
 __all__ = [
     'User', 'UserRole',
@@ -28,8 +34,14 @@ __all__ = [
     'Violation', 'ViolationType',
     'Notification',
     'NotificationEvent',
+    'BroadcastNotification',
+    'NotificationReceipt',
+    'NotificationTombstone',
+    'QueuedEmail',
     'PasswordResetToken',
     'RefreshToken',
     'AuditLog',
-    'AttemptHistory'
+    'AttemptHistory',
+    'AttemptAccessCode',
+    'AccessCodeSequence'
 ]
@@ -0,0 +1,17 @@
+from datetime import datetime
+from app import db
+
+
+# One row per quiz access code ever issued. The auto-increment id is the
+# sequence number QuizCodeService permutes into the code, so concurrent
+# workers never draw the same number. Rows are never deleted: some MySQL
+# versions recompute the counter from MAX(id) on restart.
+class AccessCodeSequence(db.Model):
+    __tablename__ = 'access_code_sequence'
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'),
+                   primary_key=True, autoincrement=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<AccessCodeSequence {self.id}>'
@@ -0,0 +1,43 @@
+from datetime import datetime
+from app import db
+import uuid
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+# A single-use code a teacher hands a student to resume a locked attempt.
+# Only the SHA-256 of the code is stored.
+class AttemptAccessCode(db.Model):
+    __tablename__ = 'attempt_access_codes'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    attempt_id = db.Column(db.String(36), db.ForeignKey(
+        'quiz_attempts.id', ondelete='CASCADE'), nullable=False)
+    teacher_id = db.Column(db.String(36), db.ForeignKey(
+        'teachers.id', ondelete='CASCADE'), nullable=False)
+    code_hash = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    used_at = db.Column(db.DateTime)
+    device_info = db.Column(db.JSON)
+
+    __table_args__ = (
+        db.Index('idx_access_codes_attempt', 'attempt_id'),
+        db.Index('idx_access_codes_teacher_expires', 'teacher_id', 'expires_at'),
+        db.Index('idx_access_codes_hash', 'code_hash'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'attempt_id': self.attempt_id,
+            'teacher_id': self.teacher_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'used_at': self.used_at.isoformat() if self.used_at else None
+        }
+
+    def __repr__(self):
+        return f'<AttemptAccessCode {self.attempt_id}>'
@@ -0,0 +1,61 @@
+from datetime import datetime
+from app import db
+import uuid
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+# Stored once per class; members read it through NotificationReceipt
+class BroadcastNotification(db.Model):
+    __tablename__ = 'broadcast_notifications'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    class_id = db.Column(db.String(36), db.ForeignKey(
+        'classes.id', ondelete='CASCADE'), nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    link = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    priority = db.Column(db.String(20), default='medium')
+    category = db.Column(db.String(50), default='system')
+    action_url = db.Column(db.String(500))
+    expires_at = db.Column(db.DateTime)
+    extra_data = db.Column(db.JSON)
+
+    # Relationships
+    class_ = db.relationship('Class')
+    receipts = db.relationship(
+        'NotificationReceipt', back_populates='broadcast', cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('idx_broadcasts_class_created', 'class_id', 'created_at'),
+        db.Index('idx_broadcasts_expires', 'expires_at'),
+    )
+
+    def to_dict(self, user_id=None, receipt=None):
+        """Serialize as seen by one reader, shaped like Notification.to_dict"""
+        read_at = receipt.read_at if receipt else None
+        return {
+            'id': self.id,
+            'user_id': user_id,
+            'type': self.type,
+            'title': self.title,
+            'message': self.message,
+            'link': self.link,
+            'is_read': read_at is not None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'read_at': read_at.isoformat() if read_at else None,
+            'priority': self.priority,
+            'category': self.category,
+            'action_url': self.action_url,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'extra_data': self.extra_data,
+            'is_broadcast': True,
+            'class_id': self.class_id
+        }
+
+    def __repr__(self):
+        return f'<BroadcastNotification {self.title}>'
@@ -29,9 +29,25 @@ class Notification(db.Model):
     expires_at = db.Column(db.DateTime)
     extra_data = db.Column(db.JSON)  # Renamed from metadata
 
+    # Coalescing: repeats of the same event (type + entity) within a window
+    # update one notification instead of adding rows
+    coalesce_key = db.Column(db.String(100))
+    occurrence_count = db.Column(db.Integer, default=1)
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow)
+
     # Relationships
     user = db.relationship('User', back_populates='notifications')
 
+    # Retention job scans (see notification_retention_service)
+    __table_args__ = (
+        # Incremental sync: range scan past a (created_at, id) cursor
+        db.Index('idx_notifications_user_created', 'user_id', 'created_at', 'id'),
+        db.Index('idx_notifications_expires', 'expires_at'),
+        db.Index('idx_notifications_category_created', 'category', 'created_at'),
+        db.Index('idx_notifications_read_at', 'read_at'),
+        db.Index('idx_notifications_coalesce', 'user_id', 'type', 'coalesce_key'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -47,7 +63,9 @@ class Notification(db.Model):
             'category': self.category,
             'action_url': self.action_url,
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
-            'extra_data': self.extra_data
+            'extra_data': self.extra_data,
+            'occurrence_count': self.occurrence_count,
+            'last_seen_at': self.last_seen_at.isoformat() if self.last_seen_at else None
         }
 
     def __repr__(self):
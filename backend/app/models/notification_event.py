@@ -16,17 +16,30 @@ class NotificationEvent(db.Model):
     entity_id = db.Column(db.String(36), nullable=False)
     triggered_by = db.Column(db.String(36), db.ForeignKey(
         'users.id', ondelete='SET NULL'))
-    # Array of user IDs who should be notified
+    # {"user_ids": [...], "class_ids": [...]} expanded by the outbox worker
     recipients = db.Column(db.JSON, nullable=False)
     notification_template = db.Column(db.String(100), nullable=False)
     extra_data = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     processed = db.Column(db.Boolean, default=False)
     processed_at = db.Column(db.DateTime)
+    # Failed fan-outs back off until next_attempt_at; after
+    # NOTIFICATION_OUTBOX_MAX_ATTEMPTS the event is processed with failed_at set
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime)
+    last_error = db.Column(db.String(500))
+    failed_at = db.Column(db.DateTime)
 
     # Relationships
     trigger_user = db.relationship('User', foreign_keys=[triggered_by])
 
+    __table_args__ = (
+        # Outbox worker claims pending events oldest first
+        db.Index('idx_events_pending', 'processed', 'created_at'),
+        # Retention purges processed events oldest first
+        db.Index('idx_events_processed_at', 'processed_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -39,7 +52,11 @@ class NotificationEvent(db.Model):
             'extra_data': self.extra_data,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'processed': self.processed,
-            'processed_at': self.processed_at.isoformat() if self.processed_at else None
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'failed_at': self.failed_at.isoformat() if self.failed_at else None
         }
 
     def __repr__(self):
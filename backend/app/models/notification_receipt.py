@@ -0,0 +1,23 @@
+from app import db
+
+
+# Per-user read/dismiss state of a broadcast notification
+class NotificationReceipt(db.Model):
+    __tablename__ = 'notification_receipts'
+
+    broadcast_id = db.Column(db.String(36), db.ForeignKey(
+        'broadcast_notifications.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey(
+        'users.id', ondelete='CASCADE'), primary_key=True)
+    read_at = db.Column(db.DateTime)
+    is_dismissed = db.Column(db.Boolean, default=False, nullable=False)
+
+    # Relationships
+    broadcast = db.relationship('BroadcastNotification', back_populates='receipts')
+
+    __table_args__ = (
+        db.Index('idx_receipts_user', 'user_id'),
+    )
+
+    def __repr__(self):
+        return f'<NotificationReceipt {self.broadcast_id} {self.user_id}>'
@@ -0,0 +1,26 @@
+from datetime import datetime
+from app import db
+import uuid
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+# A notification removed from a user's list (deleted, or broadcast dismissed),
+# kept so incremental syncs can tell clients to drop it
+class NotificationTombstone(db.Model):
+    __tablename__ = 'notification_tombstones'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    notification_id = db.Column(db.String(36), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey(
+        'users.id', ondelete='CASCADE'), nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_tombstones_user_deleted', 'user_id', 'deleted_at'),
+    )
+
+    def __repr__(self):
+        return f'<NotificationTombstone {self.notification_id} {self.user_id}>'
@@ -0,0 +1,46 @@
+from datetime import datetime
+from app import db
+import uuid
+
+
+def generate_uuid():
+    return str(uuid.uuid4())
+
+
+# An email waiting for (or done with) delivery by the mail worker
+class QueuedEmail(db.Model):
+    __tablename__ = 'email_queue'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    recipient = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    # Notification type or mail template it was rendered from
+    template = db.Column(db.String(50))
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, sent, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('idx_email_queue_due', 'status', 'next_attempt_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'recipient': self.recipient,
+            'subject': self.subject,
+            'template': self.template,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
+
+    def __repr__(self):
+        return f'<QueuedEmail {self.recipient} {self.status}>'
@@ -73,6 +73,8 @@ class Quiz(db.Model):
     prevent_tab_switching = db.Column(db.Boolean, default=False)
     require_fullscreen = db.Column(db.Boolean, default=False)
     enable_camera_monitoring = db.Column(db.Boolean, default=False)
+    # Weights, decay and action thresholds; see violation_policy_service
+    violation_policy = db.Column(db.JSON)
 
     # Display Settings
     show_questions_one_at_a_time = db.Column(db.Boolean, default=False)
@@ -132,6 +134,7 @@ class Quiz(db.Model):
             'prevent_tab_switching': self.prevent_tab_switching,
             'require_fullscreen': self.require_fullscreen,
             'enable_camera_monitoring': self.enable_camera_monitoring,
+            'violation_policy': self.violation_policy,
 
             # Display Settings
             'show_questions_one_at_a_time': self.show_questions_one_at_a_time,
@@ -40,6 +40,11 @@ class QuizAttempt(db.Model):
     # Anti-cheating
     total_violations = db.Column(db.Integer, default=0)
     auto_submitted_due_to_violations = db.Column(db.Boolean, default=False)
+    # Running policy score, decayed from violation_score_at
+    violation_score = db.Column(db.Float, default=0)
+    violation_score_at = db.Column(db.DateTime)
+    # Set by the policy's lock action until an access code is verified
+    locked_at = db.Column(db.DateTime)
 
     # Monitoring
     progress = db.Column(db.Integer)
@@ -88,6 +93,8 @@ class QuizAttempt(db.Model):
             'passed': self.passed,
             'total_violations': self.total_violations,
             'auto_submitted_due_to_violations': self.auto_submitted_due_to_violations,
+            'violation_score': self.violation_score,
+            'locked': self.locked_at is not None,
             'progress': self.progress,
             'current_question_index': self.current_question_index,
             'last_activity_at': self.last_activity_at.isoformat() if self.last_activity_at else None,
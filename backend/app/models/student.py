@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import event, inspect
 from app import db
 
 
@@ -11,6 +12,8 @@ class Student(db.Model):
         db.String(50), unique=True, nullable=False, index=True)
     class_id = db.Column(db.String(36), db.ForeignKey(
         'classes.id', ondelete='SET NULL'))
+    # When the student joined class_id; earlier class broadcasts are hidden
+    class_joined_at = db.Column(db.DateTime)
     date_of_birth = db.Column(db.Date)
     parent_email = db.Column(db.String(255))
     parent_phone = db.Column(db.String(20))
@@ -44,3 +47,10 @@ class Student(db.Model):
 
     def __repr__(self):
         return f'<Student {self.registration_number}>'
+
+
+@event.listens_for(Student, 'before_insert')
+@event.listens_for(Student, 'before_update')
+def _stamp_class_joined_at(mapper, connection, target):
+    if inspect(target).attrs.class_id.history.has_changes():
+        target.class_joined_at = datetime.utcnow() if target.class_id else None
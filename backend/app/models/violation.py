@@ -33,6 +33,11 @@ class Violation(db.Model):
     # Relationships
     attempt = db.relationship('QuizAttempt', back_populates='violations')
 
+    __table_args__ = (
+        # Per-attempt time ranges for quiz violation analytics
+        db.Index('idx_violations_attempt_detected', 'attempt_id', 'detected_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -4,20 +4,95 @@
 # Handles all administrative business logic
 
 from datetime import datetime
+from sqlalchemy import func
 from app import db
 from app.models.user import User, UserRole
 from app.models.teacher import Teacher
 from app.models.student import Student
 from app.models.class_model import Class
+from app.models.quiz import Quiz
 from app.models.audit_log import AuditLog
+from app.utils.caching import cached_result, invalidate_on
+from app.utils.serializers import AUDIT_LOG_PLAN
+
+DASHBOARD_STATS_CACHE = 'admin:dashboard_stats'
+invalidate_on(DASHBOARD_STATS_CACHE, User, Class, Quiz)
+
+# Columns of the user listing, in the order _user_list_row unpacks them
+USER_LIST_COLUMNS = (User.id, User.email, User.name, User.role, User.is_active,
+                     User.is_email_verified, User.created_at, User.last_login)
+TEACHER_LIST_COLUMNS = (Teacher.id, Teacher.subject, Teacher.phone, Teacher.department,
+                        Teacher.bio, Teacher.created_at)
+STUDENT_LIST_COLUMNS = (Student.id, Student.registration_number, Student.class_id,
+                        Student.date_of_birth, Student.parent_email, Student.parent_phone,
+                        Student.is_account_claimed, Student.claimed_at, Student.created_at)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _user_list_row(row):
+    """User.to_dict merged with the role's profile, as get_user_by_id returns it"""
+    (user_id, email, name, role, is_active, is_email_verified, created_at, last_login,
+     teacher_id, subject, phone, department, bio, teacher_created_at,
+     student_id, registration_number, class_id, date_of_birth, parent_email, parent_phone,
+     is_account_claimed, claimed_at, student_created_at, class_name) = row
+
+    data = {
+        'id': user_id,
+        'email': email,
+        'name': name,
+        'role': role.value if isinstance(role, UserRole) else role,
+        'is_active': is_active,
+        'is_email_verified': is_email_verified,
+        'created_at': _isoformat(created_at),
+        'last_login': _isoformat(last_login)
+    }
+    if role == UserRole.TEACHER and teacher_id:
+        data.update({
+            'id': teacher_id,
+            'subject': subject,
+            'phone': phone,
+            'department': department,
+            'bio': bio,
+            'created_at': _isoformat(teacher_created_at)
+        })
+    elif role == UserRole.STUDENT and student_id:
+        data.update({
+            'id': student_id,
+            'registration_number': registration_number,
+            'class_id': class_id,
+            'class_name': class_name,
+            'date_of_birth': _isoformat(date_of_birth),
+            'parent_email': parent_email,
+            'parent_phone': parent_phone,
+            'is_account_claimed': is_account_claimed,
+            'claimed_at': _isoformat(claimed_at),
+            'created_at': _isoformat(student_created_at)
+        })
+    return data
 
 
 class AdminService:
 
     @staticmethod
     def get_all_users(page=1, per_page=20, role_filter=None, search=None):
-        """Get all users with filtering and pagination"""
-        query = User.query
+        """Get all users with filtering and pagination.
+
+        The page is one column projection outer-joined to the teacher and
+        student profiles (and the student's class name); no entities are
+        loaded, so password hashes and relationships are never read.
+        """
+        query = db.session.query(
+            *USER_LIST_COLUMNS, *TEACHER_LIST_COLUMNS, *STUDENT_LIST_COLUMNS, Class.name
+        ).outerjoin(
+            Teacher, Teacher.id == User.id
+        ).outerjoin(
+            Student, Student.id == User.id
+        ).outerjoin(
+            Class, Class.id == Student.class_id
+        )
 
         if role_filter:
             try:
@@ -36,17 +111,8 @@ class AdminService:
             page=page, per_page=per_page, error_out=False
         )
 
-        user_data = []
-        for user in users.items:
-            data = user.to_dict()
-            if user.role == UserRole.TEACHER and user.teacher:
-                data.update(user.teacher.to_dict(include_user=False))
-            elif user.role == UserRole.STUDENT and user.student:
-                data.update(user.student.to_dict(include_user=False))
-            user_data.append(data)
-
         return {
-            'users': user_data,
+            'users': [_user_list_row(row) for row in users.items],
             'total': users.total,
             'pages': users.pages,
             'current_page': page
@@ -219,29 +285,37 @@ class AdminService:
         return class_obj.to_dict()
 
     @staticmethod
+    @cached_result(DASHBOARD_STATS_CACHE)
     def get_dashboard_stats():
         """Get admin dashboard statistics"""
-        total_users = User.query.count()
-        total_teachers = Teacher.query.count()
-        total_students = Student.query.count()
-        total_classes = Class.query.count()
-
-        active_users = User.query.filter_by(is_active=True).count()
-        inactive_users = total_users - active_users
-
-        # User counts by role
-        admin_count = User.query.filter_by(role=UserRole.ADMIN).count()
-        teacher_count = User.query.filter_by(role=UserRole.TEACHER).count()
-        student_count = User.query.filter_by(role=UserRole.STUDENT).count()
+        # One grouped aggregate over users instead of a COUNT per figure
+        rows = db.session.query(
+            User.role, User.is_active, func.count(User.id)
+        ).group_by(User.role, User.is_active).all()
+
+        role_counts = {role: 0 for role in UserRole}
+        total_users = 0
+        active_users = 0
+        for role, is_active, count in rows:
+            role_counts[role] = role_counts.get(role, 0) + count
+            total_users += count
+            if is_active:
+                active_users += count
+
+        total_classes, total_quizzes = db.session.query(
+            db.select(func.count(Class.id)).scalar_subquery(),
+            db.select(func.count(Quiz.id)).scalar_subquery()
+        ).one()
 
         return {
             'total_users': total_users,
             'active_users': active_users,
-            'inactive_users': inactive_users,
-            'admin_count': admin_count,
-            'teacher_count': teacher_count,
-            'student_count': student_count,
-            'total_classes': total_classes
+            'inactive_users': total_users - active_users,
+            'admin_count': role_counts[UserRole.ADMIN],
+            'teacher_count': role_counts[UserRole.TEACHER],
+            'student_count': role_counts[UserRole.STUDENT],
+            'total_classes': total_classes,
+            'total_quizzes': total_quizzes
         }
 
     @staticmethod
@@ -255,12 +329,12 @@ class AdminService:
         if action:
             query = query.filter(AuditLog.action.ilike(f'%{action}%'))
 
-        logs = query.order_by(AuditLog.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        logs = query.options(*AUDIT_LOG_PLAN.options()).order_by(
+            AuditLog.created_at.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
 
         return {
-            'logs': [log.to_dict() for log in logs.items],
+            'logs': AUDIT_LOG_PLAN.dump_many(logs.items),
             'total': logs.total,
             'pages': logs.pages,
             'current_page': page
@@ -4,8 +4,11 @@
 # Handles HTTP requests for attempt endpoints
 
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import limiter
 from app.utils.decorators import jwt_required_with_role, teacher_required, student_required
 from app.modules.attempts.attempt_service import AttemptService
+from app.services.attempt_heartbeat_service import AttemptHeartbeatService
 from app.services.attempt_reset_service import AttemptResetService
 from app.modules.student.anti_cheating_service import AntiCheatService
 from app.models.quiz import Quiz
@@ -22,12 +25,6 @@ def get_attempt(current_user, attempt_id):
         # Students can only view their own attempts
         user_id = current_user.id if current_user.role.value == 'student' else None
 
-        attempt = AttemptService.get_attempt_by_id(
-            attempt_id,
-            user_id=user_id,
-            include_answers=True
-        )
-
         attempt_data = AttemptService.get_attempt_by_id(
             attempt_id,
             user_id=user_id,
@@ -45,6 +42,24 @@ def get_attempt(current_user, attempt_id):
         return jsonify({'error': 'Failed to fetch attempt', 'details': str(e)}), 500
 
 
+@attempts_bp.route('/<attempt_id>/heartbeat', methods=['POST'])
+@limiter.exempt
+@jwt_required()
+def heartbeat(attempt_id):
+    """Record activity and return server time, remaining seconds and status.
+
+    Called every few seconds by every student in an exam, so it skips the
+    user lookup of jwt_required_with_role and reads cached attempt data only.
+    """
+    try:
+        return jsonify(AttemptHeartbeatService.heartbeat(attempt_id, get_jwt_identity())), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Failed to record heartbeat', 'details': str(e)}), 500
+
+
 @attempts_bp.route('/student/<student_id>', methods=['GET'])
 @jwt_required_with_role()
 def get_student_attempts(current_user, student_id):
@@ -205,19 +220,17 @@ def record_violation(current_user, attempt_id):
         if not violation_type:
             return jsonify({'error': 'violation_type is required'}), 400
 
-        # Verify attempt ownership
-        attempt = AttemptService.get_attempt_by_id(attempt_id, current_user.id)
-
         violation = AttemptService.record_violation(
             attempt_id=attempt_id,
             violation_type=violation_type,
             question_index=question_index,
-            extra_data=extra_data
+            extra_data=extra_data,
+            student_id=current_user.id
         )
 
         return jsonify({
             'message': 'Violation recorded',
-            'violation': violation.to_dict()
+            'violation': violation
         }), 201
 
     except ValueError as e:
@@ -226,6 +239,28 @@ def record_violation(current_user, attempt_id):
         return jsonify({'error': 'Failed to record violation', 'details': str(e)}), 500
 
 
+@attempts_bp.route('/<attempt_id>/violations/batch', methods=['POST'])
+@student_required
+def record_violations(current_user, attempt_id):
+    """Record a burst of violations, e.g. blur, visibilitychange and focus together"""
+    try:
+        data = request.get_json() or {}
+        violations = data.get('violations')
+
+        if not isinstance(violations, list) or not violations:
+            return jsonify({'error': 'violations must be a non-empty list'}), 400
+
+        result = AttemptService.record_violations(
+            attempt_id, violations, student_id=current_user.id)
+
+        return jsonify({'message': 'Violations recorded', **result}), 201
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to record violations', 'details': str(e)}), 500
+
+
 @attempts_bp.route('/quiz/<quiz_id>/stats', methods=['GET'])
 @jwt_required_with_role()
 def get_attempt_statistics(current_user, quiz_id):
@@ -339,7 +374,7 @@ def auto_submit_expired(current_user):
 @attempts_bp.route('/<attempt_id>/verify-access-code', methods=['POST'])
 @student_required
 def verify_access_code(current_user, attempt_id):
-    """Verify access code for quiz attempt"""
+    """Verify a teacher's access code, lifting a violation lock on the attempt"""
     try:
         data = request.get_json()
         access_code = data.get('accessCode')
@@ -349,12 +384,15 @@ def verify_access_code(current_user, attempt_id):
             return jsonify({'error': 'Access code is required'}), 400
 
         # Verify attempt ownership
-        attempt = AttemptService.get_attempt_by_id(attempt_id, current_user.id)
+        attempt = AttemptService.get_attempt_by_id(
+            attempt_id, current_user.id, include_answers=False)
 
         result, status_code = AntiCheatService.verify_access_code(
             attempt_id, access_code, device_info)
         return jsonify(result), status_code
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
     except Exception as e:
         return jsonify({'error': 'Failed to verify access code', 'details': str(e)}), 500
 
@@ -365,7 +403,7 @@ def log_violation(current_user, attempt_id):
     """Log cheating violation"""
     try:
         data = request.get_json()
-        violation_type = data.get('type')
+        violation_type = data.get('violation_type') or data.get('type')
         details = data.get('details', {})
 
         if not violation_type:
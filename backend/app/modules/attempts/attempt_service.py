@@ -4,12 +4,97 @@
 # Handles all attempt-related business logic
 
 from datetime import datetime
+from enum import Enum as PyEnum
+from sqlalchemy import func, insert, update, and_, or_
 from app import db
 from app.models.quiz_attempt import QuizAttempt, AttemptStatus
 from app.models.quiz import Quiz
-from app.models.violation import Violation, ViolationType
+from app.models.quiz_question import QuizQuestion
+from app.models.student import Student
+from app.models.student_answer import StudentAnswer
+from app.models.user import User
+from app.models.class_model import Class
+from app.models.violation import Violation, ViolationType, generate_uuid
 from app.models.attempt_history import AttemptHistory
 from app.services.attempt_reset_service import AttemptResetService
+from app.services.attempt_monitor_service import AttemptMonitorService
+from app.services.notification_service import NotificationService
+from app.services.violation_policy_service import (
+    ViolationPolicyService, ACTION_NONE, ACTION_LOCK, ACTION_AUTO_SUBMIT)
+
+# Most violations accepted in one batch
+MAX_VIOLATION_BATCH = 50
+
+# Attempt columns listed by the monitoring page; answers are only counted
+MONITOR_ATTEMPT_COLUMNS = (
+    QuizAttempt.id, QuizAttempt.student_id, QuizAttempt.attempt_number,
+    QuizAttempt.started_at, QuizAttempt.submitted_at, QuizAttempt.status,
+    QuizAttempt.score, QuizAttempt.total_marks, QuizAttempt.percentage, QuizAttempt.passed,
+    QuizAttempt.total_violations, QuizAttempt.auto_submitted_due_to_violations,
+    QuizAttempt.violation_score, QuizAttempt.locked_at, QuizAttempt.progress,
+    QuizAttempt.current_question_index, QuizAttempt.last_activity_at,
+    QuizAttempt.is_reset, QuizAttempt.additional_attempts_granted
+)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _monitor_row(row, quiz_id, quiz, now):
+    """One attempt of the monitoring page; answers are counted, not listed"""
+    (attempt_id, student_id, attempt_number, started_at, submitted_at, status, score,
+     total_marks, percentage, passed, total_violations, auto_submitted, violation_score,
+     locked_at, progress, current_question_index, last_activity_at, is_reset,
+     additional_attempts_granted, student_name, email, registration_number, class_id,
+     class_name, answered_count, violation_count) = row
+
+    time_spent_seconds = None
+    if started_at and last_activity_at:
+        time_spent_seconds = int((last_activity_at - started_at).total_seconds())
+
+    return {
+        'id': attempt_id,
+        'quiz_id': quiz_id,
+        'student_id': student_id,
+        'attempt_number': attempt_number,
+        'started_at': _isoformat(started_at),
+        'submitted_at': _isoformat(submitted_at),
+        'status': status.value if isinstance(status, PyEnum) else status,
+        'score': float(score) if score else None,
+        'total_marks': total_marks,
+        'percentage': float(percentage) if percentage else None,
+        'passed': passed,
+        'total_violations': total_violations,
+        'auto_submitted_due_to_violations': auto_submitted,
+        'violation_score': violation_score,
+        'locked': locked_at is not None,
+        'progress': progress,
+        'current_question_index': current_question_index,
+        'last_activity_at': _isoformat(last_activity_at),
+        'is_reset': is_reset,
+        'additional_attempts_granted': additional_attempts_granted,
+        'is_time_expired': bool(started_at and quiz.time_limit_minutes and
+                                (now - started_at).total_seconds() / 60 > quiz.time_limit_minutes),
+        'student': {
+            'id': student_id,
+            'name': student_name,
+            'email': email,
+            'registration_number': registration_number,
+            'class_id': class_id,
+            'class_name': class_name
+        },
+        'student_name': student_name,
+        'registration_number': registration_number,
+        'quiz': {'id': quiz_id, 'title': quiz.title, 'total_questions': quiz.total_questions},
+        'quiz_title': quiz.title,
+        # Convenience fields for monitoring UI
+        'current_question_number': (current_question_index or 0) + 1,
+        'time_spent_seconds': time_spent_seconds,
+        'answered_questions': answered_count,
+        'total_questions': quiz.total_questions or answered_count,
+        'violations': violation_count
+    }
 
 
 class AttemptService:
@@ -54,108 +139,204 @@ class AttemptService:
 
     @staticmethod
     def get_quiz_attempts(quiz_id, teacher_id=None, page=1, per_page=20):
-        """Get all attempts for a quiz with optional teacher verification"""
-        query = QuizAttempt.query.filter_by(quiz_id=quiz_id)
-        if teacher_id:
-            quiz = Quiz.query.get(quiz_id)
-            if not quiz or quiz.created_by != teacher_id:
-                raise ValueError('Unauthorized to view attempts for this quiz')
-
-        attempts = query.order_by(QuizAttempt.started_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        """Get all attempts for a quiz with optional teacher verification.
+
+        A page costs three queries whatever its size: the quiz with its
+        question count, the attempt count, and one joined projection of the
+        page whose answered and violation counts are correlated subqueries.
+        """
+        question_count = db.session.query(func.count(QuizQuestion.id)).filter(
+            QuizQuestion.quiz_id == Quiz.id
+        ).scalar_subquery().label('total_questions')
+        quiz = db.session.query(
+            Quiz.created_by, Quiz.title, Quiz.time_limit_minutes, question_count
+        ).filter(Quiz.id == quiz_id).first()
+
+        if teacher_id and (not quiz or quiz.created_by != teacher_id):
+            raise ValueError('Unauthorized to view attempts for this quiz')
+
+        page = max(page, 1)
+        per_page = per_page if per_page > 0 else 20
+        total = db.session.query(func.count(QuizAttempt.id)).filter(
+            QuizAttempt.quiz_id == quiz_id).scalar() if quiz else 0
 
         attempts_data = []
-        for attempt in attempts.items:
-            data = attempt.to_dict(include_answers=True)
-
-            student_dict = attempt.student.to_dict() if attempt.student else None
-            if student_dict:
-                data['student'] = student_dict
-                data['student_name'] = student_dict.get('name')
-                data['registration_number'] = student_dict.get(
-                    'registration_number')
-
-            quiz_dict = attempt.quiz.to_dict(
-                include_questions=False) if attempt.quiz else None
-            if quiz_dict:
-                data['quiz'] = quiz_dict
-                data['quiz_title'] = quiz_dict.get('title')
-                data['total_questions'] = quiz_dict.get('total_questions')
-
-            # Convenience fields for monitoring UI
-            data['current_question_number'] = (
-                attempt.current_question_index or 0) + 1
-            data['time_spent_seconds'] = None
-            if attempt.started_at and attempt.last_activity_at:
-                data['time_spent_seconds'] = int(
-                    (attempt.last_activity_at - attempt.started_at).total_seconds())
-
-            answered_count = 0
-            for ans in attempt.answers:
-                if ans.answer_text not in (None, '') or ans.answer_option is not None:
-                    answered_count += 1
-
-            data['answered_questions'] = answered_count
-            data['total_questions'] = data.get(
-                'total_questions') or answered_count
-            data['violations'] = len(
-                attempt.violations) if attempt.violations else 0
-
-            attempts_data.append(data)
+        if total:
+            answered = db.session.query(func.count(StudentAnswer.id)).filter(
+                StudentAnswer.attempt_id == QuizAttempt.id,
+                or_(and_(StudentAnswer.answer_text.isnot(None), StudentAnswer.answer_text != ''),
+                    StudentAnswer.answer_option.isnot(None))
+            ).scalar_subquery()
+            violations = db.session.query(func.count(Violation.id)).filter(
+                Violation.attempt_id == QuizAttempt.id
+            ).scalar_subquery()
+
+            rows = db.session.query(
+                *MONITOR_ATTEMPT_COLUMNS, User.name, User.email, Student.registration_number,
+                Student.class_id, Class.name, answered, violations
+            ).join(
+                Student, Student.id == QuizAttempt.student_id
+            ).join(
+                User, User.id == Student.id
+            ).outerjoin(
+                Class, Class.id == Student.class_id
+            ).filter(
+                QuizAttempt.quiz_id == quiz_id
+            ).order_by(
+                QuizAttempt.started_at.desc()
+            ).limit(per_page).offset((page - 1) * per_page).all()
+
+            now = datetime.utcnow()
+            for row in rows:
+                attempts_data.append(_monitor_row(row, quiz_id, quiz, now))
 
         return {
             'attempts': attempts_data,
-            'total': attempts.total,
-            'pages': attempts.pages,
+            'total': total,
+            'pages': -(-total // per_page),
             'current_page': page
         }
 
     @staticmethod
-    def record_violation(attempt_id, violation_type, question_index=None, extra_data=None):
+    def record_violation(attempt_id, violation_type, question_index=None, extra_data=None,
+                         student_id=None):
         """Record a violation during a quiz attempt"""
-        attempt = QuizAttempt.query.get(attempt_id)
+        result = AttemptService.record_violations(attempt_id, [{
+            'violation_type': violation_type,
+            'question_index': question_index,
+            'extra_data': extra_data
+        }], student_id=student_id)
 
-        if not attempt:
+        return result['violations'][0]
+
+    @staticmethod
+    def record_violations(attempt_id, events, student_id=None):
+        """Record a burst of violations with one insert and one counter update.
+
+        The counter is incremented in SQL rather than in Python, so concurrent
+        bursts never lose updates. The quiz's compiled violation policy then
+        scores the burst against the running score on the attempt, which is
+        read and written while the counter update holds the row lock.
+        """
+        if not events:
+            raise ValueError('At least one violation is required')
+        if len(events) > MAX_VIOLATION_BATCH:
+            raise ValueError(f'At most {MAX_VIOLATION_BATCH} violations can be recorded at once')
+
+        row = db.session.query(
+            QuizAttempt.student_id, QuizAttempt.status, QuizAttempt.quiz_id, Quiz.title,
+            Quiz.updated_at, Quiz.violation_policy, Quiz.prevent_tab_switching,
+            Quiz.require_fullscreen
+        ).join(Quiz, Quiz.id == QuizAttempt.quiz_id).filter(
+            QuizAttempt.id == attempt_id).first()
+
+        if not row or (student_id and row.student_id != student_id):
             raise ValueError('Attempt not found')
 
-        if attempt.status != AttemptStatus.IN_PROGRESS:
+        if row.status != AttemptStatus.IN_PROGRESS:
             raise ValueError('Cannot record violation for completed attempt')
 
-        # Create violation record
-        violation = Violation(
-            attempt_id=attempt_id,
-            violation_type=ViolationType(violation_type),
-            question_index=question_index,
-            extra_data=extra_data or {}
-        )
-
-        db.session.add(violation)
+        policy = ViolationPolicyService.for_quiz(
+            row.quiz_id, row.updated_at, row.violation_policy,
+            row.prevent_tab_switching, row.require_fullscreen)
 
-        # Update attempt violation count
-        attempt.total_violations += 1
-
-        # Check if auto-submit should be triggered
-        if attempt.total_violations >= 3:  # Threshold aligned with frontend warnings
-            attempt.status = AttemptStatus.AUTO_SUBMITTED
-            attempt.submitted_at = datetime.utcnow()
-            attempt.auto_submitted_due_to_violations = True
-
-            # Compute scores using student service while keeping auto-submitted flag
+        detected_at = datetime.utcnow()
+        violations = []
+        for event in events:
+            if not isinstance(event, dict):
+                raise ValueError('Each violation must be an object')
             try:
-                from app.modules.student.student_service import StudentService
-
-                StudentService.submit_quiz_attempt(
-                    attempt.student_id,
-                    attempt.id
+                violation_type = ViolationType(event.get('violation_type'))
+            except ValueError:
+                raise ValueError(f"Invalid violation type: {event.get('violation_type')}")
+
+            violations.append({
+                'id': generate_uuid(),
+                'attempt_id': attempt_id,
+                'violation_type': violation_type,
+                'detected_at': detected_at,
+                'question_index': event.get('question_index'),
+                'severity': policy.severity(violation_type.value),
+                'extra_data': event.get('extra_data') or {}
+            })
+
+        count = len(violations)
+        table = QuizAttempt.__table__
+        try:
+            # Locks the attempt row until commit, serialising concurrent bursts
+            updated = db.session.execute(
+                update(table).where(
+                    table.c.id == attempt_id,
+                    table.c.status == AttemptStatus.IN_PROGRESS
+                ).values(total_violations=func.coalesce(table.c.total_violations, 0) + count)
+            ).rowcount
+            if not updated:
+                raise ValueError('Cannot record violation for completed attempt')
+
+            db.session.execute(insert(Violation), violations)
+
+            # Re-read the row (no RETURNING on MySQL); any loaded copy is stale
+            attempt = db.session.get(QuizAttempt, attempt_id, populate_existing=True)
+            total = attempt.total_violations
+            AttemptMonitorService.queue_delta(attempt)
+
+            score = policy.score(
+                attempt.violation_score, attempt.violation_score_at,
+                [violation['violation_type'].value for violation in violations], detected_at)
+            attempt.violation_score = score
+            attempt.violation_score_at = detected_at
+            action = policy.action(score)
+
+            if action != ACTION_NONE:
+                NotificationService.notify_violation(
+                    attempt_id=attempt_id,
+                    student_id=row.student_id,
+                    quiz_title=row.title,
+                    violation_type=violations[-1]['violation_type'].value,
+                    total_violations=total,
+                    violation_score=score,
+                    violation_limit=policy.limit
                 )
-            except Exception:
-                db.session.rollback()
-                raise
-        else:
+
+            if action == ACTION_LOCK and not attempt.locked_at:
+                attempt.locked_at = detected_at
+            elif action == ACTION_AUTO_SUBMIT:
+                # The status guard on the counter update means this runs once
+                AttemptService._auto_submit_for_violations(attempt, row.title)
             db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
 
-        return violation
+        return {
+            'violations': [dict(violation,
+                                violation_type=violation['violation_type'].value,
+                                detected_at=detected_at.isoformat())
+                           for violation in violations],
+            'total_violations': total,
+            'violation_score': round(score, 2),
+            'action': action,
+            'locked': attempt.locked_at is not None,
+            'auto_submitted': action == ACTION_AUTO_SUBMIT
+        }
+
+    @staticmethod
+    def _auto_submit_for_violations(attempt, quiz_title):
+        from app.modules.student.student_service import StudentService
+
+        # Scored like a manual submit; the status stays auto-submitted so
+        # teachers can tell the two apart
+        StudentService.score_attempt(attempt)
+        attempt.status = AttemptStatus.AUTO_SUBMITTED
+        attempt.submitted_at = datetime.utcnow()
+        attempt.auto_submitted_due_to_violations = True
+
+        NotificationService.notify_auto_submission(
+            attempt_id=attempt.id,
+            student_id=attempt.student_id,
+            quiz_title=quiz_title,
+            violations=attempt.total_violations
+        )
 
     @staticmethod
     def get_attempt_violations(attempt_id):
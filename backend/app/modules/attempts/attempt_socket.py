@@ -0,0 +1,35 @@
+# Attempt Socket Handlers
+# Module Owner: Student 7 - Attempt Management Specialist
+
+# Handles Socket.IO events for live quiz monitoring
+
+from flask import session
+from flask_socketio import emit, join_room, leave_room
+from app import socketio
+from app.models.quiz import Quiz
+from app.services.attempt_monitor_service import AttemptMonitorService, monitor_room
+
+
+@socketio.on('join_quiz_monitor')
+def handle_join_quiz_monitor(data):
+    """Join a quiz's monitoring room (quiz owner only) and send its snapshot"""
+    quiz_id = (data or {}).get('quiz_id')
+    quiz = Quiz.query.get(quiz_id) if quiz_id else None
+    if not quiz or quiz.created_by != session.get('user_id'):
+        return {'error': 'Unauthorized to monitor this quiz'}
+
+    join_room(monitor_room(quiz_id))
+    emit('quiz_monitor_snapshot', {
+        'quiz_id': quiz_id,
+        'attempts': AttemptMonitorService.snapshot(quiz_id)
+    })
+    return {'success': True}
+
+
+@socketio.on('leave_quiz_monitor')
+def handle_leave_quiz_monitor(data):
+    """Stop receiving a quiz's attempt deltas"""
+    quiz_id = (data or {}).get('quiz_id')
+    if quiz_id:
+        leave_room(monitor_room(quiz_id))
+    return {'success': True}
@@ -131,11 +131,11 @@ def forgot_password():
         if not email:
             return jsonify({'error': 'Email is required'}), 400
 
-        token = AuthService.request_password_reset(email)
+        # The code only goes out by email
+        AuthService.request_password_reset(email)
 
         return jsonify({
-            'message': 'Password reset token sent to email',
-            'token': token  # Remove in production
+            'message': 'Password reset token sent to email'
         }), 200
 
     except ValueError as e:
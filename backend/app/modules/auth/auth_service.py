@@ -14,6 +14,7 @@ from app.models.teacher import Teacher
 from app.models.student import Student
 from app.models.password_reset_token import PasswordResetToken
 from app.models.refresh_token import RefreshToken
+from app.services.mail_service import MailService
 
 
 class AuthService:
@@ -145,9 +146,11 @@ class AuthService:
         )
 
         db.session.add(reset_token)
+        # Sent by the mail worker once this commits
+        MailService.enqueue(user.email, 'password_reset', {'token': token})
         db.session.commit()
 
-        return token  # In production, send via email
+        return token
 
     @staticmethod
     def reset_password(token, new_password):
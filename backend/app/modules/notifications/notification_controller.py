@@ -5,6 +5,7 @@
 
 from flask import Blueprint, request, jsonify
 from app.utils.decorators import jwt_required_with_role
+from app.utils.conditional import conditional_json
 from app.modules.notifications.notification_service import NotificationService
 
 notifications_bp = Blueprint('notifications', __name__)
@@ -13,27 +14,51 @@ notifications_bp = Blueprint('notifications', __name__)
 @notifications_bp.route('/', methods=['GET'])
 @jwt_required_with_role()
 def get_notifications(current_user):
-    """Get notifications for current user"""
+    """Get notifications for current user.
+
+    With ``since`` (a cursor from an earlier response) only new or changed
+    notifications and the ids of deleted ones are returned. Responses carry
+    an ETag; a matching If-None-Match gets 304.
+    """
     try:
         unread_only = request.args.get(
             'unread_only', 'false').lower() == 'true'
         limit = int(request.args.get('limit', 50))
         category = request.args.get('category')
-
-        notifications = NotificationService.get_user_notifications(
-            user_id=current_user.id,
-            unread_only=unread_only,
-            limit=limit,
-            category=category
-        )
-
-        unread_count = NotificationService.get_unread_count(current_user.id)
-
-        return jsonify({
-            'notifications': [n.to_dict() for n in notifications],
-            'unread_count': unread_count,
-            'total': len(notifications)
-        }), 200
+        since = request.args.get('since')
+
+        if since:
+            try:
+                sync = NotificationService.sync_user_notifications(
+                    current_user.id, since, limit=limit, category=category,
+                    unread_only=unread_only)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            notifications = sync['notifications']
+            body = {
+                'notifications': notifications,
+                'deleted': sync['deleted'],
+                'has_more': sync['has_more'],
+                'full': sync['full'],
+                'cursor': sync['cursor']
+            }
+        else:
+            notifications = NotificationService.get_user_notifications(
+                user_id=current_user.id,
+                unread_only=unread_only,
+                limit=limit,
+                category=category
+            )
+            body = {
+                'notifications': notifications,
+                'cursor': NotificationService.notification_cursor(notifications)
+            }
+
+        body['unread_count'] = NotificationService.get_unread_count(current_user.id)
+        body['total'] = len(notifications)
+
+        # The cursor moves on every call; leave it out of the ETag
+        return conditional_json(body, ignore=('cursor',))
 
     except Exception as e:
         return jsonify({'error': 'Failed to fetch notifications', 'details': str(e)}), 500
@@ -44,14 +69,15 @@ def get_notifications(current_user):
 def mark_read(current_user, notification_id):
     """Mark notification as read"""
     try:
-        notification = NotificationService.mark_as_read(notification_id)
+        notification = NotificationService.mark_as_read(
+            notification_id, current_user.id)
 
-        if not notification or notification.user_id != current_user.id:
+        if not notification:
             return jsonify({'error': 'Notification not found'}), 404
 
         return jsonify({
             'success': True,
-            'notification': notification.to_dict()
+            'notification': notification
         }), 200
 
     except Exception as e:
@@ -78,12 +104,9 @@ def mark_all_read(current_user):
 def delete_notification(current_user, notification_id):
     """Delete notification"""
     try:
-        notification = NotificationService.mark_as_read(notification_id)
-
-        if not notification or notification.user_id != current_user.id:
+        if not NotificationService.delete_notification(notification_id, current_user.id):
             return jsonify({'error': 'Notification not found'}), 404
 
-        NotificationService.delete_notification(notification_id)
         return jsonify({'success': True}), 200
 
     except Exception as e:
@@ -124,12 +147,13 @@ def cleanup_expired(current_user):
         if current_user.role != UserRole.ADMIN:
             return jsonify({'error': 'Unauthorized'}), 403
 
-        count = NotificationService.cleanup_expired_notifications()
+        # The chunked purge pauses between batches; the worker runs it
+        NotificationService.request_cleanup(current_user.id)
 
         return jsonify({
             'success': True,
-            'message': f'Cleaned up {count} expired notifications'
-        }), 200
+            'message': 'Notification cleanup queued'
+        }), 202
 
     except Exception as e:
         return jsonify({'error': 'Failed to cleanup notifications', 'details': str(e)}), 500
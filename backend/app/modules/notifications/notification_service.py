@@ -8,6 +8,8 @@ from app import db
 from app.models.notification import Notification
 from app.models.notification_event import NotificationEvent
 from app.models.user import User
+# Personal and broadcast reads are merged by the delivery service
+from app.services import notification_service as notification_delivery
 
 
 class NotificationService:
@@ -31,80 +33,60 @@ class NotificationService:
         db.session.add(notification)
         db.session.commit()
 
+        # Bump the reader's unread counter and push both to them
+        notification_delivery.NotificationService.emit_notifications(
+            [notification.to_dict()], background=False)
+
         return notification
 
     @staticmethod
     def get_user_notifications(user_id, unread_only=False, limit=50, category=None):
-        """Get notifications for a user"""
-        query = Notification.query.filter_by(user_id=user_id)
-
-        if unread_only:
-            query = query.filter_by(is_read=False)
+        """Get personal and class broadcast notifications for a user"""
+        return notification_delivery.NotificationService.get_user_notifications(
+            user_id, unread_only=unread_only, limit=limit, category=category)
 
-        if category:
-            query = query.filter_by(category=category)
-
-        notifications = query.order_by(
-            Notification.created_at.desc()
-        ).limit(limit).all()
+    @staticmethod
+    def sync_user_notifications(user_id, since, limit=50, category=None, unread_only=False):
+        """Get notification changes after a sync cursor"""
+        return notification_delivery.NotificationService.sync_user_notifications(
+            user_id, since, limit=limit, category=category, unread_only=unread_only)
 
-        return notifications
+    @staticmethod
+    def notification_cursor(notifications):
+        """Get the sync cursor for a notification list"""
+        return notification_delivery.NotificationService.notification_cursor(notifications)
 
     @staticmethod
     def get_unread_count(user_id):
         """Get unread notifications count for a user"""
-        return Notification.query.filter_by(user_id=user_id, is_read=False).count()
+        return notification_delivery.NotificationService.get_unread_count(user_id)
 
     @staticmethod
-    def mark_as_read(notification_id):
-        """Mark a notification as read"""
-        notification = Notification.query.get(notification_id)
-
-        if notification:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
-            db.session.commit()
-
-        return notification
+    def mark_as_read(notification_id, user_id):
+        """Mark a notification as read for a user"""
+        return notification_delivery.NotificationService.mark_as_read(notification_id, user_id)
 
     @staticmethod
     def mark_all_as_read(user_id):
         """Mark all notifications as read for a user"""
-        notifications = Notification.query.filter_by(
-            user_id=user_id,
-            is_read=False
-        ).all()
-
-        for notification in notifications:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
-
-        db.session.commit()
+        notification_delivery.NotificationService.mark_all_as_read(user_id)
 
     @staticmethod
-    def delete_notification(notification_id):
-        """Delete a notification"""
-        notification = Notification.query.get(notification_id)
-
-        if notification:
-            db.session.delete(notification)
-            db.session.commit()
-
-        return notification
+    def delete_notification(notification_id, user_id):
+        """Delete a notification, or dismiss a broadcast, for a user"""
+        return notification_delivery.NotificationService.delete_notification(notification_id, user_id)
 
     @staticmethod
     def cleanup_expired_notifications():
-        """Clean up expired notifications"""
-        expired = Notification.query.filter(
-            Notification.expires_at < datetime.utcnow()
-        ).all()
+        """Clean up expired and aged-out notifications; returns rows purged"""
+        return notification_delivery.NotificationService.cleanup_expired_notifications()['total']
 
-        for notification in expired:
-            db.session.delete(notification)
-
-        db.session.commit()
+    @staticmethod
+    def request_cleanup(requested_by):
+        """Queue a retention pass for the worker"""
+        from app.services.notification_retention_service import NotificationRetentionService
 
-        return len(expired)
+        NotificationRetentionService.request_purge(requested_by)
 
     @staticmethod
     def create_bulk_notifications(user_ids, notification_type, title, message, **kwargs):
@@ -127,51 +109,27 @@ class NotificationService:
             notifications.append(notification)
 
         db.session.add_all(notifications)
+        db.session.flush()
+        # Payloads are taken before the commit expires every row
+        payloads = [notification.to_dict() for notification in notifications]
         db.session.commit()
 
+        # Same counter and emit path as outbox fan-outs
+        notification_delivery.NotificationService.emit_notifications(payloads)
+
         return notifications
 
     @staticmethod
     def notify_quiz_published(quiz_id, quiz_title, subject, class_ids):
-        """Notify students about a new quiz"""
-        from app.models.student import Student
-
-        # Get all students in the specified classes
-        students = Student.query.filter(Student.class_id.in_(class_ids)).all()
-
-        if not students:
-            return []
-
-        # Create notifications
-        notifications = NotificationService.create_bulk_notifications(
-            user_ids=[s.id for s in students],
-            notification_type='quiz_published',
-            title=f'New Quiz: {quiz_title}',
-            message=f'A new quiz has been published for {subject}. Click to view details.',
-            link=f'/quiz/{quiz_id}',
-            category='quiz',
-            priority='high',
-            expires_at=datetime.utcnow() + timedelta(days=7)
+        """Queue notifications for students in the quiz's classes; the worker fans them out"""
+        notification_delivery.NotificationService.notify_quiz_published(
+            quiz_id=quiz_id,
+            quiz_title=quiz_title,
+            subject=subject,
+            class_ids=class_ids
         )
-
-        # Log the notification event
-        event = NotificationEvent(
-            event_type='quiz_published',
-            entity_type='quiz',
-            entity_id=quiz_id,
-            recipients=[s.id for s in students],
-            notification_template='quiz_published',
-            extra_data={
-                'quiz_title': quiz_title,
-                'subject': subject,
-                'class_ids': class_ids
-            }
-        )
-        db.session.add(event)
         db.session.commit()
 
-        return notifications
-
     @staticmethod
     def notify_grade_published(attempt_id, score, passed):
         """Notify student about graded quiz"""
@@ -251,8 +209,7 @@ class NotificationService:
     def get_notification_stats(user_id):
         """Get notification statistics for a user"""
         total = Notification.query.filter_by(user_id=user_id).count()
-        unread = Notification.query.filter_by(
-            user_id=user_id, is_read=False).count()
+        unread = NotificationService.get_unread_count(user_id)
 
         # Count by category
         categories = db.session.query(
@@ -0,0 +1,35 @@
+# Notification Socket Handlers
+# Module Owner: Student 6 - Communication Specialist
+
+# Handles Socket.IO connections for real-time notification delivery
+
+from flask import request, session
+from flask_jwt_extended import decode_token
+from flask_socketio import join_room
+from app import db, socketio
+from app.models.student import Student
+
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    """Authenticate the socket and join the user's personal room"""
+    token = (auth or {}).get('token') or request.args.get('token')
+    if not token:
+        raise ConnectionRefusedError('Authentication token is required')
+
+    try:
+        user_id = decode_token(token)['sub']
+    except Exception:
+        raise ConnectionRefusedError('Invalid or expired token')
+
+    # Kept for later events on this connection (e.g. quiz monitoring)
+    session['user_id'] = user_id
+
+    # Personal notifications are emitted with room=user_id, class
+    # broadcasts to class:<class_id>
+    join_room(user_id)
+
+    class_id = db.session.query(Student.class_id).filter(
+        Student.id == user_id).scalar()
+    if class_id:
+        join_room(f'class:{class_id}')
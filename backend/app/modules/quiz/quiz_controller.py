@@ -5,10 +5,13 @@
 
 from flask import Blueprint, request, jsonify
 from app import db
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from app.utils.decorators import jwt_required_with_role, teacher_required, student_required
 from app.modules.quiz.quiz_service import QuizService
+from app.services.quiz_code_service import QuizCodeService
 from app.models.quiz_question import QuizQuestion
+from app.utils.serializers import QUIZ_PLAN
+from app.utils.compression import versioned_json
 
 quiz_bp = Blueprint('quiz', __name__)
 
@@ -21,6 +24,7 @@ def get_quizzes(current_user):
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status_filter = request.args.get('status')
+        fields = QUIZ_PLAN.select(request.args.get('fields'))
 
         from app.models.quiz import Quiz, QuizStatus
         from app.models.user import UserRole
@@ -42,17 +46,19 @@ def get_quizzes(current_user):
             except ValueError:
                 return jsonify({'error': 'Invalid status'}), 400
 
-        quizzes = query.order_by(Quiz.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        quizzes = query.options(*QUIZ_PLAN.options(fields)).order_by(
+            Quiz.created_at.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
 
         return jsonify({
-            'quizzes': [q.to_dict(include_classes=True) for q in quizzes.items],
+            'quizzes': QUIZ_PLAN.dump_many(quizzes.items, fields),
             'total': quizzes.total,
             'pages': quizzes.pages,
             'current_page': page
         }), 200
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Failed to fetch quizzes', 'details': str(e)}), 500
 
@@ -92,12 +98,13 @@ def create_quiz(current_user):
 def get_quiz(current_user, quiz_id):
     """Get a specific quiz"""
     try:
-        from app.models.quiz import Quiz, QuizStatus
+        from app.models.quiz import Quiz, QuizStatus, quiz_classes
         from app.models.user import UserRole
 
-        quiz = Quiz.query.options(
-            joinedload(Quiz.questions)
-        ).get(quiz_id)
+        # Permissions are checked on a projection; the quiz itself is only
+        # loaded when the client's copy is stale and no encoded copy is cached
+        quiz = db.session.query(Quiz.created_by, Quiz.status).filter(
+            Quiz.id == quiz_id).first()
 
         if not quiz:
             return jsonify({'error': 'Quiz not found'}), 404
@@ -110,15 +117,31 @@ def get_quiz(current_user, quiz_id):
                 return jsonify({'error': 'Quiz not available'}), 403
             # Check if student is enrolled in assigned classes
             if current_user.student and current_user.student.class_id:
-                if not any(c.id == current_user.student.class_id for c in quiz.classes):
+                enrolled = db.session.query(quiz_classes.c.id).filter(
+                    quiz_classes.c.quiz_id == quiz_id,
+                    quiz_classes.c.class_id == current_user.student.class_id
+                ).first()
+                if not enrolled:
                     return jsonify({'error': 'Not enrolled in this quiz'}), 403
 
         include_questions = request.args.get(
             'include_questions', 'false').lower() == 'true'
 
-        return jsonify({
-            'quiz': quiz.to_dict(include_questions=include_questions, include_classes=True)
-        }), 200
+        def render():
+            quiz = Quiz.query.options(
+                selectinload(Quiz.questions).joinedload(QuizQuestion.question),
+                selectinload(Quiz.classes)
+            ).get(quiz_id)
+            data = quiz.to_dict(include_questions=include_questions)
+            # Classes as in the quiz listings, so the payload only depends
+            # on what QuizService.get_quiz_version tracks
+            data['classes'] = QUIZ_PLAN.dump(quiz, ('classes',))['classes']
+            data['class_ids'] = [c.id for c in quiz.classes]
+            return {'quiz': data}
+
+        version = QuizService.get_quiz_version(quiz_id)
+        return versioned_json(version and (version, include_questions),
+                              render, precompress=True)
 
     except Exception as e:
         return jsonify({'error': 'Failed to fetch quiz', 'details': str(e)}), 500
@@ -210,16 +233,20 @@ def get_question_bank(current_user):
         topic = request.args.get('topic')
         difficulty = request.args.get('difficulty')
 
-        result = QuizService.get_question_bank(
-            teacher_id=current_user.id,
-            page=page,
-            per_page=per_page,
-            question_type=question_type,
-            topic=topic,
-            difficulty=difficulty
-        )
-
-        return jsonify(result), 200
+        def render():
+            return QuizService.get_question_bank(
+                teacher_id=current_user.id,
+                page=page,
+                per_page=per_page,
+                question_type=question_type,
+                topic=topic,
+                difficulty=difficulty,
+                fields=request.args.get('fields')
+            )
+
+        version = (QuizService.get_question_bank_version(current_user.id),
+                   sorted(request.args.items()))
+        return versioned_json(version, render)
 
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -252,7 +279,11 @@ def create_question(current_user):
 def get_quiz_by_access_code(current_user, access_code):
     """Get quiz by access code"""
     try:
-        quiz = QuizService.get_quiz_by_access_code(access_code)
+        if QuizCodeService.is_throttled(current_user.id, request.remote_addr):
+            return jsonify({'error': 'Too many invalid access codes, try again later'}), 429
+
+        quiz = QuizService.get_quiz_by_access_code(
+            access_code, user_id=current_user.id, ip_address=request.remote_addr)
 
         include_questions = request.args.get(
             'include_questions', 'false').lower() == 'true'
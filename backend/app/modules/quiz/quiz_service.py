@@ -3,14 +3,23 @@
 
 # Handles all quiz and question-related business logic
 
-import uuid
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
 from app import db
 from app.models.quiz import Quiz, QuizStatus
 from app.models.question import Question, QuestionType, Difficulty
 from app.models.quiz_question import QuizQuestion
 from app.models.class_model import Class
 from app.services.notification_service import NotificationService
+from app.services.violation_policy_service import ViolationPolicyService
+from app.services.quiz_code_service import QuizCodeService
+from app.utils.serializers import QUESTION_PLAN
+from app.utils.caching import invalidate_on, namespace_version
+
+# Version stamp of rendered quiz payloads (quiz, its questions and classes)
+QUIZ_CONTENT_VERSION = 'quizzes:content'
+invalidate_on(QUIZ_CONTENT_VERSION, Quiz, QuizQuestion, Question, Class)
 
 
 class QuizService:
@@ -18,8 +27,12 @@ class QuizService:
     @staticmethod
     def create_quiz(teacher_id, quiz_data, class_ids):
         """Create a new quiz"""
-        # Generate unique access code
-        access_code = ''.join([str(uuid.uuid4().int)[:6].upper()])
+        ViolationPolicyService.compile(
+            quiz_data.get('violation_policy'),
+            quiz_data.get('prevent_tab_switching', False),
+            quiz_data.get('require_fullscreen', False))
+
+        access_code = QuizCodeService.allocate()
 
         quiz = Quiz(
             title=quiz_data['title'],
@@ -34,7 +47,10 @@ class QuizService:
                 'show_answers_after_submission', False),
             randomize_questions=quiz_data.get('randomize_questions', False),
             randomize_options=quiz_data.get('randomize_options', False),
-            allow_review=quiz_data.get('allow_review', True)
+            allow_review=quiz_data.get('allow_review', True),
+            prevent_tab_switching=quiz_data.get('prevent_tab_switching', False),
+            require_fullscreen=quiz_data.get('require_fullscreen', False),
+            violation_policy=quiz_data.get('violation_policy')
         )
 
         db.session.add(quiz)
@@ -62,7 +78,14 @@ class QuizService:
         # Update fields
         updatable_fields = ['title', 'subject', 'description', 'time_limit_minutes', 'start_date', 'end_date', 'status',
                             'passing_percentage', 'max_attempts', 'show_answers_after_submission',
-                            'randomize_questions', 'randomize_options', 'allow_review']
+                            'randomize_questions', 'randomize_options', 'allow_review',
+                            'prevent_tab_switching', 'require_fullscreen', 'violation_policy']
+
+        # Reject a bad policy before anything is changed
+        ViolationPolicyService.compile(
+            quiz_data.get('violation_policy', quiz.violation_policy),
+            quiz_data.get('prevent_tab_switching', quiz.prevent_tab_switching),
+            quiz_data.get('require_fullscreen', quiz.require_fullscreen))
 
         for field in updatable_fields:
             if field in quiz_data:
@@ -135,9 +158,8 @@ class QuizService:
             raise ValueError('Quiz must have questions before publishing')
 
         quiz.status = QuizStatus.PUBLISHED
-        db.session.commit()
 
-        # Notify students in assigned classes
+        # Notify students in assigned classes (committed with the status change)
         class_ids = [c.id for c in quiz.classes]
         NotificationService.notify_quiz_published(
             quiz_id=quiz.id,
@@ -146,6 +168,8 @@ class QuizService:
             class_ids=class_ids
         )
 
+        db.session.commit()
+
         return quiz
 
     @staticmethod
@@ -275,8 +299,10 @@ class QuizService:
             raise ValueError(f'Invalid question data: {str(e)}')
 
     @staticmethod
-    def get_question_bank(teacher_id, page=1, per_page=20, question_type=None, topic=None, difficulty=None):
-        """Get teacher's question bank with filtering"""
+    def get_question_bank(teacher_id, page=1, per_page=20, question_type=None, topic=None,
+                          difficulty=None, fields=None):
+        """Get teacher's question bank with filtering and a ?fields= sparse fieldset"""
+        fields = QUESTION_PLAN.select(fields)
         query = Question.query.filter_by(created_by=teacher_id)
 
         if question_type:
@@ -296,26 +322,52 @@ class QuizService:
             except ValueError:
                 raise ValueError('Invalid difficulty')
 
-        questions = query.order_by(Question.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        questions = query.options(*QUESTION_PLAN.options(fields)).order_by(
+            Question.created_at.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
 
         return {
-            'questions': [q.to_dict() for q in questions.items],
+            'questions': QUESTION_PLAN.dump_many(questions.items, fields),
             'total': questions.total,
             'pages': questions.pages,
             'current_page': page
         }
 
     @staticmethod
-    def get_quiz_by_access_code(access_code):
-        """Get quiz by access code"""
-        quiz = Quiz.query.filter_by(access_code=access_code).first()
+    def get_question_bank_version(teacher_id):
+        """Changes whenever one of the teacher's questions is added, edited or removed"""
+        return tuple(db.session.query(
+            func.count(Question.id), func.max(Question.updated_at)
+        ).filter(Question.created_by == teacher_id).one())
 
-        if not quiz:
+    @staticmethod
+    def get_quiz_version(quiz_id):
+        """Changes whenever a quiz, question or class is committed.
+
+        None unless VERSIONED_RESPONSES: with a process-local cache other
+        processes never see the generation bump, so callers tag the rendered
+        body instead.
+        """
+        if not current_app.config['VERSIONED_RESPONSES']:
+            return None
+        return (namespace_version(QUIZ_CONTENT_VERSION), quiz_id)
+
+    @staticmethod
+    def get_quiz_by_access_code(access_code, user_id=None, ip_address=None):
+        """Get quiz by access code; wrong codes count against the user and IP"""
+        entry = QuizCodeService.lookup(access_code)
+
+        if not entry:
+            QuizCodeService.record_failure(user_id, ip_address)
             raise ValueError('Invalid access code')
 
-        if quiz.status != QuizStatus.PUBLISHED:
+        if entry['status'] != QuizStatus.PUBLISHED.value:
             raise ValueError('Quiz is not available')
 
+        quiz = Quiz.query.get(entry['quiz_id'])
+        if not quiz:
+            # Deleted by a process whose cache writes have not reached us
+            QuizCodeService.forget(access_code)
+            raise ValueError('Invalid access code')
+
         return quiz
@@ -0,0 +1,8 @@
+# Reports Module
+# Handles result exports and printable report cards
+# Module Owner: Teacher Grading Specialist
+
+from .export_service import ExportService
+from .report_card_service import ReportCardService
+
+__all__ = ['ExportService', 'ReportCardService']
@@ -0,0 +1,213 @@
+# Export Service
+# Module Owner: Teacher Grading Specialist
+
+# Handles streaming CSV/XLSX exports of results, gradebooks and violations
+
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum as PyEnum
+from openpyxl import Workbook
+from app import db
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz, quiz_classes
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.violation import Violation
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+COMPLETED_STATUSES = (AttemptStatus.SUBMITTED, AttemptStatus.GRADED,
+                      AttemptStatus.AUTO_SUBMITTED)
+
+# Rows fetched per round trip; also the CSV flush interval
+EXPORT_BATCH_SIZE = 1000
+XLSX_READ_CHUNK = 64 * 1024
+
+# Leading characters spreadsheet applications read as the start of a formula;
+# such text (student names, answers) is exported with a leading quote
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportService:
+
+    @staticmethod
+    def verify_quiz_access(quiz_id, user):
+        """Ensure the user may export data for a quiz"""
+        quiz = Quiz.query.get(quiz_id)
+
+        if not quiz:
+            raise ValueError('Quiz not found')
+
+        if user.role == UserRole.TEACHER and quiz.created_by != user.id:
+            raise ValueError('Unauthorized to export this quiz')
+
+        return quiz
+
+    @staticmethod
+    def verify_class_access(class_id, user):
+        """Ensure the user may export data for a class"""
+        class_obj = Class.query.get(class_id)
+
+        if not class_obj:
+            raise ValueError('Class not found')
+
+        if user.role == UserRole.TEACHER and not any(
+                t.id == user.id for t in class_obj.teachers):
+            raise ValueError('Unauthorized to export this class')
+
+        return class_obj
+
+    @staticmethod
+    def quiz_results_export(quiz_id):
+        """Column headers and query for a quiz's results"""
+        headers = ['Attempt ID', 'Student', 'Registration Number', 'Class',
+                   'Attempt', 'Status', 'Score', 'Total Marks', 'Percentage',
+                   'Passed', 'Violations', 'Started At', 'Submitted At']
+
+        stmt = db.select(
+            QuizAttempt.id, User.name, Student.registration_number, Class.name,
+            QuizAttempt.attempt_number, QuizAttempt.status, QuizAttempt.score,
+            QuizAttempt.total_marks, QuizAttempt.percentage, QuizAttempt.passed,
+            QuizAttempt.total_violations, QuizAttempt.started_at,
+            QuizAttempt.submitted_at
+        ).join(
+            Student, Student.id == QuizAttempt.student_id
+        ).join(
+            User, User.id == Student.id
+        ).outerjoin(
+            Class, Class.id == Student.class_id
+        ).where(
+            QuizAttempt.quiz_id == quiz_id
+        ).order_by(User.name, QuizAttempt.attempt_number)
+
+        return headers, stmt
+
+    @staticmethod
+    def class_gradebook_export(class_id):
+        """Column headers and query for a class gradebook"""
+        headers = ['Student', 'Registration Number', 'Quiz', 'Subject',
+                   'Attempt', 'Status', 'Score', 'Total Marks', 'Percentage',
+                   'Passed', 'Submitted At']
+
+        stmt = db.select(
+            User.name, Student.registration_number, Quiz.title, Quiz.subject,
+            QuizAttempt.attempt_number, QuizAttempt.status, QuizAttempt.score,
+            QuizAttempt.total_marks, QuizAttempt.percentage, QuizAttempt.passed,
+            QuizAttempt.submitted_at
+        ).select_from(Student).join(
+            User, User.id == Student.id
+        ).join(
+            QuizAttempt, QuizAttempt.student_id == Student.id
+        ).join(
+            Quiz, Quiz.id == QuizAttempt.quiz_id
+        ).join(
+            quiz_classes, db.and_(quiz_classes.c.quiz_id == Quiz.id,
+                                  quiz_classes.c.class_id == class_id)
+        ).where(
+            Student.class_id == class_id,
+            QuizAttempt.is_reset.isnot(True),
+            QuizAttempt.status.in_(COMPLETED_STATUSES)
+        ).order_by(User.name, Quiz.title, QuizAttempt.attempt_number)
+
+        return headers, stmt
+
+    @staticmethod
+    def violation_log_export(quiz_id):
+        """Column headers and query for a quiz's violation log"""
+        headers = ['Detected At', 'Student', 'Registration Number', 'Attempt',
+                   'Violation Type', 'Question Index', 'Severity']
+
+        stmt = db.select(
+            Violation.detected_at, User.name, Student.registration_number,
+            QuizAttempt.attempt_number, Violation.violation_type,
+            Violation.question_index, Violation.severity
+        ).select_from(Violation).join(
+            QuizAttempt, QuizAttempt.id == Violation.attempt_id
+        ).join(
+            Student, Student.id == QuizAttempt.student_id
+        ).join(
+            User, User.id == Student.id
+        ).where(
+            QuizAttempt.quiz_id == quiz_id
+        ).order_by(Violation.detected_at)
+
+        return headers, stmt
+
+    @staticmethod
+    def stream_export(headers, stmt, export_format, sheet_title='Export'):
+        """Return a byte generator encoding the query in the given format"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}")
+
+        rows = ExportService.stream_rows(stmt)
+        if export_format == 'xlsx':
+            return ExportService.iter_xlsx(headers, rows, sheet_title)
+        return ExportService.iter_csv(headers, rows)
+
+    @staticmethod
+    def stream_rows(stmt):
+        """Yield result rows in batches through a server-side cursor"""
+        result = db.session.execute(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        try:
+            for row in result:
+                yield [ExportService._format_cell(value) for value in row]
+        finally:
+            result.close()
+
+    @staticmethod
+    def iter_csv(headers, rows):
+        """Encode rows as CSV, flushing every EXPORT_BATCH_SIZE rows"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+
+        pending = 0
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= EXPORT_BATCH_SIZE:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+
+        yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def iter_xlsx(headers, rows, sheet_title='Export'):
+        """Encode rows as XLSX using openpyxl's write-only mode.
+
+        Write-only worksheets spool rows to a temporary file, so memory stays
+        flat; the zip container can only be sent once every row is written.
+        """
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=sheet_title[:31])
+        worksheet.append(headers)
+        for row in rows:
+            worksheet.append(row)
+
+        with tempfile.TemporaryFile() as spool:
+            workbook.save(spool)
+            spool.seek(0)
+            while True:
+                chunk = spool.read(XLSX_READ_CHUNK)
+                if not chunk:
+                    break
+                yield chunk
+
+    @staticmethod
+    def _format_cell(value):
+        if isinstance(value, PyEnum):
+            return value.value
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            return "'" + value
+        return value
@@ -0,0 +1,288 @@
+# Report Card Service
+# Module Owner: Teacher Grading Specialist
+
+# Handles PDF report card rendering, batch generation and the on-disk cache
+
+import glob
+import hashlib
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from xml.sax.saxutils import escape
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from app import db
+from app.models.student import Student
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.student_answer import StudentAnswer
+
+REPORTABLE_STATUSES = (AttemptStatus.SUBMITTED, AttemptStatus.GRADED,
+                       AttemptStatus.AUTO_SUBMITTED)
+
+_render_pool = None
+
+
+def render_report_card(data):
+    """Render a report card PDF from plain data.
+
+    Kept at module level and free of database access so it can run inside
+    a worker process.
+    """
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title=f"{data['quiz_title']} - {data['student_name']}")
+
+    story = [
+        Paragraph('Quiz Report Card', styles['Title']),
+        Paragraph(f"<b>Student:</b> {escape(data['student_name'])} ({escape(data['registration_number'])})",
+                  styles['Normal']),
+        Paragraph(f"<b>Class:</b> {escape(data['class_name'] or '-')}", styles['Normal']),
+        Paragraph(f"<b>Quiz:</b> {escape(data['quiz_title'])} ({escape(data['subject'])})", styles['Normal']),
+        Paragraph(f"<b>Attempt:</b> {data['attempt_number']} &nbsp; <b>Submitted:</b> {data['submitted_at'] or '-'}",
+                  styles['Normal']),
+        Spacer(1, 12),
+        Paragraph(f"<b>Score:</b> {data['score']} / {data['total_marks']} &nbsp; "
+                  f"<b>Percentage:</b> {data['percentage']}% &nbsp; "
+                  f"<b>Result:</b> {'Passed' if data['passed'] else 'Not passed'}", styles['Normal']),
+        Spacer(1, 12)
+    ]
+
+    rows = [['#', 'Question', 'Marks', 'Feedback']]
+    for index, answer in enumerate(data['answers'], 1):
+        rows.append([
+            str(index),
+            Paragraph(escape(answer['question']), styles['BodyText']),
+            f"{answer['marks_awarded']} / {answer['marks']}",
+            Paragraph(escape(answer['feedback'] or ''), styles['BodyText'])
+        ])
+
+    table = Table(rows, colWidths=[25, 260, 60, 160], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ]))
+    story.append(table)
+
+    if data['auto_submitted']:
+        story.extend([Spacer(1, 12), Paragraph(
+            'This attempt was automatically submitted due to violations.', styles['Italic'])])
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def _get_render_pool():
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=current_app.config.get('REPORT_RENDER_WORKERS'))
+    return _render_pool
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink that lets zipfile stream its output"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ReportCardService:
+
+    @staticmethod
+    def get_report_card(attempt_id, user):
+        """Return the path of a cached report card, rendering it if needed"""
+        from app.models.user import UserRole
+
+        attempt = QuizAttempt.query.get(attempt_id)
+        if not attempt:
+            raise ValueError('Attempt not found')
+
+        if user.role == UserRole.STUDENT and attempt.student_id != user.id:
+            raise ValueError('Unauthorized to view this report card')
+        if user.role == UserRole.TEACHER and attempt.quiz.created_by != user.id:
+            raise ValueError('Unauthorized to view this report card')
+
+        if attempt.status not in REPORTABLE_STATUSES:
+            raise ValueError('Attempt has not been submitted yet')
+
+        version = ReportCardService.grade_versions([attempt])[attempt.id]
+        path = ReportCardService._cache_path(attempt.id, version)
+        if not os.path.exists(path):
+            data = ReportCardService.build_report_data([attempt.id])[0]
+            ReportCardService._store(attempt.id, path, render_report_card(data))
+
+        return path
+
+    @staticmethod
+    def stream_class_report_cards(class_id, quiz_id):
+        """Yield a zip of report cards for a class, rendering in parallel.
+
+        Cached PDFs are written first; missing ones are rendered across the
+        process pool and appended as each finishes.
+        """
+        attempts = ReportCardService._latest_class_attempts(class_id, quiz_id)
+        versions = ReportCardService.grade_versions(attempts)
+
+        cached, missing = [], []
+        for attempt in attempts:
+            path = ReportCardService._cache_path(attempt.id, versions[attempt.id])
+            (cached if os.path.exists(path) else missing).append((attempt, path))
+
+        names = {a.id: ReportCardService._archive_name(a) for a in attempts}
+        missing_data = ReportCardService.build_report_data(
+            [a.id for a, _ in missing]) if missing else []
+
+        sink = _ZipStream()
+        archive = zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED)
+
+        for attempt, path in cached:
+            archive.write(path, arcname=names[attempt.id])
+            yield sink.drain()
+
+        if missing:
+            pool = _get_render_pool()
+            futures = {
+                pool.submit(render_report_card, data): (attempt, path)
+                for (attempt, path), data in zip(missing, missing_data)
+            }
+            for future in as_completed(futures):
+                attempt, path = futures[future]
+                pdf = future.result()
+                ReportCardService._store(attempt.id, path, pdf)
+                archive.writestr(names[attempt.id], pdf)
+                yield sink.drain()
+
+        archive.close()
+        yield sink.drain()
+
+    @staticmethod
+    def grade_versions(attempts):
+        """Map attempt id -> stamp that changes whenever its grading changes"""
+        if not attempts:
+            return {}
+
+        answer_stamps = {
+            row[0]: row[1:] for row in db.session.query(
+                StudentAnswer.attempt_id,
+                func.count(StudentAnswer.id),
+                func.max(StudentAnswer.updated_at),
+                func.max(StudentAnswer.graded_at)
+            ).filter(
+                StudentAnswer.attempt_id.in_([a.id for a in attempts])
+            ).group_by(StudentAnswer.attempt_id).all()
+        }
+
+        versions = {}
+        for attempt in attempts:
+            stamp = (attempt.status, attempt.score, attempt.total_marks,
+                     attempt.percentage, attempt.passed, attempt.submitted_at,
+                     answer_stamps.get(attempt.id))
+            versions[attempt.id] = hashlib.sha1(
+                repr(stamp).encode()).hexdigest()[:16]
+        return versions
+
+    @staticmethod
+    def build_report_data(attempt_ids):
+        """Load everything a report card shows as plain, picklable dicts"""
+        attempts = QuizAttempt.query.options(
+            joinedload(QuizAttempt.quiz),
+            joinedload(QuizAttempt.student).joinedload(Student.user),
+            joinedload(QuizAttempt.student).joinedload(Student.class_),
+            selectinload(QuizAttempt.answers).joinedload(StudentAnswer.question)
+        ).filter(QuizAttempt.id.in_(attempt_ids)).all()
+        by_id = {a.id: a for a in attempts}
+
+        reports = []
+        for attempt_id in attempt_ids:
+            attempt = by_id[attempt_id]
+            student = attempt.student
+            reports.append({
+                'attempt_id': attempt.id,
+                'student_name': student.user.name if student and student.user else '',
+                'registration_number': student.registration_number if student else '',
+                'class_name': student.class_.name if student and student.class_ else None,
+                'quiz_title': attempt.quiz.title,
+                'subject': attempt.quiz.subject,
+                'attempt_number': attempt.attempt_number,
+                'submitted_at': attempt.submitted_at.strftime('%Y-%m-%d %H:%M') if attempt.submitted_at else None,
+                'score': float(attempt.score) if attempt.score is not None else 0,
+                'total_marks': attempt.total_marks or 0,
+                'percentage': float(attempt.percentage) if attempt.percentage is not None else 0,
+                'passed': bool(attempt.passed),
+                'auto_submitted': bool(attempt.auto_submitted_due_to_violations),
+                'answers': [{
+                    'question': answer.question.text if answer.question else '',
+                    'marks': answer.question.marks if answer.question else 0,
+                    'marks_awarded': float(answer.marks_awarded) if answer.marks_awarded is not None else 0,
+                    'feedback': answer.feedback
+                } for answer in attempt.answers]
+            })
+        return reports
+
+    @staticmethod
+    def _latest_class_attempts(class_id, quiz_id):
+        """Latest reportable attempt per student of the class"""
+        latest = db.session.query(
+            QuizAttempt.student_id,
+            func.max(QuizAttempt.attempt_number).label('attempt_number')
+        ).join(Student, Student.id == QuizAttempt.student_id).filter(
+            Student.class_id == class_id,
+            QuizAttempt.quiz_id == quiz_id,
+            QuizAttempt.status.in_(REPORTABLE_STATUSES)
+        ).group_by(QuizAttempt.student_id).subquery()
+
+        return QuizAttempt.query.options(
+            joinedload(QuizAttempt.student).joinedload(Student.user)
+        ).join(latest, db.and_(
+            QuizAttempt.student_id == latest.c.student_id,
+            QuizAttempt.attempt_number == latest.c.attempt_number
+        )).filter(QuizAttempt.quiz_id == quiz_id).all()
+
+    @staticmethod
+    def _archive_name(attempt):
+        student = attempt.student
+        label = student.registration_number if student else attempt.student_id
+        return f'{label}_attempt{attempt.attempt_number}.pdf'
+
+    @staticmethod
+    def _cache_path(attempt_id, version):
+        return os.path.join(current_app.config['REPORT_CARD_CACHE_DIR'],
+                            f'{attempt_id}_{version}.pdf')
+
+    @staticmethod
+    def _store(attempt_id, path, pdf):
+        """Atomically write a rendered PDF and drop superseded versions"""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        temp_path = f'{path}.{os.getpid()}.{datetime.utcnow().timestamp()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(pdf)
+        os.replace(temp_path, path)
+
+        for stale in glob.glob(os.path.join(directory, f'{attempt_id}_*.pdf')):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
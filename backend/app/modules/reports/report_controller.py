@@ -0,0 +1,139 @@
+# Report Controller
+# Module Owner: Teacher Grading Specialist
+
+# Handles HTTP requests for export and report endpoints
+
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
+from app.utils.decorators import jwt_required_with_role, admin_or_teacher_required
+from app.modules.reports.export_service import ExportService, EXPORT_FORMATS
+from app.modules.reports.report_card_service import ReportCardService
+from app.modules.reports.violation_analytics_service import (
+    ViolationAnalyticsService, DEFAULT_TOP_OFFENDERS)
+
+reports_bp = Blueprint('reports', __name__)
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+
+def _export_response(headers, stmt, name, sheet_title):
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    body = ExportService.stream_export(
+        headers, stmt, export_format, sheet_title)
+    filename = f"{name}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@reports_bp.route('/quizzes/<quiz_id>/results', methods=['GET'])
+@admin_or_teacher_required
+def export_quiz_results(current_user, quiz_id):
+    """Export all attempts of a quiz as CSV or XLSX"""
+    try:
+        ExportService.verify_quiz_access(quiz_id, current_user)
+        headers, stmt = ExportService.quiz_results_export(quiz_id)
+        return _export_response(headers, stmt, f'quiz_{quiz_id}_results', 'Results')
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
+    except Exception as e:
+        return jsonify({'error': 'Failed to export results', 'details': str(e)}), 500
+
+
+@reports_bp.route('/classes/<class_id>/gradebook', methods=['GET'])
+@admin_or_teacher_required
+def export_class_gradebook(current_user, class_id):
+    """Export a class gradebook as CSV or XLSX"""
+    try:
+        ExportService.verify_class_access(class_id, current_user)
+        headers, stmt = ExportService.class_gradebook_export(class_id)
+        return _export_response(headers, stmt, f'class_{class_id}_gradebook', 'Gradebook')
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
+    except Exception as e:
+        return jsonify({'error': 'Failed to export gradebook', 'details': str(e)}), 500
+
+
+@reports_bp.route('/quizzes/<quiz_id>/violations', methods=['GET'])
+@admin_or_teacher_required
+def export_violation_log(current_user, quiz_id):
+    """Export the violation log of a quiz as CSV or XLSX"""
+    try:
+        ExportService.verify_quiz_access(quiz_id, current_user)
+        headers, stmt = ExportService.violation_log_export(quiz_id)
+        return _export_response(headers, stmt, f'quiz_{quiz_id}_violations', 'Violations')
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
+    except Exception as e:
+        return jsonify({'error': 'Failed to export violations', 'details': str(e)}), 500
+
+
+@reports_bp.route('/quizzes/<quiz_id>/violation-analytics', methods=['GET'])
+@admin_or_teacher_required
+def get_violation_analytics(current_user, quiz_id):
+    """Violation heatmap, per-minute timeline and top offenders of a quiz"""
+    try:
+        ExportService.verify_quiz_access(quiz_id, current_user)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
+
+    try:
+        top = min(request.args.get('top', DEFAULT_TOP_OFFENDERS, type=int), 100)
+        return jsonify(ViolationAnalyticsService.get_quiz_analytics(quiz_id, top)), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Failed to load violation analytics', 'details': str(e)}), 500
+
+
+@reports_bp.route('/attempts/<attempt_id>/report-card', methods=['GET'])
+@jwt_required_with_role()
+def get_report_card(current_user, attempt_id):
+    """Download the PDF report card of an attempt"""
+    try:
+        path = ReportCardService.get_report_card(attempt_id, current_user)
+        return send_file(
+            path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'report_card_{attempt_id}.pdf',
+            conditional=True
+        )
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
+    except Exception as e:
+        return jsonify({'error': 'Failed to generate report card', 'details': str(e)}), 500
+
+
+@reports_bp.route('/classes/<class_id>/quizzes/<quiz_id>/report-cards', methods=['GET'])
+@admin_or_teacher_required
+def get_class_report_cards(current_user, class_id, quiz_id):
+    """Download a zip with the report cards of every student in a class"""
+    try:
+        ExportService.verify_class_access(class_id, current_user)
+        ExportService.verify_quiz_access(quiz_id, current_user)
+
+        filename = f"report_cards_{class_id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.zip"
+        return Response(
+            stream_with_context(
+                ReportCardService.stream_class_report_cards(class_id, quiz_id)),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 403
+    except Exception as e:
+        return jsonify({'error': 'Failed to generate report cards', 'details': str(e)}), 500
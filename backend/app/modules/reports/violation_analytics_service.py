@@ -0,0 +1,173 @@
+# Violation Analytics Service
+# Module Owner: Teacher Grading Specialist
+
+# Handles quiz-level violation analytics: heatmap, timeline and top offenders
+
+# Aggregates are built with grouped queries that join violations through the
+# quiz's attempts, walking idx_violations_attempt_detected, and cached per
+# quiz together with a watermark. Later reads only aggregate the violations
+# detected since the watermark and merge them in, so refreshing a busy
+# exam's analytics costs a range scan per attempt over the last few minutes.
+# detected_at is stamped when the request starts, so a violation can commit
+# well after it; the watermark therefore trails the clock by
+# VIOLATION_ANALYTICS_SETTLE_SECONDS, and the unsettled tail past it is
+# aggregated on every read but never cached. Deleting an attempt drops the
+# quiz's cached aggregates.
+
+from datetime import datetime, timedelta
+from typing import Dict, Any
+from flask import current_app, has_app_context
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from app import db, cache
+from app.models.quiz_attempt import QuizAttempt
+from app.models.student import Student
+from app.models.user import User
+from app.models.violation import Violation
+
+# Students listed under top_offenders unless the caller asks otherwise
+DEFAULT_TOP_OFFENDERS = 10
+
+
+def _analytics_key(quiz_id: str) -> str:
+    return f'violations:analytics:{quiz_id}'
+
+
+def _minute_bucket(column):
+    """SQL expression truncating a timestamp to 'YYYY-MM-DDTHH:MM'"""
+    if db.engine.dialect.name == 'sqlite':
+        return func.strftime('%Y-%m-%dT%H:%M', column)
+    return func.date_format(column, '%Y-%m-%dT%H:%i')
+
+
+def _enum_value(value):
+    return getattr(value, 'value', value)
+
+
+class ViolationAnalyticsService:
+
+    @staticmethod
+    def get_quiz_analytics(quiz_id: str, top: int = DEFAULT_TOP_OFFENDERS) -> Dict[str, Any]:
+        """Heatmap, per-minute timeline and top offenders of a quiz"""
+        now = datetime.utcnow()
+        aggregates = ViolationAnalyticsService._refresh(quiz_id, now)
+        # Violations still settling: counted now, re-read on the next request
+        ViolationAnalyticsService._merge(
+            aggregates, quiz_id, datetime.fromisoformat(aggregates['watermark']), None)
+
+        offenders = sorted(aggregates['students'].items(),
+                           key=lambda item: (-item[1]['violations'], item[1]['student_name'] or ''))
+        timeline = sorted(aggregates['timeline'].items())
+
+        return {
+            'quiz_id': quiz_id,
+            'total_violations': aggregates['total'],
+            'heatmap': [
+                {'violation_type': violation_type,
+                 'question_index': None if question_index == '' else int(question_index),
+                 'count': count}
+                for violation_type, row in sorted(aggregates['heatmap'].items())
+                for question_index, count in sorted(
+                    row.items(), key=lambda item: int(item[0]) if item[0] else -1)
+            ],
+            'timeline': [{'minute': minute, 'count': count} for minute, count in timeline],
+            'window': {
+                'start': timeline[0][0] if timeline else None,
+                'end': timeline[-1][0] if timeline else None
+            },
+            'top_offenders': [dict(student, student_id=student_id)
+                              for student_id, student in offenders[:top]],
+            'as_of': now.isoformat()
+        }
+
+    @staticmethod
+    def _refresh(quiz_id: str, now: datetime) -> Dict[str, Any]:
+        """Cached aggregates of a quiz, caught up to the settle cutoff"""
+        key = _analytics_key(quiz_id)
+        aggregates = cache.get(key)
+        cutoff = now - timedelta(
+            seconds=current_app.config['VIOLATION_ANALYTICS_SETTLE_SECONDS'])
+
+        if aggregates is None:
+            aggregates = {'heatmap': {}, 'timeline': {}, 'students': {}, 'total': 0,
+                          'watermark': None}
+            since = None
+        else:
+            since = datetime.fromisoformat(aggregates['watermark'])
+            if since >= cutoff:
+                return aggregates
+
+        ViolationAnalyticsService._merge(aggregates, quiz_id, since, cutoff)
+        aggregates['watermark'] = cutoff.isoformat()
+        cache.set(key, aggregates,
+                  timeout=current_app.config['VIOLATION_ANALYTICS_CACHE_TTL'])
+        return aggregates
+
+    @staticmethod
+    def _merge(aggregates: Dict[str, Any], quiz_id: str, since, cutoff):
+        """Add the violations detected in [since, cutoff) to ``aggregates``"""
+        criteria = [QuizAttempt.quiz_id == quiz_id]
+        if since is not None:
+            criteria.append(Violation.detected_at >= since)
+        if cutoff is not None:
+            criteria.append(Violation.detected_at < cutoff)
+
+        def grouped(*columns):
+            return db.session.query(*columns, func.count(Violation.id)).select_from(
+                QuizAttempt
+            ).join(
+                Violation, Violation.attempt_id == QuizAttempt.id
+            ).filter(*criteria).group_by(*columns)
+
+        for violation_type, question_index, count in grouped(
+                Violation.violation_type, Violation.question_index):
+            row = aggregates['heatmap'].setdefault(_enum_value(violation_type), {})
+            # Cached as JSON-friendly string keys; '' is "no question"
+            column = '' if question_index is None else str(question_index)
+            row[column] = row.get(column, 0) + count
+            aggregates['total'] += count
+
+        minute = _minute_bucket(Violation.detected_at)
+        for bucket, count in grouped(minute):
+            aggregates['timeline'][bucket] = aggregates['timeline'].get(bucket, 0) + count
+
+        students = aggregates['students']
+        counts = dict(grouped(QuizAttempt.student_id).all())
+        new_students = [student_id for student_id in counts if student_id not in students]
+        if new_students:
+            for student_id, name, registration_number in db.session.query(
+                    Student.id, User.name, Student.registration_number
+            ).join(User, User.id == Student.id).filter(Student.id.in_(new_students)):
+                students[student_id] = {'student_name': name,
+                                        'registration_number': registration_number,
+                                        'violations': 0}
+        for student_id, count in counts.items():
+            students.setdefault(student_id, {'student_name': None,
+                                             'registration_number': None,
+                                             'violations': 0})['violations'] += count
+
+    @staticmethod
+    def invalidate(quiz_id: str):
+        cache.delete(_analytics_key(quiz_id))
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_analytics_invalidations(session, flush_context):
+    # Violations only disappear with their attempt (delete-orphan cascade)
+    quiz_ids = {instance.quiz_id for instance in session.deleted
+                if isinstance(instance, QuizAttempt)}
+    if quiz_ids:
+        session.info.setdefault('pending_analytics_invalidations', set()).update(quiz_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_analytics(session):
+    quiz_ids = session.info.pop('pending_analytics_invalidations', None)
+    if quiz_ids and has_app_context():
+        for quiz_id in quiz_ids:
+            ViolationAnalyticsService.invalidate(quiz_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_analytics_invalidations(session):
+    session.info.pop('pending_analytics_invalidations', None)
@@ -1,77 +1,38 @@
-from datetime import datetime
 from flask import current_app
 from app.models import QuizAttempt, Violation
 from app import db
 import json
-import hashlib
 
 
 class AntiCheatService:
 
     @staticmethod
     def verify_access_code(attempt_id: str, access_code: str, device_info: dict):
-        """Verify access code for quiz attempt"""
-        try:
-            attempt = QuizAttempt.query.filter_by(id=attempt_id).first()
-            if not attempt:
-                return {"error": "Attempt not found"}, 404
-
-            # Generate expected access code (teacher-provided fresh code)
-            # In real implementation, this would come from teacher dashboard
-            expected_code = hashlib.sha256(
-                f"{attempt.id}_{attempt.started_at}".encode()).hexdigest()[:8].upper()
+        """Verify a teacher-generated access code for a quiz attempt"""
+        from app.modules.teacher.access_code_service import AccessCodeService
 
-            if access_code.upper() != expected_code:
-                # Log failed attempt
-                AntiCheatService.log_violation(attempt_id, "INVALID_ACCESS_CODE", {
-                    "attempted_code": access_code,
-                    "device_info": device_info
-                })
-                return {"error": "Invalid access code"}, 401
+        if not db.session.query(QuizAttempt.id).filter_by(id=attempt_id).first():
+            return {"error": "Attempt not found"}, 404
 
-            # Store device info
-            attempt.ip_address = device_info.get('ip', '')
-            attempt.user_agent = device_info.get('userAgent', '')
+        if not AccessCodeService.verify_access_code(attempt_id, access_code, device_info):
+            return {"error": "Invalid or expired access code"}, 401
 
-            # Update status to show access verified
-            db.session.commit()
-
-            return {"message": "Access verified successfully"}, 200
-
-        except Exception as e:
-            current_app.logger.error(f"Error verifying access code: {str(e)}")
-            return {"error": "Internal server error"}, 500
+        return {"message": "Access verified successfully"}, 200
 
     @staticmethod
     def log_violation(attempt_id: str, violation_type: str, details: dict = None):
-        """Log cheating violation"""
-        try:
-            attempt = QuizAttempt.query.filter_by(id=attempt_id).first()
-            if not attempt:
-                return {"error": "Attempt not found"}, 404
-
-            # Create violation record
-            violation = Violation(
-                attempt_id=attempt_id,
-                type=violation_type,
-                details=json.dumps(details) if details else None,
-                timestamp=datetime.utcnow()
-            )
-
-            # Update attempt violation count
-            attempt.total_violations = (attempt.total_violations or 0) + 1
-
-            # Auto-submit if too many violations
-            if attempt.total_violations >= 5:
-                attempt.status = 'AUTO_SUBMITTED'
-                attempt.submitted_at = datetime.utcnow()
-                attempt.auto_submitted_due_to_violations = True
-
-            db.session.add(violation)
-            db.session.commit()
-
-            return {"message": "Violation logged successfully"}, 200
+        """Log cheating violation, scored by the quiz's violation policy"""
+        from app.modules.attempts.attempt_service import AttemptService
 
+        try:
+            result = AttemptService.record_violations(attempt_id, [{
+                'violation_type': violation_type.lower(),
+                'extra_data': details
+            }])
+            return {"message": "Violation logged successfully", **result}, 200
+
+        except ValueError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             current_app.logger.error(f"Error logging violation: {str(e)}")
             return {"error": "Internal server error"}, 500
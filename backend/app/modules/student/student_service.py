@@ -10,15 +10,55 @@ from app.models.class_model import Class
 from app.models.quiz import Quiz, QuizStatus
 from app.models.quiz_attempt import QuizAttempt, AttemptStatus
 from app.models.quiz_question import QuizQuestion
+from app.models.question import QuestionType
 from app.services.attempt_reset_service import AttemptResetService
+from app.services.attempt_heartbeat_service import AttemptHeartbeatService
+from app.utils.caching import cached_result, invalidate_on
 from sqlalchemy import cast, String
 
+STUDENT_DASHBOARD_CACHE = 'student:dashboard'
+# Attempts and enrolment only touch one student's dashboard and class edits
+# one class's; quiz content is shared by every class it is assigned to
+invalidate_on(STUDENT_DASHBOARD_CACHE, Quiz, QuizQuestion)
+invalidate_on(STUDENT_DASHBOARD_CACHE, Student,
+              scope=lambda student: (f'student:{student.id}',))
+invalidate_on(STUDENT_DASHBOARD_CACHE, QuizAttempt,
+              scope=lambda attempt: (f'student:{attempt.student_id}',))
+invalidate_on(STUDENT_DASHBOARD_CACHE, Class,
+              scope=lambda class_obj: (f'class:{class_obj.id}',))
+
+
+def _dashboard_scopes(student_id):
+    class_id = db.session.query(Student.class_id).filter(
+        Student.id == student_id).scalar()
+    return f'student:{student_id}', f'class:{class_id}'
+
 
 class StudentService:
 
     @staticmethod
     def get_student_dashboard(student_id):
         """Get student dashboard data"""
+        dashboard = StudentService._get_dashboard_snapshot(student_id)
+
+        # Availability depends on the clock, not on any row, so it is never
+        # cached: a quiz opening or closing shows up on the next request
+        available_quizzes = []
+        for quiz_data in dashboard['available_quizzes']:
+            availability_status = StudentService._availability_status(
+                StudentService._parse_datetime(quiz_data['available_from']),
+                StudentService._parse_datetime(quiz_data['available_until']))
+            available_quizzes.append(dict(
+                quiz_data,
+                is_available_now=availability_status == 'open',
+                availability_status=availability_status))
+
+        return dict(dashboard, available_quizzes=available_quizzes)
+
+    @staticmethod
+    @cached_result(STUDENT_DASHBOARD_CACHE, scope=_dashboard_scopes)
+    def _get_dashboard_snapshot(student_id):
+        """Dashboard data that only changes with the rows it is built from"""
         student = Student.query.get(student_id)
 
         if not student:
@@ -34,12 +74,8 @@ class StudentService:
                         student_id, quiz.id
                     )
                     if remaining > 0:
-                        availability_status = StudentService._quiz_availability_status(
-                            quiz)
                         quiz_data = quiz.to_dict()
                         quiz_data['remaining_attempts'] = remaining
-                        quiz_data['is_available_now'] = availability_status == 'open'
-                        quiz_data['availability_status'] = availability_status
                         quiz_data['available_from'] = quiz.start_date.isoformat(
                         ) if quiz.start_date else None
                         quiz_data['available_until'] = quiz.end_date.isoformat(
@@ -217,10 +253,12 @@ class StudentService:
     @staticmethod
     def _quiz_availability_status(quiz) -> str:
         """Return availability status for a quiz: 'open', 'upcoming', or 'closed'."""
-        now = StudentService._current_time_for_quiz(quiz)
+        return StudentService._availability_status(quiz.start_date, quiz.end_date)
 
-        start_date = quiz.start_date
-        end_date = quiz.end_date
+    @staticmethod
+    def _availability_status(start_date, end_date) -> str:
+        """Return availability status for a start/end window."""
+        now = StudentService._current_time_for(start_date, end_date)
 
         if start_date and StudentService._compare_datetime(now, start_date) < 0:
             return 'upcoming'
@@ -233,16 +271,19 @@ class StudentService:
         return StudentService._quiz_availability_status(quiz) == 'open'
 
     @staticmethod
-    def _current_time_for_quiz(quiz) -> datetime:
-        """Return current time aligned with quiz datetime timezone (if provided)."""
-        references = [dt for dt in [
-            quiz.start_date, quiz.end_date] if dt is not None]
+    def _current_time_for(start_date, end_date) -> datetime:
+        """Return current time aligned with the window's timezone (if provided)."""
+        references = [dt for dt in [start_date, end_date] if dt is not None]
         for ref in references:
             if ref.tzinfo is not None and ref.tzinfo.utcoffset(ref) is not None:
                 return datetime.now(ref.tzinfo)
         # Fallback: assume naive datetimes are stored in local server time
         return datetime.now()
 
+    @staticmethod
+    def _parse_datetime(value):
+        return datetime.fromisoformat(value) if value else None
+
     @staticmethod
     def _compare_datetime(left: datetime, right: datetime) -> int:
         """Compare datetimes handling naive vs aware values safely."""
@@ -275,6 +316,9 @@ class StudentService:
         if attempt.status != AttemptStatus.IN_PROGRESS:
             raise ValueError('Attempt is not active')
 
+        if attempt.locked_at:
+            raise ValueError('Attempt is locked; ask your teacher for an access code')
+
         # Check time limit
         if attempt.is_time_expired():
             attempt.status = AttemptStatus.AUTO_SUBMITTED
@@ -344,10 +388,29 @@ class StudentService:
         if attempt.status != AttemptStatus.IN_PROGRESS:
             return attempt.to_dict(include_answers=True)
 
+        has_descriptive = StudentService.score_attempt(attempt)
+        attempt.status = AttemptStatus.SUBMITTED
+        attempt.submitted_at = datetime.utcnow()
+
+        # Check if all questions are MCQ (auto-grade)
+        if not has_descriptive:
+            attempt.status = AttemptStatus.GRADED
+
+        db.session.commit()
+
+        return attempt.to_dict(include_answers=True)
+
+    @staticmethod
+    def score_attempt(attempt):
+        """Score MCQ answers and set the attempt's score, percentage and pass flag.
+
+        Shared by manual and automatic submission; the caller sets the status
+        and commits. Returns whether answers are left for manual grading.
+        """
         # Calculate score for MCQ questions
         total_score = 0
         for answer in attempt.answers:
-            if answer.question.type == 'mcq' and answer.answer_option is not None:
+            if answer.question.type == QuestionType.MCQ and answer.answer_option is not None:
                 if answer.answer_option == answer.question.correct_answer:
                     marks = answer.question.marks
                     answer.marks_awarded = marks
@@ -357,24 +420,16 @@ class StudentService:
         attempt.percentage = (
             total_score / attempt.total_marks * 100) if attempt.total_marks > 0 else 0
         attempt.passed = attempt.percentage >= attempt.quiz.passing_percentage
-        attempt.status = AttemptStatus.SUBMITTED
-        attempt.submitted_at = datetime.utcnow()
         attempt.progress = 100
+        # Supersedes any heartbeat still buffered for this attempt
+        AttemptHeartbeatService.take_activity(attempt.id)
         attempt.last_activity_at = datetime.utcnow()
 
-        # Check if all questions are MCQ (auto-grade)
-        has_descriptive = any(
-            ans.question.type in ['descriptive', 'short_answer']
+        return any(
+            ans.question.type in (QuestionType.DESCRIPTIVE, QuestionType.SHORT_ANSWER)
             for ans in attempt.answers
         )
 
-        if not has_descriptive:
-            attempt.status = AttemptStatus.GRADED
-
-        db.session.commit()
-
-        return attempt.to_dict(include_answers=True)
-
     @staticmethod
     def update_student_profile(student_id, profile_data):
         """Update student profile"""
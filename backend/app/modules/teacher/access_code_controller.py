@@ -7,6 +7,7 @@ from flask import Blueprint, request, jsonify
 from app.utils.decorators import jwt_required_with_role, teacher_required
 from app.modules.teacher.access_code_service import AccessCodeService
 from app.models.user import UserRole
+from app.models.quiz_attempt import QuizAttempt
 
 access_codes_bp = Blueprint('access_codes', __name__)
 
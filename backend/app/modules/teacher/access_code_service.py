@@ -1,10 +1,19 @@
 from datetime import datetime, timedelta
 from flask import current_app
-from app.models import QuizAttempt, User
+from app.models import QuizAttempt, Quiz, User, AttemptAccessCode
 from app import db
 import hashlib
 import secrets
-import json
+
+# Minutes a generated code stays valid
+ACCESS_CODE_TTL_MINUTES = 5
+
+# Used and expired codes are kept this long before cleanup
+EXPIRED_CODE_RETENTION = timedelta(days=1)
+
+
+def _hash_code(access_code: str) -> str:
+    return hashlib.sha256(access_code.strip().upper().encode()).hexdigest()
 
 
 class AccessCodeService:
@@ -13,90 +22,75 @@ class AccessCodeService:
     def generate_access_code(attempt_id: str, teacher_id: str) -> str:
         """Generate a fresh access code for a quiz attempt"""
         try:
-            attempt = QuizAttempt.query.filter_by(id=attempt_id).first()
+            attempt = db.session.query(QuizAttempt.id, Quiz.created_by).join(
+                Quiz, Quiz.id == QuizAttempt.quiz_id
+            ).filter(QuizAttempt.id == attempt_id).first()
             if not attempt:
                 raise ValueError("Attempt not found")
 
             # Verify teacher owns the quiz
-            if attempt.quiz.created_by != teacher_id:
+            if attempt.created_by != teacher_id:
                 raise ValueError("Unauthorized: You don't own this quiz")
 
-            # Generate unique code based on attempt ID and current timestamp
-            timestamp = datetime.utcnow().isoformat()
-            code_data = f"{attempt_id}_{timestamp}_{secrets.token_hex(4)}"
-            access_code = hashlib.sha256(
-                code_data.encode()).hexdigest()[:8].upper()
-
-            # Store the code with expiration (5 minutes)
-            code_record = {
-                'attempt_id': attempt_id,
-                'access_code': access_code,
-                'generated_by': teacher_id,
-                'generated_at': timestamp,
-                'expires_at': (datetime.utcnow() + timedelta(minutes=5)).isoformat(),
-                'used': False
-            }
-
-            # Store in attempt metadata (in a real implementation, this would be a separate table)
-            if not attempt.reset_reason:
-                attempt.reset_reason = json.dumps({})
-
-            reasons = json.loads(attempt.reset_reason)
-            reasons['access_code'] = code_record
-            attempt.reset_reason = json.dumps(reasons)
-
+            access_code = secrets.token_hex(4).upper()
+            now = datetime.utcnow()
+
+            # One live code per attempt: a new code replaces unused ones
+            db.session.query(AttemptAccessCode).filter(
+                AttemptAccessCode.attempt_id == attempt_id,
+                AttemptAccessCode.used_at.is_(None)
+            ).delete(synchronize_session=False)
+
+            db.session.add(AttemptAccessCode(
+                attempt_id=attempt_id,
+                teacher_id=teacher_id,
+                code_hash=_hash_code(access_code),
+                created_at=now,
+                expires_at=now + timedelta(minutes=ACCESS_CODE_TTL_MINUTES)
+            ))
             db.session.commit()
 
             return access_code
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error generating access code: {str(e)}")
             raise
 
     @staticmethod
     def verify_access_code(attempt_id: str, access_code: str, device_info: dict = None) -> bool:
-        """Verify an access code for a quiz attempt"""
+        """Verify and consume an access code for a quiz attempt"""
         try:
-            attempt = QuizAttempt.query.filter_by(id=attempt_id).first()
-            if not attempt:
-                return False
-
-            # Get stored code record
-            reasons = json.loads(attempt.reset_reason or '{}')
-            code_record = reasons.get('access_code')
-
-            if not code_record:
-                return False
-
-            # Check if code matches
-            if code_record['access_code'] != access_code.upper():
-                return False
-
-            # Check if code is expired
-            expires_at = datetime.fromisoformat(code_record['expires_at'])
-            if datetime.utcnow() > expires_at:
+            now = datetime.utcnow()
+
+            # Conditional update: of two concurrent verifications only one
+            # sees the code unused, so a code can never be consumed twice
+            consumed = db.session.query(AttemptAccessCode).filter(
+                AttemptAccessCode.attempt_id == attempt_id,
+                AttemptAccessCode.code_hash == _hash_code(access_code),
+                AttemptAccessCode.used_at.is_(None),
+                AttemptAccessCode.expires_at > now
+            ).update({'used_at': now, 'device_info': device_info or None},
+                     synchronize_session=False)
+
+            if not consumed:
+                db.session.rollback()
+                # Logged rather than recorded as a violation, so a mistyped
+                # code never counts towards the quiz's violation policy
+                current_app.logger.warning(
+                    f"Invalid access code for attempt {attempt_id}")
                 return False
 
-            # Check if already used
-            if code_record.get('used', False):
-                return False
-
-            # Mark code as used
-            code_record['used'] = True
-            code_record['used_at'] = datetime.utcnow().isoformat()
-            if device_info:
-                code_record['device_info'] = device_info
-
-            reasons['access_code'] = code_record
-            attempt.reset_reason = json.dumps(reasons)
-
-            # Reset escape attempts
-            # In a real implementation, this would be stored in the attempt
+            # Lift a lock placed by the quiz's violation policy
+            attempt = db.session.get(QuizAttempt, attempt_id)
+            if attempt and attempt.locked_at:
+                attempt.locked_at = None
             db.session.commit()
 
             return True
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error verifying access code: {str(e)}")
             return False
 
@@ -104,37 +98,30 @@ class AccessCodeService:
     def get_active_access_codes(teacher_id: str) -> list:
         """Get all active access codes generated by a teacher"""
         try:
-            # This is a simplified implementation
-            # In a real app, this would query a dedicated access_codes table
-            attempts = QuizAttempt.query.join(QuizAttempt.quiz).filter(
-                Quiz.created_by == teacher_id,
-                QuizAttempt.status == 'IN_PROGRESS',
-                QuizAttempt.reset_reason.isnot(None)
-            ).all()
-
-            active_codes = []
-            for attempt in attempts:
-                try:
-                    reasons = json.loads(attempt.reset_reason or '{}')
-                    code_record = reasons.get('access_code')
-
-                    if code_record and not code_record.get('used', False):
-                        expires_at = datetime.fromisoformat(
-                            code_record['expires_at'])
-                        if datetime.utcnow() < expires_at:
-                            active_codes.append({
-                                'attempt_id': attempt.id,
-                                'student_name': attempt.student.name,
-                                'quiz_title': attempt.quiz.title,
-                                'access_code': code_record['access_code'],
-                                'generated_at': code_record['generated_at'],
-                                'expires_at': code_record['expires_at'],
-                                'student_id': attempt.student_id
-                            })
-                except:
-                    continue
-
-            return active_codes
+            # Range scan of idx_access_codes_teacher_expires
+            rows = db.session.query(
+                AttemptAccessCode.attempt_id, AttemptAccessCode.created_at,
+                AttemptAccessCode.expires_at, QuizAttempt.student_id, User.name, Quiz.title
+            ).join(
+                QuizAttempt, QuizAttempt.id == AttemptAccessCode.attempt_id
+            ).join(
+                Quiz, Quiz.id == QuizAttempt.quiz_id
+            ).join(
+                User, User.id == QuizAttempt.student_id
+            ).filter(
+                AttemptAccessCode.teacher_id == teacher_id,
+                AttemptAccessCode.expires_at > datetime.utcnow(),
+                AttemptAccessCode.used_at.is_(None)
+            ).order_by(AttemptAccessCode.expires_at)
+
+            return [{
+                'attempt_id': attempt_id,
+                'student_name': student_name,
+                'quiz_title': quiz_title,
+                'generated_at': created_at.isoformat() if created_at else None,
+                'expires_at': expires_at.isoformat(),
+                'student_id': student_id
+            } for attempt_id, created_at, expires_at, student_id, student_name, quiz_title in rows]
 
         except Exception as e:
             current_app.logger.error(
@@ -145,19 +132,28 @@ class AccessCodeService:
     def revoke_access_code(attempt_id: str, teacher_id: str) -> bool:
         """Revoke an active access code"""
         try:
-            attempt = QuizAttempt.query.filter_by(id=attempt_id).first()
-            if not attempt or attempt.quiz.created_by != teacher_id:
-                return False
+            revoked = db.session.query(AttemptAccessCode).filter(
+                AttemptAccessCode.attempt_id == attempt_id,
+                AttemptAccessCode.teacher_id == teacher_id,
+                AttemptAccessCode.used_at.is_(None),
+                AttemptAccessCode.expires_at > datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.session.commit()
 
-            reasons = json.loads(attempt.reset_reason or '{}')
-            if 'access_code' in reasons:
-                del reasons['access_code']
-                attempt.reset_reason = json.dumps(reasons)
-                db.session.commit()
-                return True
-
-            return False
+            return revoked > 0
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error revoking access code: {str(e)}")
             return False
+
+    @staticmethod
+    def purge_expired_codes(now: datetime = None) -> int:
+        """Delete codes that expired more than EXPIRED_CODE_RETENTION ago"""
+        cutoff = (now or datetime.utcnow()) - EXPIRED_CODE_RETENTION
+        purged = db.session.query(AttemptAccessCode).filter(
+            AttemptAccessCode.expires_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+        return purged
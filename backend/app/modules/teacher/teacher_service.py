@@ -11,11 +11,19 @@ from app.models.class_model import Class
 from app.models.quiz import Quiz, QuizStatus
 from app.models.quiz_attempt import QuizAttempt, AttemptStatus
 from app.models.student_answer import StudentAnswer
+from app.models.quiz_question import QuizQuestion
+from app.utils.caching import cached_result, invalidate_on
+from app.utils.serializers import QUIZ_PLAN
+
+TEACHER_DASHBOARD_CACHE = 'teacher:dashboard'
+invalidate_on(TEACHER_DASHBOARD_CACHE,
+              Teacher, Class, Student, Quiz, QuizQuestion, QuizAttempt)
 
 
 class TeacherService:
 
     @staticmethod
+    @cached_result(TEACHER_DASHBOARD_CACHE)
     def get_teacher_dashboard(teacher_id):
         """Get teacher dashboard data"""
         teacher = Teacher.query.get(teacher_id)
@@ -94,12 +102,12 @@ class TeacherService:
             except ValueError:
                 raise ValueError('Invalid status')
 
-        quizzes = query.order_by(Quiz.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        quizzes = query.options(*QUIZ_PLAN.options()).order_by(
+            Quiz.created_at.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
 
         return {
-            'quizzes': [q.to_dict(include_classes=True) for q in quizzes.items],
+            'quizzes': QUIZ_PLAN.dump_many(quizzes.items),
             'total': quizzes.total,
             'pages': quizzes.pages,
             'current_page': page
@@ -10,6 +10,7 @@ from app.models.student import Student
 from app.models.password_reset_token import PasswordResetToken
 from app.models.refresh_token import RefreshToken
 from app.utils.decorators import jwt_required_with_role
+from app.services.mail_service import MailService
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -229,13 +230,12 @@ def forgot_password():
     )
 
     db.session.add(reset_token)
+    # Sent by the mail worker once this commits; the code only goes out by email
+    MailService.enqueue(user.email, 'password_reset', {'token': token})
     db.session.commit()
 
-    # TODO: Send email with token
-    # For now, return the token (remove in production)
     return jsonify({
-        'message': 'Password reset token sent to email',
-        'token': token  # Remove this in production
+        'message': 'Password reset token sent to email'
     }), 200
 
 
@@ -23,7 +23,7 @@ def get_notifications(current_user):
     unread_count = NotificationService.get_unread_count(current_user.id)
 
     return jsonify({
-        'notifications': [n.to_dict() for n in notifications],
+        'notifications': notifications,
         'unread_count': unread_count,
         'total': len(notifications)
     }), 200
@@ -33,14 +33,14 @@ def get_notifications(current_user):
 @jwt_required_with_role()
 def mark_read(notification_id, current_user):
     """Mark notification as read"""
-    notification = NotificationService.mark_as_read(notification_id)
+    notification = NotificationService.mark_as_read(notification_id, current_user.id)
 
-    if not notification or notification.user_id != current_user.id:
+    if not notification:
         return jsonify({'error': 'Notification not found'}), 404
 
     return jsonify({
         'success': True,
-        'notification': notification.to_dict()
+        'notification': notification
     }), 200
 
 
@@ -59,12 +59,9 @@ def mark_all_read(current_user):
 @jwt_required_with_role()
 def delete_notification(notification_id, current_user):
     """Delete notification"""
-    notification = NotificationService.mark_as_read(notification_id)
-
-    if not notification or notification.user_id != current_user.id:
+    if not NotificationService.delete_notification(notification_id, current_user.id):
         return jsonify({'error': 'Notification not found'}), 404
 
-    NotificationService.delete_notification(notification_id)
     return jsonify({'success': True}), 200
 
 
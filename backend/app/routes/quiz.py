@@ -5,8 +5,8 @@ from app.models.question import Question, QuestionType, Difficulty
 from app.models.quiz_question import QuizQuestion
 from app.models.class_model import Class
 from app.services.notification_service import NotificationService
+from app.services.quiz_code_service import QuizCodeService
 from app import db
-import uuid
 
 quiz_bp = Blueprint('quiz', __name__)
 
@@ -60,7 +60,7 @@ def create_quiz(current_user):
             return jsonify({'error': f'{field} is required'}), 400
 
     try:
-        access_code = ''.join([str(uuid.uuid4().int)[:6].upper()])
+        access_code = QuizCodeService.allocate()
 
         quiz = Quiz(
             title=data['title'],
@@ -115,7 +115,6 @@ def publish_quiz(current_user, quiz_id):
         return jsonify({'error': 'Quiz must have questions before publishing'}), 400
 
     quiz.status = QuizStatus.PUBLISHED
-    db.session.commit()
 
     class_ids = [c.id for c in quiz.classes]
     NotificationService.notify_quiz_published(
@@ -124,6 +123,7 @@ def publish_quiz(current_user, quiz_id):
         subject=quiz.subject,
         class_ids=class_ids
     )
+    db.session.commit()
 
     return jsonify({
         'message': 'Quiz published successfully',
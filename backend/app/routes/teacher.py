@@ -1,11 +1,14 @@
 from flask import Blueprint, request, jsonify
 from app.utils.decorators import teacher_required
-from app.models.quiz import Quiz, generate_access_code
+from app.models.quiz import Quiz
 from app.models.student import Student
 from app.models.class_model import Class
 from app.models.quiz_attempt import QuizAttempt, AttemptStatus
 from app.models.teacher import Teacher
 from app.services.notification_service import NotificationService
+from app.services.quiz_code_service import QuizCodeService
+from app.utils.serializers import QUIZ_PLAN
+from app.modules.teacher.teacher_service import TeacherService
 from app import db
 
 teacher_bp = Blueprint('teacher', __name__)
@@ -15,38 +18,10 @@ teacher_bp = Blueprint('teacher', __name__)
 @teacher_required
 def get_dashboard(current_user):
     """Get teacher dashboard data"""
-    teacher = Teacher.query.get(current_user.id)
-
-    # Get teacher's classes
-    classes = teacher.classes
-
-    # Get teacher's quizzes
-    quizzes = Quiz.query.filter_by(created_by=current_user.id).all()
-
-    # Get recent attempts
-    recent_attempts = []
-    for quiz in quizzes:
-        attempts = QuizAttempt.query.filter_by(quiz_id=quiz.id).order_by(
-            QuizAttempt.started_at.desc()
-        ).limit(5).all()
-        recent_attempts.extend([a.to_dict() for a in attempts])
-
-    # Sort by start date
-    recent_attempts.sort(key=lambda x: x['started_at'], reverse=True)
-    recent_attempts = recent_attempts[:10]
-
-    return jsonify({
-        'teacher': teacher.to_dict(include_user=False),
-        'classes': [c.to_dict() for c in classes],
-        'quizzes': [q.to_dict() for q in quizzes],
-        'recent_attempts': recent_attempts,
-        'stats': {
-            'total_quizzes': len(quizzes),
-            'total_classes': len(classes),
-            'total_students': sum(len(c.students) for c in classes),
-            'published_quizzes': len([q for q in quizzes if q.status.value == 'published'])
-        }
-    }), 200
+    try:
+        return jsonify(TeacherService.get_teacher_dashboard(current_user.id)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
 
 
 @teacher_bp.route('/classes', methods=['GET'])
@@ -98,12 +73,12 @@ def get_teacher_quizzes(current_user):
         except ValueError:
             return jsonify({'error': 'Invalid status'}), 400
 
-    quizzes = query.order_by(Quiz.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    quizzes = query.options(*QUIZ_PLAN.options()).order_by(
+        Quiz.created_at.desc()
+    ).paginate(page=page, per_page=per_page, error_out=False)
 
     return jsonify({
-        'quizzes': [q.to_dict(include_classes=True) for q in quizzes.items],
+        'quizzes': QUIZ_PLAN.dump_many(quizzes.items),
         'total': quizzes.total,
         'pages': quizzes.pages,
         'current_page': page
@@ -152,32 +127,23 @@ def regenerate_access_code(current_user, quiz_id):
     if quiz.created_by != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
 
-    # Generate a unique code with a few retries
-    new_code = None
-    for _ in range(10):
-        candidate = generate_access_code()
-        if not Quiz.query.filter_by(access_code=candidate).first():
-            new_code = candidate
-            break
-
-    if not new_code:
-        return jsonify({'error': 'Failed to generate unique access code'}), 500
-
+    new_code = QuizCodeService.allocate()
     quiz.access_code = new_code
 
-    try:
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to update access code', 'details': str(e)}), 500
-
     class_ids = [c.id for c in quiz.classes]
     NotificationService.notify_quiz_access_code(
+        quiz_id=quiz.id,
         quiz_title=quiz.title,
         access_code=new_code,
         class_ids=class_ids
     )
 
+    try:
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to update access code', 'details': str(e)}), 500
+
     return jsonify({
         'message': 'New access code generated successfully',
         'access_code': new_code,
@@ -0,0 +1,180 @@
+# Attempt Heartbeat Service
+# Module Owner: Student 7 - Attempt Management Specialist
+
+# Handles quiz heartbeats: timer sync and buffered activity tracking
+
+# A heartbeat reads only a small cached record per attempt (owner, status,
+# lock, start time, time limit), so it never touches the database on the hot path.
+# Activity timestamps are kept in a per-process buffer and written out as a
+# single UPDATE ... CASE statement once per flush interval by a background
+# task (start_activity_flusher), never on a student's request. The buffer is
+# also flushed at exit; at most one interval of activity is lost if the
+# process dies. A flush never moves last_activity_at backwards, so a late
+# flush cannot overwrite the time a submit recorded.
+
+import atexit
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import case, event, inspect, or_, update
+from sqlalchemy.orm import Session
+from app import db, cache, socketio
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.quiz import Quiz
+
+# Rows per UPDATE ... CASE statement
+ACTIVITY_FLUSH_CHUNK = 500
+
+_activity_lock = threading.Lock()
+_pending_activity = {}  # attempt id -> latest heartbeat time
+_flusher_started = False
+
+
+def _metadata_key(attempt_id: str) -> str:
+    return f'attempts:heartbeat:{attempt_id}'
+
+
+class AttemptHeartbeatService:
+
+    @staticmethod
+    def heartbeat(attempt_id: str, student_id: str) -> Dict[str, Any]:
+        """Record activity and return server time, remaining seconds and status"""
+        metadata = AttemptHeartbeatService.get_metadata(attempt_id)
+        if not metadata or metadata['student_id'] != student_id:
+            raise ValueError('Attempt not found')
+
+        now = datetime.utcnow()
+        remaining = None
+        if metadata['time_limit_seconds']:
+            elapsed = (now - datetime.fromisoformat(metadata['started_at'])).total_seconds()
+            remaining = max(0, int(metadata['time_limit_seconds'] - elapsed))
+
+        if metadata['status'] == AttemptStatus.IN_PROGRESS.value:
+            AttemptHeartbeatService.record_activity(attempt_id, now)
+
+        return {
+            'attempt_id': attempt_id,
+            'server_time': now.isoformat(),
+            'remaining_seconds': remaining,
+            'status': metadata['status'],
+            'locked': metadata['locked']
+        }
+
+    @staticmethod
+    def get_metadata(attempt_id: str) -> Optional[Dict[str, Any]]:
+        """Owner, status, start time and time limit of an attempt, cached"""
+        key = _metadata_key(attempt_id)
+        metadata = cache.get(key)
+        if metadata is None:
+            row = db.session.query(
+                QuizAttempt.student_id, QuizAttempt.status, QuizAttempt.started_at,
+                QuizAttempt.locked_at, Quiz.time_limit_minutes
+            ).join(Quiz, Quiz.id == QuizAttempt.quiz_id).filter(
+                QuizAttempt.id == attempt_id).first()
+            if not row:
+                return None
+            metadata = {
+                'student_id': row.student_id,
+                'status': row.status.value,
+                'started_at': row.started_at.isoformat() if row.started_at else None,
+                'locked': row.locked_at is not None,
+                'time_limit_seconds': (row.time_limit_minutes or 0) * 60
+                if row.started_at else 0
+            }
+            cache.set(key, metadata, timeout=current_app.config['ATTEMPT_METADATA_CACHE_TTL'])
+        return metadata
+
+    @staticmethod
+    def record_activity(attempt_id: str, at: datetime):
+        """Buffer an activity timestamp for the next flush"""
+        with _activity_lock:
+            _pending_activity[attempt_id] = at
+
+    @staticmethod
+    def take_activity(attempt_id: str) -> Optional[datetime]:
+        """Remove and return an attempt's buffered timestamp, e.g. on submit"""
+        with _activity_lock:
+            return _pending_activity.pop(attempt_id, None)
+
+    @staticmethod
+    def flush_activity() -> int:
+        """Write buffered activity with one UPDATE ... CASE per chunk"""
+        global _pending_activity
+        with _activity_lock:
+            pending, _pending_activity = _pending_activity, {}
+        if not pending:
+            return 0
+
+        attempt_ids = list(pending)
+        table = QuizAttempt.__table__
+        # Own short transaction, independent of the request's session
+        with db.engine.begin() as connection:
+            for start in range(0, len(attempt_ids), ACTIVITY_FLUSH_CHUNK):
+                chunk = attempt_ids[start:start + ACTIVITY_FLUSH_CHUNK]
+                latest = case({attempt_id: pending[attempt_id] for attempt_id in chunk},
+                              value=table.c.id)
+                connection.execute(
+                    update(table).where(
+                        table.c.id.in_(chunk),
+                        or_(table.c.last_activity_at.is_(None),
+                            table.c.last_activity_at < latest)
+                    ).values(last_activity_at=latest))
+        return len(attempt_ids)
+
+    @staticmethod
+    def start_activity_flusher(app):
+        """Flush buffered activity every ATTEMPT_ACTIVITY_FLUSH_INTERVAL
+        seconds in a background task, and once more at exit.
+
+        Started once per web process (run.py).
+        """
+        global _flusher_started
+        with _activity_lock:
+            if _flusher_started:
+                return
+            _flusher_started = True
+
+        def flush():
+            with app.app_context():
+                try:
+                    AttemptHeartbeatService.flush_activity()
+                except Exception as e:
+                    app.logger.error(f"Attempt activity flush failed: {str(e)}")
+
+        def run():
+            while True:
+                socketio.sleep(app.config['ATTEMPT_ACTIVITY_FLUSH_INTERVAL'])
+                flush()
+
+        socketio.start_background_task(run)
+        atexit.register(flush)
+
+    @staticmethod
+    def invalidate(attempt_id: str):
+        cache.delete(_metadata_key(attempt_id))
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_heartbeat_invalidations(session, flush_context):
+    changed = {
+        attempt.id for attempt in session.dirty
+        if isinstance(attempt, QuizAttempt) and any(
+            inspect(attempt).attrs[field].history.has_changes()
+            for field in ('status', 'started_at', 'student_id', 'locked_at'))
+    }
+    if changed:
+        session.info.setdefault('pending_heartbeat_invalidations', set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_heartbeat_metadata(session):
+    attempt_ids = session.info.pop('pending_heartbeat_invalidations', None)
+    if attempt_ids and has_app_context():
+        for attempt_id in attempt_ids:
+            AttemptHeartbeatService.invalidate(attempt_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_heartbeat_invalidations(session):
+    session.info.pop('pending_heartbeat_invalidations', None)
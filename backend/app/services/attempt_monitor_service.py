@@ -0,0 +1,138 @@
+# Attempt Monitor Service
+# Module Owner: Student 7 - Attempt Management Specialist
+
+# Handles the live quiz monitoring channel for teachers
+
+# Teachers join a Socket.IO room per quiz and get one snapshot of its
+# attempts, then compact deltas. Deltas are collected from the ORM: any
+# flush that creates an attempt or changes one of MONITORED_FIELDS queues a
+# delta, and the deltas are emitted once the transaction commits, so every
+# code path that updates attempts feeds the channel without being aware of it.
+
+from typing import List, Dict, Any
+from sqlalchemy import event, func, inspect, and_, or_
+from sqlalchemy.orm import Session
+from app import db, socketio
+from app.models.quiz_attempt import QuizAttempt
+from app.models.student import Student
+from app.models.student_answer import StudentAnswer
+from app.models.user import User
+
+MONITORED_FIELDS = ('status', 'progress', 'current_question_index', 'total_violations')
+
+
+def monitor_room(quiz_id: str) -> str:
+    return f'quiz:{quiz_id}:monitor'
+
+
+def _status_value(status):
+    return getattr(status, 'value', status)
+
+
+class AttemptMonitorService:
+
+    @staticmethod
+    def snapshot(quiz_id: str) -> List[Dict[str, Any]]:
+        """Compact state of every attempt of a quiz, newest first.
+
+        One query over attempts, student names and an answered-count
+        subquery; answers, questions and violations are never loaded.
+        """
+        answered = db.session.query(
+            StudentAnswer.attempt_id,
+            func.count(StudentAnswer.id).label('answered')
+        ).filter(
+            or_(and_(StudentAnswer.answer_text.isnot(None), StudentAnswer.answer_text != ''),
+                StudentAnswer.answer_option.isnot(None))
+        ).group_by(StudentAnswer.attempt_id).subquery()
+
+        rows = db.session.query(
+            QuizAttempt.id, QuizAttempt.student_id, QuizAttempt.status, QuizAttempt.progress,
+            QuizAttempt.current_question_index, QuizAttempt.total_violations,
+            QuizAttempt.started_at, QuizAttempt.last_activity_at,
+            User.name, Student.registration_number,
+            func.coalesce(answered.c.answered, 0)
+        ).join(
+            Student, Student.id == QuizAttempt.student_id
+        ).join(
+            User, User.id == Student.id
+        ).outerjoin(
+            answered, answered.c.attempt_id == QuizAttempt.id
+        ).filter(
+            QuizAttempt.quiz_id == quiz_id
+        ).order_by(QuizAttempt.started_at.desc())
+
+        return [{
+            'attempt_id': attempt_id,
+            'student_id': student_id,
+            'student_name': name,
+            'registration_number': registration_number,
+            'status': _status_value(status),
+            'progress': progress,
+            'current_question_index': current_question_index,
+            'violations': total_violations or 0,
+            'answered_questions': answered_count,
+            'started_at': started_at.isoformat() if started_at else None,
+            'last_activity_at': last_activity_at.isoformat() if last_activity_at else None
+        } for (attempt_id, student_id, status, progress, current_question_index,
+               total_violations, started_at, last_activity_at, name, registration_number,
+               answered_count) in rows]
+
+    @staticmethod
+    def delta(attempt: QuizAttempt) -> Dict[str, Any]:
+        """The monitored fields of one attempt"""
+        return {
+            'attempt_id': attempt.id,
+            'student_id': attempt.student_id,
+            'status': _status_value(attempt.status),
+            'progress': attempt.progress,
+            'current_question_index': attempt.current_question_index,
+            'violations': attempt.total_violations or 0
+        }
+
+    @staticmethod
+    def queue_delta(attempt: QuizAttempt):
+        """Emit a delta on commit for an attempt changed outside the ORM"""
+        deltas = db.session.info.setdefault('pending_monitor_deltas', {})
+        deltas[attempt.id] = (attempt.quiz_id, AttemptMonitorService.delta(attempt))
+
+
+def _monitored_change(attempt) -> bool:
+    state = inspect(attempt)
+    return any(state.attrs[field].history.has_changes() for field in MONITORED_FIELDS)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_attempt_deltas(session, flush_context):
+    deltas = session.info.setdefault('pending_monitor_deltas', {})
+    for attempt in session.new:
+        if isinstance(attempt, QuizAttempt):
+            # Usually already in the identity map (the request's current user)
+            with session.no_autoflush:
+                user = session.get(User, attempt.student_id)
+            deltas[attempt.id] = (attempt.quiz_id, dict(
+                AttemptMonitorService.delta(attempt), new=True,
+                student_name=user.name if user else None))
+    for attempt in session.dirty:
+        if isinstance(attempt, QuizAttempt) and _monitored_change(attempt):
+            previous = deltas.get(attempt.id)
+            delta = AttemptMonitorService.delta(attempt)
+            if previous and previous[1].get('new'):
+                delta = dict(previous[1], **delta)
+            deltas[attempt.id] = (attempt.quiz_id, delta)
+    if not deltas:
+        session.info.pop('pending_monitor_deltas', None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _emit_attempt_deltas(session):
+    deltas = session.info.pop('pending_monitor_deltas', None)
+    if not deltas:
+        return
+    for quiz_id, delta in deltas.values():
+        socketio.emit('attempt_delta', dict(delta, quiz_id=quiz_id), room=monitor_room(quiz_id))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_attempt_deltas(session):
+    session.info.pop('pending_monitor_deltas', None)
@@ -72,16 +72,17 @@ class AttemptResetService:
             attempt.original_max_attempts = quiz.max_attempts
             attempt.additional_attempts_granted = additional_attempts
 
-        db.session.commit()
-
-        # Send notification to student
+        # Queue notification to student in the same transaction as the reset
         NotificationService.notify_attempt_reset(
+            quiz_id=quiz_id,
             student_id=student_id,
             quiz_title=quiz.title,
             additional_attempts=additional_attempts,
             reason=reason
         )
 
+        db.session.commit()
+
         # Log audit trail
         audit = AuditLog(
             user_id=reset_by,
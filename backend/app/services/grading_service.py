@@ -160,10 +160,9 @@ class GradingService:
         # Note: graded_at and graded_by fields don't exist in the model
         # We'll use submitted_at as the grading timestamp
 
-        db.session.commit()
-
-        # Send notification to student
+        # Queue notification to student in the same transaction as the grades
         NotificationService.notify_attempt_graded(
+            attempt_id=attempt.id,
             student_id=attempt.student_id,
             quiz_title=attempt.quiz.title,
             score=float(total_score),
@@ -172,6 +171,8 @@ class GradingService:
                         100) if total_possible > 0 else 0
         )
 
+        db.session.commit()
+
         return attempt.to_dict(include_answers=True)
 
     @staticmethod
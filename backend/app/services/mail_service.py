@@ -0,0 +1,203 @@
+# Mail Service
+# Module Owner: Student 6 - Communication Specialist
+
+# Handles queued email delivery for notifications and account messages
+
+# Request handlers and the notification outbox only insert rows into
+# email_queue; the mail worker (worker.py) sends them in batches over one
+# SMTP connection each, retrying failures with exponential backoff and
+# keeping every recipient domain under a per-minute send limit.
+
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import insert
+from app import db, mail
+from app.models.queued_email import QueuedEmail, generate_uuid
+from app.models.user import User
+from app.models.student import Student
+
+# Mail-only messages (not shown as in-app notifications)
+MAIL_TEMPLATES = {
+    "password_reset": {
+        "title": "Reset your QuizMaster password",
+        "message": "Use the code {token} to reset your password. It expires in 1 hour. "
+                   "If you did not ask for a reset, you can ignore this email."
+    }
+}
+
+# Templates whose bodies carry secrets (reset codes); their rows are deleted
+# by the retention job once delivery has succeeded or given up
+SENSITIVE_MAIL_TEMPLATES = ('password_reset',)
+
+# Rows per executemany round trip when queueing
+MAIL_QUEUE_CHUNK = 1000
+
+# Recent send times per recipient domain, for the per-minute limit
+_domain_sends = defaultdict(deque)
+
+
+def _template(template_name: str) -> Dict[str, Any]:
+    from app.services.notification_service import NOTIFICATION_TEMPLATES
+
+    template = MAIL_TEMPLATES.get(template_name) or NOTIFICATION_TEMPLATES.get(template_name)
+    if not template:
+        raise ValueError(f"Unknown mail template: {template_name}")
+    return template
+
+
+def _render(template_name: str, template_data: Dict[str, Any]):
+    template = _template(template_name)
+    return template['title'].format(**template_data), template['message'].format(**template_data)
+
+
+def _domain_available(domain: str, now: float, limit: int) -> Optional[float]:
+    """None if ``domain`` may be sent to now, else seconds until it may"""
+    sends = _domain_sends[domain]
+    while sends and now - sends[0] >= 60:
+        sends.popleft()
+    if limit and len(sends) >= limit:
+        return 60 - (now - sends[0])
+    return None
+
+
+class MailService:
+
+    @staticmethod
+    def enqueue(recipient: str, template_name: str, template_data: Dict[str, Any]) -> QueuedEmail:
+        """Stage one email in the caller's transaction"""
+        subject, body = _render(template_name, template_data)
+        email = QueuedEmail(recipient=recipient, subject=subject, body=body,
+                            template=template_name)
+        db.session.add(email)
+        return email
+
+    @staticmethod
+    def enqueue_notification(
+        notification_type: str,
+        template_data: Dict[str, Any],
+        user_ids: Optional[List[str]] = None,
+        class_ids: Optional[List[str]] = None
+    ) -> int:
+        """Stage one email per recipient of a notification; returns the count.
+
+        Templates marked ``email_parents`` also go to the parent email of
+        each student among ``user_ids``. The message is rendered once and
+        copied per recipient, and rows are written with chunked executemany
+        inserts. Does not commit.
+        """
+        subject, message = _render(notification_type, template_data)
+        link = template_data.get('link')
+        body = f"{message}\n\n{current_app.config['FRONTEND_URL']}{link}" if link else message
+
+        recipients = []
+        if user_ids:
+            recipients.extend(db.session.query(User.email).filter(
+                User.id.in_(user_ids), User.is_active == True))
+            if _template(notification_type).get('email_parents'):
+                recipients.extend(db.session.query(Student.parent_email.label('email')).filter(
+                    Student.id.in_(user_ids)))
+        if class_ids:
+            recipients.extend(db.session.query(User.email).join(
+                Student, Student.id == User.id
+            ).filter(Student.class_id.in_(class_ids), User.is_active == True))
+        emails = list(dict.fromkeys(row.email for row in recipients if row.email))
+
+        now = datetime.utcnow()
+        row_template = {
+            'subject': subject,
+            'body': body,
+            'template': notification_type,
+            'status': 'pending',
+            'attempts': 0,
+            'next_attempt_at': now,
+            'created_at': now
+        }
+        table = QueuedEmail.__table__
+        for start in range(0, len(emails), MAIL_QUEUE_CHUNK):
+            db.session.execute(insert(table), [
+                dict(row_template, id=generate_uuid(), recipient=email)
+                for email in emails[start:start + MAIL_QUEUE_CHUNK]])
+        return len(emails)
+
+    @staticmethod
+    def process_queue(batch_size: Optional[int] = None) -> int:
+        """Send a batch of due emails over one SMTP connection.
+
+        Rows are claimed with SKIP LOCKED so several workers can share the
+        queue. A failed send is retried after MAIL_RETRY_BACKOFF * 2^(n-1)
+        seconds until MAIL_MAX_ATTEMPTS; a recipient domain over its
+        per-minute limit is deferred without using up an attempt.
+        Returns the number of emails sent.
+        """
+        config = current_app.config
+        batch_size = batch_size or config['MAIL_QUEUE_BATCH_SIZE']
+        now = datetime.utcnow()
+
+        emails = QueuedEmail.query.filter(
+            QueuedEmail.status == 'pending',
+            QueuedEmail.next_attempt_at <= now
+        ).order_by(
+            QueuedEmail.next_attempt_at
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not emails:
+            db.session.commit()
+            return 0
+
+        sent = 0
+        try:
+            with mail.connect() as connection:
+                for email in emails:
+                    domain = email.recipient.rpartition('@')[2].lower()
+                    wait = _domain_available(domain, time.monotonic(),
+                                             config['MAIL_DOMAIN_RATE_LIMIT'])
+                    if wait is not None:
+                        email.next_attempt_at = now + timedelta(seconds=wait)
+                        continue
+
+                    try:
+                        connection.send(Message(subject=email.subject, recipients=[email.recipient],
+                                                body=email.body))
+                    except Exception as e:
+                        MailService._retry_later(email, e, now)
+                        continue
+
+                    _domain_sends[domain].append(time.monotonic())
+                    email.status = 'sent'
+                    email.sent_at = datetime.utcnow()
+                    email.attempts += 1
+                    sent += 1
+        except Exception as e:
+            # Connecting (or closing) failed; every unsent email waits its backoff
+            current_app.logger.error(f"SMTP connection failed: {str(e)}")
+            for email in emails:
+                if email.status == 'pending' and email.next_attempt_at <= now:
+                    MailService._retry_later(email, e, now)
+
+        db.session.commit()
+        return sent
+
+    @staticmethod
+    def purge_sensitive() -> int:
+        """Delete sent and failed emails built from SENSITIVE_MAIL_TEMPLATES"""
+        purged = db.session.query(QueuedEmail).filter(
+            QueuedEmail.template.in_(SENSITIVE_MAIL_TEMPLATES),
+            QueuedEmail.status.in_(('sent', 'failed'))
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return purged
+
+    @staticmethod
+    def _retry_later(email: QueuedEmail, error: Exception, now: datetime):
+        config = current_app.config
+        email.attempts += 1
+        email.last_error = str(error)[:500]
+        if email.attempts >= config['MAIL_MAX_ATTEMPTS']:
+            email.status = 'failed'
+        else:
+            email.next_attempt_at = now + timedelta(
+                seconds=config['MAIL_RETRY_BACKOFF'] * 2 ** (email.attempts - 1))
@@ -0,0 +1,182 @@
+# Notification Retention Service
+# Module Owner: Student 6 - Communication Specialist
+
+# Handles purging of expired and aged-out notifications in small chunks
+
+# Each pass selects a bounded batch of primary keys through an index on the
+# retention column (expires_at, created_at or read_at), deletes exactly those
+# rows, commits, and pauses before the next batch. Locks are held for one
+# chunk at a time, so the job can run during school hours.
+
+# Purged notifications and broadcasts leave tombstones for their readers in
+# the same transaction, like explicit deletes, so incremental sync clients
+# drop them too.
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any
+from flask import current_app
+from sqlalchemy import insert
+from app import db
+from app.models.notification import Notification
+from app.models.broadcast_notification import BroadcastNotification
+from app.models.notification_receipt import NotificationReceipt
+from app.models.notification_tombstone import NotificationTombstone, generate_uuid
+from app.models.notification_event import NotificationEvent
+
+# Outbox event type asking the worker for an immediate retention pass; the
+# outbox fan-out skips it
+RETENTION_REQUEST_EVENT = 'notification_retention'
+
+# Days a notification is kept after it is created, by category
+NOTIFICATION_RETENTION_DAYS = {
+    "quiz": 90,
+    "grade": 365,
+    "system": 30,
+    "attempt_reset": 90,
+    "violation": 180
+}
+
+
+class NotificationRetentionService:
+
+    @staticmethod
+    def purge(now: datetime = None) -> Dict[str, Any]:
+        """Run one retention pass; returns rows purged per rule"""
+        now = now or datetime.utcnow()
+        config = current_app.config
+        chunk_size = config['NOTIFICATION_RETENTION_CHUNK_SIZE']
+        pause = config['NOTIFICATION_RETENTION_PAUSE']
+        read_cutoff = now - timedelta(days=config['NOTIFICATION_READ_RETENTION_DAYS'])
+        started = time.perf_counter()
+
+        def purge_notifications(criterion, order_column):
+            return NotificationRetentionService._purge_in_chunks(
+                Notification, criterion, order_column, chunk_size, pause,
+                before_delete=NotificationRetentionService._tombstone_notifications)
+
+        def purge_broadcasts(criterion, order_column):
+            return NotificationRetentionService._purge_in_chunks(
+                BroadcastNotification, criterion, order_column, chunk_size, pause,
+                before_delete=NotificationRetentionService._tombstone_broadcasts)
+
+        report = {
+            'expired': purge_notifications(
+                Notification.expires_at < now, Notification.expires_at),
+            'read': purge_notifications(
+                (Notification.is_read == True) & (Notification.read_at < read_cutoff),
+                Notification.read_at),
+            'categories': {},
+            'broadcasts': purge_broadcasts(
+                BroadcastNotification.expires_at < now, BroadcastNotification.expires_at),
+            # Sync cursors older than this fall back to a full list
+            'tombstones': NotificationRetentionService._purge_in_chunks(
+                NotificationTombstone, NotificationTombstone.deleted_at < read_cutoff,
+                NotificationTombstone.deleted_at, chunk_size, pause),
+            # Delivered and dead-lettered outbox events, and claimed purge requests
+            'events': NotificationRetentionService._purge_in_chunks(
+                NotificationEvent,
+                (NotificationEvent.processed == True) &
+                (NotificationEvent.processed_at < read_cutoff),
+                NotificationEvent.processed_at, chunk_size, pause)
+        }
+
+        for category, days in NOTIFICATION_RETENTION_DAYS.items():
+            cutoff = now - timedelta(days=days)
+            report['categories'][category] = purge_notifications(
+                (Notification.category == category) & (Notification.created_at < cutoff),
+                Notification.created_at)
+            report['broadcasts'] += purge_broadcasts(
+                (BroadcastNotification.category == category) &
+                (BroadcastNotification.created_at < cutoff),
+                BroadcastNotification.created_at)
+
+        report['total'] = (report['expired'] + report['read'] + report['broadcasts'] +
+                           report['tombstones'] + report['events'] +
+                           sum(report['categories'].values()))
+        report['duration_seconds'] = round(time.perf_counter() - started, 3)
+
+        current_app.logger.info(f"Notification retention purged {report['total']} rows: {report}")
+        return report
+
+    @staticmethod
+    def request_purge(requested_by: str = None) -> NotificationEvent:
+        """Queue a retention pass for the worker instead of running it in a request"""
+        event = NotificationEvent(
+            event_type=RETENTION_REQUEST_EVENT,
+            entity_type='notifications',
+            entity_id=requested_by or RETENTION_REQUEST_EVENT,
+            triggered_by=requested_by,
+            recipients={},
+            notification_template=RETENTION_REQUEST_EVENT
+        )
+        db.session.add(event)
+        db.session.commit()
+        return event
+
+    @staticmethod
+    def claim_requests() -> int:
+        """Mark queued retention requests handled; returns how many were pending.
+
+        The conditional UPDATE lets only one worker claim each request.
+        """
+        claimed = db.session.query(NotificationEvent).filter(
+            NotificationEvent.event_type == RETENTION_REQUEST_EVENT,
+            NotificationEvent.processed == False
+        ).update({'processed': True, 'processed_at': datetime.utcnow()},
+                 synchronize_session=False)
+        db.session.commit()
+        return claimed
+
+    @staticmethod
+    def _purge_in_chunks(model, criterion, order_column, chunk_size, pause,
+                         before_delete=None) -> int:
+        """Delete rows matching ``criterion`` one primary-key batch at a time"""
+        purged = 0
+        while True:
+            # Walks the index on order_column; only the chunk's keys are read
+            ids = [row[0] for row in db.session.query(model.id).filter(criterion)
+                   .order_by(order_column, model.id).limit(chunk_size)]
+            if not ids:
+                break
+
+            # Re-check the criterion so rows changed since the select survive
+            rows = db.session.query(model).filter(model.id.in_(ids), criterion)
+            if before_delete:
+                before_delete(rows)
+            purged += rows.delete(synchronize_session=False)
+            db.session.commit()
+
+            if len(ids) < chunk_size:
+                break
+            if pause:
+                time.sleep(pause)
+        return purged
+
+    @staticmethod
+    def _write_tombstones(pairs):
+        """Insert a tombstone per (notification id, user id)"""
+        now = datetime.utcnow()
+        rows = [{'id': generate_uuid(), 'notification_id': notification_id,
+                 'user_id': user_id, 'deleted_at': now} for notification_id, user_id in pairs]
+        if rows:
+            db.session.execute(insert(NotificationTombstone.__table__), rows)
+
+    @staticmethod
+    def _tombstone_notifications(rows):
+        NotificationRetentionService._write_tombstones(
+            rows.with_entities(Notification.id, Notification.user_id))
+
+    @staticmethod
+    def _tombstone_broadcasts(rows):
+        """Tombstone broadcasts for their class members, then drop the receipts"""
+        from app.models.student import Student
+
+        broadcast_ids = [row[0] for row in rows.with_entities(BroadcastNotification.id)]
+        NotificationRetentionService._write_tombstones(
+            db.session.query(BroadcastNotification.id, Student.id).join(
+                Student, Student.class_id == BroadcastNotification.class_id
+            ).filter(BroadcastNotification.id.in_(broadcast_ids)))
+        db.session.query(NotificationReceipt).filter(
+            NotificationReceipt.broadcast_id.in_(broadcast_ids)
+        ).delete(synchronize_session=False)
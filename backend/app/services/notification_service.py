@@ -1,8 +1,21 @@
+import base64
+import time
 from datetime import datetime, timedelta
+from collections import Counter
 from typing import List, Dict, Any, Optional
+from flask import current_app
+from sqlalchemy import insert, or_, and_
 from app import db, socketio
-from app.models.notification import Notification
+from app.models.notification import Notification, generate_uuid
 from app.models.notification_event import NotificationEvent
+from app.models.broadcast_notification import BroadcastNotification
+from app.models.notification_receipt import NotificationReceipt
+from app.models.notification_tombstone import NotificationTombstone
+from app.services.unread_counter_service import UnreadCounterService
+from app.services.mail_service import MailService
+from app.services.notification_retention_service import (
+    RETENTION_REQUEST_EVENT, NOTIFICATION_RETENTION_DAYS)
+from app.services.violation_policy_service import DEFAULT_VIOLATION_POLICY
 from app.models.user import User
 
 # Notification templates
@@ -11,7 +24,8 @@ NOTIFICATION_TEMPLATES = {
         "title": "New Quiz Available: {quiz_title}",
         "message": "A new quiz '{quiz_title}' for {subject} has been published and is now available.",
         "priority": "medium",
-        "category": "quiz"
+        "category": "quiz",
+        "email": True
     },
     "quiz_starting_soon": {
         "title": "Quiz Starting Soon",
@@ -35,25 +49,32 @@ NOTIFICATION_TEMPLATES = {
         "title": "Quiz Graded: {quiz_title}",
         "message": "Your submission for '{quiz_title}' has been graded. Score: {score}/{total_marks} ({percentage}%)",
         "priority": "medium",
-        "category": "grade"
+        "category": "grade",
+        "email": True,
+        "email_parents": True
     },
     "attempt_reset": {
         "title": "Quiz Attempt Reset",
         "message": "Your teacher has granted you {additional_attempts} additional attempt(s) for '{quiz_title}'. Reason: {reason}",
         "priority": "high",
-        "category": "attempt_reset"
+        "category": "attempt_reset",
+        "coalesce": True,
+        "email": True
     },
     "attempt_auto_submitted": {
         "title": "Quiz Auto-Submitted",
         "message": "Your quiz '{quiz_title}' was automatically submitted due to {violations} violation(s).",
         "priority": "high",
-        "category": "violation"
+        "category": "violation",
+        "email": True,
+        "email_parents": True
     },
     "violation_warning": {
         "title": "Violation Detected",
-        "message": "Warning: {violation_type} detected during '{quiz_title}'. Total violations: {total_violations}/3",
+        "message": "Warning: {violation_type} detected during '{quiz_title}'. Violation score: {violation_score}/{violation_limit}",
         "priority": "high",
-        "category": "violation"
+        "category": "violation",
+        "coalesce": True
     },
     "grade_pending_review": {
         "title": "New Submission to Grade",
@@ -75,6 +96,59 @@ NOTIFICATION_TEMPLATES = {
     }
 }
 
+# Rows per executemany round trip, and emits sent before yielding to the loop
+NOTIFICATION_FANOUT_CHUNK = 1000
+
+
+def _notification_room(payload):
+    """Personal notifications go to the user's room, broadcasts to the class room"""
+    if payload.get('is_broadcast'):
+        return f"class:{payload['class_id']}"
+    return payload['user_id']
+
+
+def _emit_in_batches(messages):
+    """Emit (event, data, room) messages, yielding between batches"""
+    for start in range(0, len(messages), NOTIFICATION_FANOUT_CHUNK):
+        for event, data, room in messages[start:start + NOTIFICATION_FANOUT_CHUNK]:
+            socketio.emit(event, data, room=room)
+        socketio.sleep(0)
+
+
+def _push_unread_count(user_id, count):
+    if count is not None:
+        socketio.emit('unread_count', {'unread_count': count}, room=user_id)
+
+
+# Coalesced notification updates per id: [time of last emit, latest unsent payload].
+# Owned by the process running process_outbox.
+_debounced_updates = {}
+
+
+def _debounce_updates(payloads, interval):
+    """Emit notification_updated at most once per interval per notification.
+
+    The first update after a quiet period goes out immediately; later ones
+    only keep the newest payload, sent once the interval has passed.
+    """
+    now = time.monotonic()
+    for payload in payloads:
+        entry = _debounced_updates.get(payload['id'])
+        if entry is None or now - entry[0] >= interval:
+            socketio.emit('notification_updated', payload, room=payload['user_id'])
+            _debounced_updates[payload['id']] = [now, None]
+        else:
+            entry[1] = payload
+
+    for notification_id, entry in list(_debounced_updates.items()):
+        if now - entry[0] < interval:
+            continue
+        if entry[1] is None:
+            del _debounced_updates[notification_id]
+        else:
+            socketio.emit('notification_updated', entry[1], room=entry[1]['user_id'])
+            _debounced_updates[notification_id] = [now, None]
+
 
 class NotificationService:
 
@@ -106,8 +180,8 @@ class NotificationService:
         db.session.add(notification)
         db.session.commit()
 
-        # Send real-time notification via WebSocket/SocketIO
-        socketio.emit('new_notification', notification.to_dict(), room=user_id)
+        # Send real-time notification and unread count via WebSocket/SocketIO
+        NotificationService.emit_notifications([notification.to_dict()], background=False)
 
         return notification
 
@@ -117,7 +191,29 @@ class NotificationService:
         notification_type: str,
         template_data: Dict[str, Any]
     ):
-        """Create notifications for multiple users"""
+        """Create notifications for multiple users.
+
+        Rows are written with chunked Core executemany inserts using
+        pre-generated ids, bypassing the ORM unit of work.
+        """
+        payloads = NotificationService.insert_notifications(
+            user_ids, notification_type, template_data)
+        db.session.commit()
+
+        # Send real-time notifications via WebSocket/SocketIO; large fan-outs
+        # are emitted from a background task so the request can return
+        NotificationService.emit_notifications(payloads)
+
+        return payloads
+
+    @staticmethod
+    def insert_notifications(
+        user_ids: List[str],
+        notification_type: str,
+        template_data: Dict[str, Any],
+        coalesce_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Stage notification rows in the current transaction and return their payloads"""
         template = NOTIFICATION_TEMPLATES.get(notification_type)
         if not template:
             raise ValueError(f"Unknown notification type: {notification_type}")
@@ -125,70 +221,333 @@ class NotificationService:
         title = template['title'].format(**template_data)
         message = template['message'].format(**template_data)
 
-        notifications = []
-        for user_id in user_ids:
-            notification = Notification(
-                user_id=user_id,
-                type=notification_type,
-                title=title,
-                message=message,
-                action_url=template_data.get('link'),
-                priority=template['priority'],
-                category=template['category'],
-                extra_data=template_data
-            )
-            notifications.append(notification)
-
-        db.session.add_all(notifications)
-        db.session.commit()
+        # Every row and payload is a copy of one pre-rendered template, so the
+        # per-recipient cost is two dict copies and a uuid
+        now = datetime.utcnow()
+        row_template = {
+            'id': None,
+            'user_id': None,
+            'type': notification_type,
+            'title': title,
+            'message': message,
+            'link': None,
+            'is_read': False,
+            'created_at': now,
+            'read_at': None,
+            'priority': template['priority'],
+            'category': template['category'],
+            'action_url': template_data.get('link'),
+            'expires_at': None,
+            'extra_data': template_data,
+            'coalesce_key': coalesce_key,
+            'occurrence_count': 1,
+            'last_seen_at': now
+        }
+        payload_template = dict(row_template, created_at=now.isoformat(),
+                                last_seen_at=now.isoformat())
+        del payload_template['coalesce_key']
+
+        payloads = []
+        table = Notification.__table__
+        for start in range(0, len(user_ids), NOTIFICATION_FANOUT_CHUNK):
+            rows = [dict(row_template, id=generate_uuid(), user_id=user_id)
+                    for user_id in user_ids[start:start + NOTIFICATION_FANOUT_CHUNK]]
+            db.session.execute(insert(table), rows)
+            payloads.extend(dict(payload_template, id=row['id'], user_id=row['user_id'])
+                            for row in rows)
+        return payloads
+
+    @staticmethod
+    def insert_broadcasts(
+        class_ids: List[str],
+        notification_type: str,
+        template_data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Stage one broadcast notification per class and return their payloads.
+
+        Members read broadcasts through get_user_notifications; per-user
+        state lives in NotificationReceipt rows created on first read.
+        """
+        template = NOTIFICATION_TEMPLATES.get(notification_type)
+        if not template:
+            raise ValueError(f"Unknown notification type: {notification_type}")
+
+        # Expire with the category's retention so the expiry purge removes them
+        now = datetime.utcnow()
+        expires_at = now + timedelta(days=NOTIFICATION_RETENTION_DAYS.get(
+            template['category'], current_app.config['NOTIFICATION_READ_RETENTION_DAYS']))
+        broadcasts = [BroadcastNotification(
+            id=generate_uuid(),
+            class_id=class_id,
+            type=notification_type,
+            title=template['title'].format(**template_data),
+            message=template['message'].format(**template_data),
+            action_url=template_data.get('link'),
+            priority=template['priority'],
+            category=template['category'],
+            extra_data=template_data,
+            created_at=now,
+            expires_at=expires_at
+        ) for class_id in dict.fromkeys(class_ids)]
 
-        # Send real-time notifications via WebSocket/SocketIO
-        for notification in notifications:
-            socketio.emit('new_notification', notification.to_dict(), room=notification.user_id)
+        db.session.add_all(broadcasts)
+        return [b.to_dict() for b in broadcasts]
 
-        return notifications
+    @staticmethod
+    def emit_notifications(payloads: List[Dict[str, Any]], background: bool = True):
+        """Bump unread counters and emit payloads plus the new counts.
+
+        Counters are updated here, in the app context; the emits themselves
+        move to a background task when there are more than one chunk of them.
+        """
+        messages = [('new_notification', payload, _notification_room(payload))
+                    for payload in payloads]
+        messages.extend(
+            ('unread_count', {'unread_count': count}, user_id)
+            for user_id, count in NotificationService._bump_unread_counters(payloads).items())
+
+        if not background or len(messages) <= NOTIFICATION_FANOUT_CHUNK:
+            _emit_in_batches(messages)
+            return None
+        return socketio.start_background_task(_emit_in_batches, messages)
 
     @staticmethod
-    def notify_quiz_published(quiz_id: str, quiz_title: str, subject: str, class_ids: List[str]):
-        """Notify all students in assigned classes when quiz is published"""
+    def _bump_unread_counters(payloads: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Increment cached counters for new notifications' readers"""
         from app.models.student import Student
-        from app.models.class_model import Class
-
-        # Get all students in the assigned classes
-        students = db.session.query(Student).filter(
-            Student.class_id.in_(class_ids)).all()
-        student_ids = [s.id for s in students]
-
-        if student_ids:
-            NotificationService.create_notifications_bulk(
-                user_ids=student_ids,
-                notification_type="quiz_published",
-                template_data={
-                    'quiz_title': quiz_title,
-                    'subject': subject,
-                    'link': '/student/quizzes'
-                }
-            )
+
+        deltas = Counter()
+        class_deltas = Counter()
+        for payload in payloads:
+            if payload.get('is_broadcast'):
+                class_deltas[payload['class_id']] += 1
+            else:
+                deltas[payload['user_id']] += 1
+
+        if class_deltas:
+            for student_id, class_id in db.session.query(Student.id, Student.class_id).filter(
+                    Student.class_id.in_(list(class_deltas))):
+                deltas[student_id] += class_deltas[class_id]
+
+        return UnreadCounterService.increment_many(dict(deltas))
+
+    @staticmethod
+    def enqueue_event(
+        notification_type: str,
+        entity_type: str,
+        entity_id: str,
+        template_data: Dict[str, Any],
+        user_ids: Optional[List[str]] = None,
+        class_ids: Optional[List[str]] = None,
+        triggered_by: Optional[str] = None
+    ) -> NotificationEvent:
+        """Stage an outbox event in the caller's transaction.
+
+        Nothing is sent until the caller commits; the worker then expands the
+        recipients and fans out through process_outbox.
+        """
+        if notification_type not in NOTIFICATION_TEMPLATES:
+            raise ValueError(f"Unknown notification type: {notification_type}")
+
+        event = NotificationEvent(
+            event_type=notification_type,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            triggered_by=triggered_by,
+            recipients={
+                'user_ids': list(user_ids or []),
+                'class_ids': list(class_ids or [])
+            },
+            notification_template=notification_type,
+            extra_data=template_data
+        )
+        db.session.add(event)
+        return event
+
+    @staticmethod
+    def process_outbox(batch_size: Optional[int] = None) -> int:
+        """Claim a batch of pending outbox events, fan them out and emit.
+
+        Events are locked with SKIP LOCKED so several workers can share the
+        queue. Notifications and the processed flag are committed together,
+        so a crash before the commit simply leaves the events to be retried.
+        An event whose fan-out fails backs off, so it never holds up the
+        events behind it, and is given up on after
+        NOTIFICATION_OUTBOX_MAX_ATTEMPTS.
+        """
+        batch_size = batch_size or current_app.config['NOTIFICATION_OUTBOX_BATCH_SIZE']
+
+        now = datetime.utcnow()
+        events = NotificationEvent.query.filter(
+            NotificationEvent.processed == False,
+            NotificationEvent.event_type != RETENTION_REQUEST_EVENT,
+            or_(NotificationEvent.next_attempt_at.is_(None),
+                NotificationEvent.next_attempt_at <= now)
+        ).order_by(
+            NotificationEvent.created_at
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not events:
+            db.session.commit()
+            _debounce_updates([], current_app.config['NOTIFICATION_COALESCE_DEBOUNCE'])
+            return 0
+
+        payloads = []
+        updates = []
+        processed_at = now
+        for event in events:
+            try:
+                with db.session.begin_nested():
+                    created, updated = NotificationService._fan_out_event(event)
+                    payloads.extend(created)
+                    updates.extend(updated)
+                    event.processed = True
+                    event.processed_at = processed_at
+            except Exception as e:
+                current_app.logger.error(
+                    f"Failed to process notification event {event.id}: {str(e)}")
+                NotificationService._retry_event_later(event, e, now)
+
+        db.session.commit()
+
+        # A notification created and then coalesced within this batch is sent
+        # once, as new, with its latest state
+        created_index = {payload['id']: i for i, payload in enumerate(payloads)}
+        later_updates = []
+        for payload in updates:
+            if payload['id'] in created_index:
+                payloads[created_index[payload['id']]] = payload
+            else:
+                later_updates.append(payload)
+
+        # Not on a request path, so emit inline rather than in a background task
+        NotificationService.emit_notifications(payloads, background=False)
+        _debounce_updates(later_updates, current_app.config['NOTIFICATION_COALESCE_DEBOUNCE'])
+
+        return len(events)
+
+    @staticmethod
+    def _retry_event_later(event: NotificationEvent, error: Exception, now: datetime):
+        config = current_app.config
+        event.attempts = (event.attempts or 0) + 1
+        event.last_error = str(error)[:500]
+        if event.attempts >= config['NOTIFICATION_OUTBOX_MAX_ATTEMPTS']:
+            # Dead-lettered: kept with its error but never claimed again
+            event.processed = True
+            event.processed_at = now
+            event.failed_at = now
+        else:
+            event.next_attempt_at = now + timedelta(
+                seconds=config['NOTIFICATION_OUTBOX_RETRY_BACKOFF'] * 2 ** (event.attempts - 1))
+
+    @staticmethod
+    def _fan_out_event(event: NotificationEvent):
+        """Write an event's notifications: personal rows per user, one broadcast per class.
+
+        Returns (payloads of new notifications, payloads of coalesced ones).
+        """
+        recipients = event.recipients
+        # Events logged before the outbox stored a plain list of user ids
+        if isinstance(recipients, list):
+            recipients = {'user_ids': recipients}
+
+        template_data = event.extra_data or {}
+        notification_type = event.notification_template
+        template = NOTIFICATION_TEMPLATES.get(notification_type, {})
+        payloads = []
+        updates = []
+        user_ids = list(dict.fromkeys(recipients.get('user_ids') or []))
+        if user_ids:
+            coalesce_key = None
+            if template.get('coalesce'):
+                coalesce_key = f'{event.entity_type}:{event.entity_id}'
+                updates = NotificationService.coalesce_notifications(
+                    user_ids, notification_type, template_data, coalesce_key)
+                coalesced = {payload['user_id'] for payload in updates}
+                user_ids = [user_id for user_id in user_ids if user_id not in coalesced]
+            if user_ids:
+                payloads.extend(NotificationService.insert_notifications(
+                    user_ids, notification_type, template_data, coalesce_key))
+        if recipients.get('class_ids'):
+            payloads.extend(NotificationService.insert_broadcasts(
+                recipients['class_ids'], notification_type, template_data))
+
+        # Coalesced repeats are not emailed again
+        if template.get('email') and (user_ids or recipients.get('class_ids')):
+            MailService.enqueue_notification(notification_type, template_data,
+                                             user_ids=user_ids,
+                                             class_ids=recipients.get('class_ids'))
+        return payloads, updates
+
+    @staticmethod
+    def coalesce_notifications(
+        user_ids: List[str],
+        notification_type: str,
+        template_data: Dict[str, Any],
+        coalesce_key: str
+    ) -> List[Dict[str, Any]]:
+        """Fold a repeated event into the users' recent unread notification for it.
+
+        A notification matches on (user, type, coalesce key) while it is unread
+        and was last seen within NOTIFICATION_COALESCE_WINDOW seconds; it takes
+        the newest title, message and data and its occurrence count goes up.
+        Returns payloads for the notifications updated.
+        """
+        template = NOTIFICATION_TEMPLATES[notification_type]
+        now = datetime.utcnow()
+        window_start = now - timedelta(seconds=current_app.config['NOTIFICATION_COALESCE_WINDOW'])
+
+        recent = Notification.query.filter(
+            Notification.user_id.in_(user_ids),
+            Notification.type == notification_type,
+            Notification.coalesce_key == coalesce_key,
+            Notification.is_read == False,
+            Notification.last_seen_at >= window_start
+        ).order_by(Notification.last_seen_at.desc()).with_for_update().all()
+
+        payloads = []
+        seen = set()
+        for notification in recent:
+            if notification.user_id in seen:
+                continue
+            seen.add(notification.user_id)
+            notification.title = template['title'].format(**template_data)
+            notification.message = template['message'].format(**template_data)
+            notification.extra_data = template_data
+            notification.occurrence_count = (notification.occurrence_count or 1) + 1
+            notification.last_seen_at = now
+            payloads.append(notification.to_dict())
+        return payloads
 
     @staticmethod
-    def notify_quiz_access_code(quiz_title: str, access_code: str, class_ids: List[str]):
-        """Notify students with the access code for a quiz."""
+    def notify_quiz_published(quiz_id: str, quiz_title: str, subject: str, class_ids: List[str]):
+        """Queue notifications for all students in the quiz's assigned classes"""
         if not class_ids:
             return
 
-        from app.models.student import Student
-
-        students = db.session.query(Student).filter(
-            Student.class_id.in_(class_ids)
-        ).all()
+        NotificationService.enqueue_event(
+            notification_type="quiz_published",
+            entity_type='quiz',
+            entity_id=quiz_id,
+            class_ids=class_ids,
+            template_data={
+                'quiz_title': quiz_title,
+                'subject': subject,
+                'link': '/student/quizzes'
+            }
+        )
 
-        student_ids = [s.id for s in students]
-        if not student_ids:
+    @staticmethod
+    def notify_quiz_access_code(quiz_id: str, quiz_title: str, access_code: str, class_ids: List[str]):
+        """Queue the new access code for students in the quiz's classes"""
+        if not class_ids:
             return
 
-        NotificationService.create_notifications_bulk(
-            user_ids=student_ids,
+        NotificationService.enqueue_event(
             notification_type="quiz_access_code",
+            entity_type='quiz',
+            entity_id=quiz_id,
+            class_ids=class_ids,
             template_data={
                 'quiz_title': quiz_title,
                 'access_code': access_code,
@@ -197,11 +556,13 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_attempt_graded(student_id: str, quiz_title: str, score: float, total_marks: int, percentage: float):
-        """Notify student when their attempt is graded"""
-        NotificationService.create_notifications_bulk(
-            user_ids=[student_id],
+    def notify_attempt_graded(attempt_id: str, student_id: str, quiz_title: str, score: float, total_marks: int, percentage: float):
+        """Queue a notification for the student when their attempt is graded"""
+        NotificationService.enqueue_event(
             notification_type="attempt_graded",
+            entity_type='quiz_attempt',
+            entity_id=attempt_id,
+            user_ids=[student_id],
             template_data={
                 'quiz_title': quiz_title,
                 'score': score,
@@ -212,11 +573,13 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_attempt_reset(student_id: str, quiz_title: str, additional_attempts: int, reason: str):
-        """Notify student when attempts are reset"""
-        NotificationService.create_notifications_bulk(
-            user_ids=[student_id],
+    def notify_attempt_reset(quiz_id: str, student_id: str, quiz_title: str, additional_attempts: int, reason: str):
+        """Queue a notification for the student when attempts are reset"""
+        NotificationService.enqueue_event(
             notification_type="attempt_reset",
+            entity_type='quiz',
+            entity_id=quiz_id,
+            user_ids=[student_id],
             template_data={
                 'quiz_title': quiz_title,
                 'additional_attempts': additional_attempts,
@@ -226,11 +589,13 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_auto_submission(student_id: str, quiz_title: str, violations: int):
-        """Notify student when quiz is auto-submitted due to violations"""
-        NotificationService.create_notifications_bulk(
-            user_ids=[student_id],
+    def notify_auto_submission(attempt_id: str, student_id: str, quiz_title: str, violations: int):
+        """Queue a notification for the student when the quiz is auto-submitted"""
+        NotificationService.enqueue_event(
             notification_type="attempt_auto_submitted",
+            entity_type='quiz_attempt',
+            entity_id=attempt_id,
+            user_ids=[student_id],
             template_data={
                 'quiz_title': quiz_title,
                 'violations': violations,
@@ -240,10 +605,12 @@ class NotificationService:
 
     @staticmethod
     def notify_pending_grading(teacher_id: str, student_name: str, quiz_title: str, attempt_id: str):
-        """Notify teacher of pending grading"""
-        NotificationService.create_notifications_bulk(
-            user_ids=[teacher_id],
+        """Queue a notification for the teacher of pending grading"""
+        NotificationService.enqueue_event(
             notification_type="grade_pending_review",
+            entity_type='quiz_attempt',
+            entity_id=attempt_id,
+            user_ids=[teacher_id],
             template_data={
                 'student_name': student_name,
                 'quiz_title': quiz_title,
@@ -252,22 +619,32 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_violation(student_id: str, quiz_title: str, violation_type: str, total_violations: int):
-        """Notify student of violation"""
-        NotificationService.create_notifications_bulk(
-            user_ids=[student_id],
+    def notify_violation(attempt_id: str, student_id: str, quiz_title: str, violation_type: str,
+                         total_violations: int, violation_score: float = None,
+                         violation_limit: float = None):
+        """Queue a violation warning for the student"""
+        if violation_score is None:
+            violation_score = total_violations
+        if violation_limit is None:
+            violation_limit = DEFAULT_VIOLATION_POLICY['auto_submit_at']
+        NotificationService.enqueue_event(
             notification_type="violation_warning",
+            entity_type='quiz_attempt',
+            entity_id=attempt_id,
+            user_ids=[student_id],
             template_data={
                 'quiz_title': quiz_title,
                 'violation_type': violation_type.replace('_', ' ').title(),
                 'total_violations': total_violations,
+                'violation_score': f'{round(violation_score, 1):g}',
+                'violation_limit': f'{violation_limit:g}',
                 'link': '/student/quizzes'
             }
         )
 
     @staticmethod
     def get_user_notifications(user_id: str, unread_only: bool = False, limit: int = 50, category: str = None):
-        """Get notifications for a user"""
+        """Get personal and class broadcast notifications for a user, newest first"""
         query = db.session.query(Notification).filter(
             Notification.user_id == user_id)
 
@@ -283,56 +660,282 @@ class NotificationService:
                 Notification.expires_at > datetime.utcnow())
         )
 
-        notifications = query.order_by(
-            Notification.created_at.desc()).limit(limit).all()
-        return notifications
+        notifications = [n.to_dict() for n in query.order_by(
+            Notification.created_at.desc()).limit(limit).all()]
+
+        broadcasts = NotificationService._broadcast_query(user_id)
+        if broadcasts is not None:
+            if unread_only:
+                broadcasts = broadcasts.filter(NotificationReceipt.read_at.is_(None))
+            if category:
+                broadcasts = broadcasts.filter(BroadcastNotification.category == category)
+            notifications.extend(
+                broadcast.to_dict(user_id, receipt) for broadcast, receipt in broadcasts.order_by(
+                    BroadcastNotification.created_at.desc()).limit(limit).all())
+
+        notifications.sort(key=lambda n: n['created_at'] or '', reverse=True)
+        return notifications[:limit]
+
+    @staticmethod
+    def sync_user_notifications(user_id: str, since: str, limit: int = 50, category: str = None,
+                                unread_only: bool = False):
+        """Changes to a user's notification list after a sync cursor.
+
+        Returns notifications created after the cursor's (created_at, id)
+        (oldest first, at most ``limit``), older ones read or coalesced since
+        the cursor was issued, tombstones of removed ones, and the next
+        cursor. With ``unread_only`` new read notifications are left out and
+        ones read since the cursor are reported as deleted. Cursors older
+        than the tombstone retention cannot be answered incrementally; the
+        full list is returned with full=True.
+        Raises ValueError for a malformed cursor.
+        """
+        created_at, last_id, synced_at = NotificationService.decode_cursor(since)
+        now = datetime.utcnow()
+        tombstone_cutoff = now - timedelta(
+            days=current_app.config['NOTIFICATION_READ_RETENTION_DAYS'])
+        if synced_at < tombstone_cutoff:
+            notifications = NotificationService.get_user_notifications(
+                user_id, unread_only=unread_only, limit=limit, category=category)
+            return {
+                'notifications': notifications,
+                'deleted': [],
+                'cursor': NotificationService.notification_cursor(notifications, now),
+                'has_more': False,
+                'full': True
+            }
+
+        live = (Notification.expires_at.is_(None)) | (Notification.expires_at > now)
+        after_cursor = and_(
+            Notification.created_at >= created_at,
+            or_(Notification.created_at > created_at, Notification.id > last_id))
+        query = db.session.query(Notification).filter(Notification.user_id == user_id, live)
+        if category:
+            query = query.filter(Notification.category == category)
+
+        created_query = query.filter(after_cursor)
+        if unread_only:
+            created_query = created_query.filter(Notification.is_read == False)
+        # Range scan on idx_notifications_user_created
+        created = [n.to_dict() for n in created_query.order_by(
+            Notification.created_at, Notification.id).limit(limit + 1)]
+        changed = [n.to_dict() for n in query.filter(
+            ~after_cursor,
+            or_(Notification.read_at > synced_at, Notification.last_seen_at > synced_at))]
+
+        broadcasts = NotificationService._broadcast_query(user_id)
+        if broadcasts is not None:
+            if category:
+                broadcasts = broadcasts.filter(BroadcastNotification.category == category)
+            broadcast_after_cursor = and_(
+                BroadcastNotification.created_at >= created_at,
+                or_(BroadcastNotification.created_at > created_at,
+                    BroadcastNotification.id > last_id))
+            created_broadcasts = broadcasts.filter(broadcast_after_cursor)
+            if unread_only:
+                created_broadcasts = created_broadcasts.filter(
+                    NotificationReceipt.read_at.is_(None))
+            created.extend(b.to_dict(user_id, r) for b, r in created_broadcasts.order_by(
+                    BroadcastNotification.created_at, BroadcastNotification.id).limit(limit + 1))
+            changed.extend(b.to_dict(user_id, r) for b, r in broadcasts.filter(
+                ~broadcast_after_cursor, NotificationReceipt.read_at > synced_at))
+
+        created.sort(key=lambda n: (n['created_at'] or '', n['id']))
+        has_more = len(created) > limit
+        created = created[:limit]
+
+        deleted = [row.notification_id for row in db.session.query(
+            NotificationTombstone.notification_id).filter(
+                NotificationTombstone.user_id == user_id,
+                NotificationTombstone.deleted_at > synced_at)]
+        if unread_only:
+            # Read since the cursor: gone from an unread-only list
+            deleted.extend(n['id'] for n in changed if n['is_read'])
+            changed = [n for n in changed if not n['is_read']]
+
+        cursor = NotificationService.notification_cursor(created, now) if created else \
+            NotificationService.encode_cursor(created_at, last_id, now)
+        return {
+            'notifications': changed + created,
+            'deleted': deleted,
+            'cursor': cursor,
+            'has_more': has_more,
+            'full': False
+        }
+
+    @staticmethod
+    def notification_cursor(notifications: List[Dict[str, Any]], synced_at: datetime = None) -> str:
+        """Cursor past the newest of ``notifications``, issued at ``synced_at``"""
+        synced_at = synced_at or datetime.utcnow()
+        if not notifications:
+            return NotificationService.encode_cursor(datetime(1970, 1, 1), '', synced_at)
+        newest = max(notifications, key=lambda n: (n['created_at'] or '', n['id']))
+        return NotificationService.encode_cursor(
+            datetime.fromisoformat(newest['created_at']), newest['id'], synced_at)
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, notification_id: str, synced_at: datetime) -> str:
+        raw = f'{created_at.isoformat()}|{notification_id}|{synced_at.isoformat()}'
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        """(created_at, id, synced_at) from a cursor; ValueError if malformed"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            created_at, notification_id, synced_at = raw.split('|')
+            return (datetime.fromisoformat(created_at), notification_id,
+                    datetime.fromisoformat(synced_at))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError('Invalid sync cursor') from e
+
+    @staticmethod
+    def _broadcast_query(user_id: str):
+        """Live broadcasts visible to a user joined with their receipt, or None.
+
+        Only broadcasts sent since the user joined their class are visible.
+        """
+        from app.models.student import Student
+
+        membership = db.session.query(Student.class_id, Student.class_joined_at).filter(
+            Student.id == user_id).first()
+        if not membership or not membership.class_id:
+            return None
+
+        broadcasts = db.session.query(BroadcastNotification, NotificationReceipt).outerjoin(
+            NotificationReceipt, db.and_(
+                NotificationReceipt.broadcast_id == BroadcastNotification.id,
+                NotificationReceipt.user_id == user_id)
+        ).filter(
+            BroadcastNotification.class_id == membership.class_id,
+            NotificationReceipt.is_dismissed.isnot(True),
+            (BroadcastNotification.expires_at.is_(None)) | (
+                BroadcastNotification.expires_at > datetime.utcnow())
+        )
+        # Unknown for rows written outside the ORM: show the class's history
+        if membership.class_joined_at:
+            broadcasts = broadcasts.filter(
+                BroadcastNotification.created_at >= membership.class_joined_at)
+        return broadcasts
+
+    @staticmethod
+    def _broadcast_receipt(notification_id: str, user_id: str):
+        """Visible broadcast and a (possibly new) receipt for the user, or None"""
+        broadcasts = NotificationService._broadcast_query(user_id)
+        row = broadcasts.filter(
+            BroadcastNotification.id == notification_id).first() if broadcasts is not None else None
+        if not row:
+            return None
+
+        broadcast, receipt = row
+        if receipt is None:
+            receipt = NotificationReceipt(broadcast_id=broadcast.id, user_id=user_id)
+            db.session.add(receipt)
+        return broadcast, receipt
 
     @staticmethod
-    def mark_as_read(notification_id: str):
-        """Mark notification as read"""
+    def mark_as_read(notification_id: str, user_id: str):
+        """Mark a personal or broadcast notification as read for a user"""
         notification = Notification.query.get(notification_id)
         if notification:
+            if notification.user_id != user_id:
+                return None
+            was_unread = not notification.is_read
             notification.is_read = True
             notification.read_at = datetime.utcnow()
             db.session.commit()
-        return notification
+            if was_unread:
+                _push_unread_count(user_id, UnreadCounterService.decrement(user_id))
+            return notification.to_dict()
+
+        found = NotificationService._broadcast_receipt(notification_id, user_id)
+        if not found:
+            return None
+
+        broadcast, receipt = found
+        was_unread = receipt.read_at is None
+        if was_unread:
+            receipt.read_at = datetime.utcnow()
+        db.session.commit()
+        if was_unread:
+            _push_unread_count(user_id, UnreadCounterService.decrement(user_id))
+        return broadcast.to_dict(user_id, receipt)
 
     @staticmethod
     def mark_all_as_read(user_id: str):
         """Mark all notifications as read for a user"""
+        now = datetime.utcnow()
         db.session.query(Notification).filter(
             Notification.user_id == user_id,
             Notification.is_read == False
         ).update({
             'is_read': True,
-            'read_at': datetime.utcnow()
+            'read_at': now
         })
+
+        broadcasts = NotificationService._broadcast_query(user_id)
+        if broadcasts is not None:
+            for broadcast, receipt in broadcasts.filter(NotificationReceipt.read_at.is_(None)):
+                if receipt is None:
+                    db.session.add(NotificationReceipt(
+                        broadcast_id=broadcast.id, user_id=user_id, read_at=now))
+                else:
+                    receipt.read_at = now
         db.session.commit()
 
+        UnreadCounterService.reset(user_id)
+        _push_unread_count(user_id, 0)
+
     @staticmethod
-    def delete_notification(notification_id: str):
-        """Delete a notification"""
+    def delete_notification(notification_id: str, user_id: str):
+        """Delete a personal notification or dismiss a broadcast for a user"""
         notification = Notification.query.get(notification_id)
         if notification:
+            if notification.user_id != user_id:
+                return False
+            was_unread = not notification.is_read
             db.session.delete(notification)
+            db.session.add(NotificationTombstone(notification_id=notification_id, user_id=user_id))
+            db.session.commit()
+        else:
+            found = NotificationService._broadcast_receipt(notification_id, user_id)
+            if not found:
+                return False
+
+            receipt = found[1]
+            was_unread = receipt.read_at is None
+            receipt.is_dismissed = True
+            db.session.add(NotificationTombstone(notification_id=notification_id, user_id=user_id))
             db.session.commit()
+
+        if was_unread:
+            _push_unread_count(user_id, UnreadCounterService.decrement(user_id))
         return True
 
     @staticmethod
     def cleanup_expired_notifications():
-        """Delete expired notifications (run as cron job)"""
-        db.session.query(Notification).filter(
-            Notification.expires_at < datetime.utcnow()
-        ).delete()
-        db.session.commit()
+        """Run the chunked retention purge; returns rows purged per rule"""
+        from app.services.notification_retention_service import NotificationRetentionService
+
+        return NotificationRetentionService.purge()
 
     @staticmethod
     def get_unread_count(user_id: str):
-        """Get count of unread notifications for a user"""
+        """Get count of unread notifications for a user, served from its counter"""
+        return UnreadCounterService.get(
+            user_id, lambda: NotificationService.count_unread(user_id))
+
+    @staticmethod
+    def count_unread(user_id: str):
+        """Count unread personal and broadcast notifications in the tables"""
         count = db.session.query(Notification).filter(
             Notification.user_id == user_id,
             Notification.is_read == False,
             (Notification.expires_at.is_(None)) | (
                 Notification.expires_at > datetime.utcnow())
         ).count()
+
+        broadcasts = NotificationService._broadcast_query(user_id)
+        if broadcasts is not None:
+            count += broadcasts.filter(NotificationReceipt.read_at.is_(None)).count()
         return count
@@ -0,0 +1,206 @@
+# Quiz Code Service
+# Module Owner: Student 5 - Question Bank Specialist
+
+# Handles quiz access code generation, lookups and throttling of wrong guesses
+
+# New codes come from an auto-increment sequence (access_code_sequence) put
+# through a keyed Feistel permutation of the 36^6 code space: distinct
+# sequence numbers always give distinct codes, so no uniqueness query or
+# retry is needed, and without QUIZ_CODE_KEY consecutive codes look random.
+
+# Codes resolve to {'quiz_id', 'status'} through two layers: a small
+# per-process map (QUIZ_CODE_LOCAL_TTL seconds) and the shared cache
+# (QUIZ_CODE_CACHE_TTL). Both are written whenever a commit creates a quiz
+# or changes its code or status, so a known code never reaches the database.
+# Unknown codes are cached as misses for QUIZ_CODE_NEGATIVE_TTL, and every
+# miss counts towards per-user and per-IP failure limits.
+
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+from app import db, cache
+from app.models.quiz import Quiz
+from app.models.access_code_sequence import AccessCodeSequence
+
+CODE_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+CODE_LENGTH = 6
+CODE_SPACE = len(CODE_ALPHABET) ** CODE_LENGTH
+
+# A code is two three-character halves; each round mixes one into the other
+_HALF_SPACE = len(CODE_ALPHABET) ** (CODE_LENGTH // 2)
+FEISTEL_ROUNDS = 4
+
+# Per-process entries kept before the map is cleared
+LOCAL_CODES_MAX = 10000
+
+_local_lock = threading.Lock()
+_local_codes = {}  # code -> (expires at (monotonic), entry or None)
+
+
+def _code_key(code: str) -> str:
+    return f'quizzes:code:{code}'
+
+
+def _normalize(code: str) -> str:
+    return (code or '').strip().upper()
+
+
+def _status_value(status):
+    return getattr(status, 'value', status)
+
+
+def _round_function(key: bytes, round_number: int, half: int) -> int:
+    digest = hashlib.blake2b(f'{round_number}:{half}'.encode(), key=key,
+                             digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % _HALF_SPACE
+
+
+def _permute(number: int, key: bytes) -> int:
+    """Keyed bijection of [0, CODE_SPACE) onto itself"""
+    left, right = divmod(number, _HALF_SPACE)
+    for round_number in range(FEISTEL_ROUNDS):
+        left, right = right, (left + _round_function(key, round_number, right)) % _HALF_SPACE
+    return left * _HALF_SPACE + right
+
+
+class QuizCodeService:
+
+    @staticmethod
+    def allocate() -> str:
+        """A quiz access code no other quiz has been given"""
+        # A single INSERT in the caller's transaction; the database hands
+        # each worker its own number even under concurrent allocation
+        result = db.session.execute(insert(AccessCodeSequence).values(
+            created_at=datetime.utcnow()))
+        return QuizCodeService.encode(result.inserted_primary_key[0])
+
+    @staticmethod
+    def encode(sequence: int) -> str:
+        """The access code of a sequence number"""
+        key = hashlib.sha256(current_app.config['QUIZ_CODE_KEY'].encode()).digest()
+        number = _permute(sequence % CODE_SPACE, key)
+        code = []
+        for _ in range(CODE_LENGTH):
+            number, digit = divmod(number, len(CODE_ALPHABET))
+            code.append(CODE_ALPHABET[digit])
+        return ''.join(reversed(code))
+
+    @staticmethod
+    def lookup(code: str) -> Optional[Dict[str, str]]:
+        """The quiz id and status for a code, or None if no quiz has it"""
+        code = _normalize(code)
+        now = time.monotonic()
+        local = _local_codes.get(code)
+        if local and local[0] > now:
+            return local[1]
+
+        entry = cache.get(_code_key(code))
+        if entry is None:
+            row = db.session.query(Quiz.id, Quiz.status).filter(
+                Quiz.access_code == code).first()
+            if row:
+                entry = {'quiz_id': row.id, 'status': _status_value(row.status)}
+                timeout = current_app.config['QUIZ_CODE_CACHE_TTL']
+            else:
+                entry = {'quiz_id': None}
+                timeout = current_app.config['QUIZ_CODE_NEGATIVE_TTL']
+            cache.set(_code_key(code), entry, timeout=timeout)
+
+        entry = entry if entry['quiz_id'] else None
+        QuizCodeService._remember_locally(code, entry)
+        return entry
+
+    @staticmethod
+    def remember(code: str, quiz_id: str, status):
+        code = _normalize(code)
+        entry = {'quiz_id': quiz_id, 'status': _status_value(status)}
+        cache.set(_code_key(code), entry, timeout=current_app.config['QUIZ_CODE_CACHE_TTL'])
+        QuizCodeService._remember_locally(code, entry)
+
+    @staticmethod
+    def forget(code: str):
+        code = _normalize(code)
+        cache.delete(_code_key(code))
+        with _local_lock:
+            _local_codes.pop(code, None)
+
+    @staticmethod
+    def is_throttled(user_id: Optional[str], ip_address: Optional[str]) -> bool:
+        """Whether the user or IP has used up its wrong guesses for the window"""
+        limits = QuizCodeService._failure_limits(user_id, ip_address)
+        if not limits:
+            return False
+        counts = cache.get_many(*limits)
+        return any(count is not None and count >= limit
+                   for count, limit in zip(counts, limits.values()))
+
+    @staticmethod
+    def record_failure(user_id: Optional[str], ip_address: Optional[str]):
+        window = current_app.config['QUIZ_CODE_FAILURE_WINDOW']
+        for key in QuizCodeService._failure_limits(user_id, ip_address):
+            # add() only starts the window; inc() is atomic on Redis
+            cache.cache.add(key, 0, timeout=window)
+            cache.cache.inc(key)
+
+    @staticmethod
+    def _failure_limits(user_id, ip_address) -> Dict[str, int]:
+        config = current_app.config
+        limits = {}
+        if user_id:
+            limits[f'quizzes:code-failures:user:{user_id}'] = \
+                config['QUIZ_CODE_MAX_FAILURES_PER_USER']
+        if ip_address:
+            # Higher: a school's students usually share one address
+            limits[f'quizzes:code-failures:ip:{ip_address}'] = \
+                config['QUIZ_CODE_MAX_FAILURES_PER_IP']
+        return limits
+
+    @staticmethod
+    def _remember_locally(code: str, entry: Optional[Dict[str, str]]):
+        expires = time.monotonic() + current_app.config['QUIZ_CODE_LOCAL_TTL']
+        with _local_lock:
+            if len(_local_codes) >= LOCAL_CODES_MAX:
+                _local_codes.clear()
+            _local_codes[code] = (expires, entry)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_code_changes(session, flush_context):
+    changes = session.info.setdefault('pending_quiz_codes', [])
+    for quiz in session.new:
+        if isinstance(quiz, Quiz):
+            changes.append((None, quiz.access_code, quiz.id, quiz.status))
+    for quiz in session.dirty:
+        if isinstance(quiz, Quiz):
+            state = inspect(quiz)
+            code_history = state.attrs.access_code.history
+            if code_history.has_changes() or state.attrs.status.history.has_changes():
+                old_codes = [code for code in code_history.deleted if code != quiz.access_code]
+                changes.append((old_codes, quiz.access_code, quiz.id, quiz.status))
+    for quiz in session.deleted:
+        if isinstance(quiz, Quiz):
+            changes.append(([quiz.access_code], None, quiz.id, None))
+    if not changes:
+        session.info.pop('pending_quiz_codes', None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_code_changes(session):
+    changes = session.info.pop('pending_quiz_codes', None)
+    if not changes or not has_app_context():
+        return
+    for old_codes, code, quiz_id, status in changes:
+        for old_code in old_codes or ():
+            QuizCodeService.forget(old_code)
+        if code:
+            QuizCodeService.remember(code, quiz_id, status)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_code_changes(session):
+    session.info.pop('pending_quiz_codes', None)
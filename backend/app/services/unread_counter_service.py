@@ -0,0 +1,101 @@
+from typing import Callable, Dict, Optional
+from flask import current_app
+from app import cache
+
+
+def _counter_key(user_id: str) -> str:
+    return f'notifications:unread:{user_id}'
+
+
+# INCRBY only while the key exists: a counter that expired between the read
+# and the increment stays gone instead of coming back partial and TTL-less
+_REDIS_INCREMENT_EXISTING = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call('incrby', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+def _enabled() -> bool:
+    return current_app.config['NOTIFICATION_UNREAD_COUNT_CACHE']
+
+
+def _increment_existing(key: str, delta: int) -> Optional[int]:
+    """Add ``delta`` to a live counter atomically; None if it is not cached"""
+    backend = cache.cache
+    client = getattr(backend, '_write_client', None)
+    if client is not None and hasattr(client, 'register_script'):
+        count = client.register_script(_REDIS_INCREMENT_EXISTING)(
+            keys=[backend._get_prefix() + key], args=[delta])
+        return int(count) if count is not None else None
+
+    # Other backends: memcached's incr never creates a key, and a
+    # process-local cache has no other writer
+    if not backend.has(key):
+        return None
+    return backend.inc(key, delta)
+
+
+# Per-user unread notification counters kept in the configured cache.
+# Counters are only adjusted while they exist, so a user whose counter has
+# expired is simply recounted from the table on the next read; the TTL
+# (NOTIFICATION_UNREAD_COUNT_TTL) is the reconcile interval and bounds how
+# long any drift, e.g. from expired notifications being purged, can survive.
+# The outbox worker bumps counters from its own process, so they are only
+# used with a shared cache (NOTIFICATION_UNREAD_COUNT_CACHE); otherwise every
+# read counts the tables and no counts are pushed.
+class UnreadCounterService:
+
+    @staticmethod
+    def get(user_id: str, compute: Callable[[], int]) -> int:
+        """Return the cached counter, recounting with ``compute`` on a miss"""
+        if not _enabled():
+            return compute()
+
+        count = cache.get(_counter_key(user_id))
+        if count is None:
+            count = compute()
+            UnreadCounterService.set(user_id, count)
+        return count
+
+    @staticmethod
+    def set(user_id: str, count: int):
+        if _enabled():
+            cache.set(_counter_key(user_id), count,
+                      timeout=current_app.config['NOTIFICATION_UNREAD_COUNT_TTL'])
+
+    @staticmethod
+    def increment_many(deltas: Dict[str, int]) -> Dict[str, int]:
+        """Bump the live counters among ``deltas``' users; returns the new values"""
+        if not deltas or not _enabled():
+            return {}
+
+        updated = {}
+        for user_id, delta in deltas.items():
+            count = _increment_existing(_counter_key(user_id), delta)
+            if count is not None:
+                updated[user_id] = count
+        return updated
+
+    @staticmethod
+    def decrement(user_id: str) -> Optional[int]:
+        """Drop a live counter by one; returns the new value if cached"""
+        if not _enabled():
+            return None
+
+        key = _counter_key(user_id)
+        count = _increment_existing(key, -1)
+        if count is not None and count < 0:
+            # Out of step with the table; recount on the next read
+            cache.delete(key)
+            return None
+        return count
+
+    @staticmethod
+    def reset(user_id: str):
+        UnreadCounterService.set(user_id, 0)
+
+    @staticmethod
+    def invalidate(user_id: str):
+        cache.delete(_counter_key(user_id))
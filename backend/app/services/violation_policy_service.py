@@ -0,0 +1,154 @@
+# Violation Policy Service
+# Module Owner: Student 7 - Attempt Management Specialist
+
+# Handles per-quiz anti-cheating policies: weights, decay and actions
+
+# A quiz's policy is declarative JSON on Quiz.violation_policy, merged over
+# DEFAULT_VIOLATION_POLICY. It is compiled once into a ViolationPolicy and
+# cached per quiz, keyed on the quiz's updated_at so an edit in any process
+# recompiles it. Evaluating a violation is then a few float operations
+# against the running score kept on the attempt.
+
+import math
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+from app.models.violation import ViolationType
+
+ACTION_NONE = 'none'
+ACTION_WARN = 'warn'
+ACTION_LOCK = 'lock'
+ACTION_AUTO_SUBMIT = 'auto_submit'
+
+DEFAULT_VIOLATION_POLICY = {
+    # Score added per violation; quizzes without a policy count every violation once
+    "weights": {violation_type.value: 1.0 for violation_type in ViolationType},
+    # Score halves every this many minutes; None keeps it for the whole attempt
+    "half_life_minutes": None,
+    # Score at which each action is taken; None disables the action
+    "warn_at": 1,
+    "lock_at": None,
+    "auto_submit_at": 3
+}
+
+# A quiz with its own policy only polices these when it enables the matching
+# security setting. Quizzes without one count them like every other
+# violation: the frontend reports them for every quiz, and quizzes created
+# before these settings were saved all have them off
+TAB_SWITCH_VIOLATIONS = ('tab_switch', 'focus_lost', 'multiple_windows')
+FULLSCREEN_VIOLATIONS = ('fullscreen_exit',)
+
+_evaluators_lock = threading.Lock()
+_evaluators = {}  # quiz id -> (version, ViolationPolicy)
+
+
+class ViolationPolicy:
+    """A quiz's violation policy, compiled for evaluation in memory"""
+
+    __slots__ = ('weights', 'decay_per_second', 'warn_at', 'lock_at', 'auto_submit_at')
+
+    def __init__(self, weights: Dict[str, float], half_life_minutes: Optional[float],
+                 warn_at: Optional[float], lock_at: Optional[float],
+                 auto_submit_at: Optional[float]):
+        self.weights = weights
+        self.decay_per_second = (math.log(2) / (half_life_minutes * 60)
+                                 if half_life_minutes else 0.0)
+        self.warn_at = warn_at
+        self.lock_at = lock_at
+        self.auto_submit_at = auto_submit_at
+
+    @property
+    def limit(self) -> float:
+        """The score that ends the student's work on the attempt"""
+        return self.auto_submit_at if self.auto_submit_at is not None else self.lock_at
+
+    def score(self, previous: float, previous_at: Optional[datetime],
+              violation_types: Iterable[str], now: datetime) -> float:
+        """Decay the running score to ``now`` and add the new violations"""
+        score = previous or 0.0
+        if score and self.decay_per_second and previous_at:
+            elapsed = max(0.0, (now - previous_at).total_seconds())
+            score *= math.exp(-self.decay_per_second * elapsed)
+        return score + sum(self.weights.get(violation_type, 0.0)
+                           for violation_type in violation_types)
+
+    def action(self, score: float) -> str:
+        """The strongest action the score has reached"""
+        if self.auto_submit_at is not None and score >= self.auto_submit_at:
+            return ACTION_AUTO_SUBMIT
+        if self.lock_at is not None and score >= self.lock_at:
+            return ACTION_LOCK
+        if self.warn_at is not None and score >= self.warn_at and score > 0:
+            return ACTION_WARN
+        return ACTION_NONE
+
+    def severity(self, violation_type: str) -> str:
+        weight = self.weights.get(violation_type, 0.0)
+        if weight >= 2:
+            return 'high'
+        if weight >= 1:
+            return 'medium'
+        return 'low'
+
+
+class ViolationPolicyService:
+
+    @staticmethod
+    def compile(policy: Optional[Dict[str, Any]] = None, prevent_tab_switching: bool = False,
+                require_fullscreen: bool = False) -> ViolationPolicy:
+        """Build an evaluator from a quiz's policy and security settings"""
+        policy = policy or {}
+        if not isinstance(policy, dict):
+            raise ValueError('violation_policy must be an object')
+
+        unknown = set(policy) - set(DEFAULT_VIOLATION_POLICY)
+        if unknown:
+            raise ValueError(f"Unknown violation policy settings: {', '.join(sorted(unknown))}")
+
+        weights = dict(DEFAULT_VIOLATION_POLICY['weights'])
+        if policy:
+            if not prevent_tab_switching:
+                weights.update(dict.fromkeys(TAB_SWITCH_VIOLATIONS, 0.0))
+            if not require_fullscreen:
+                weights.update(dict.fromkeys(FULLSCREEN_VIOLATIONS, 0.0))
+
+        custom_weights = policy.get('weights') or {}
+        if not isinstance(custom_weights, dict):
+            raise ValueError('violation_policy weights must be an object')
+        for violation_type, weight in custom_weights.items():
+            if violation_type not in weights:
+                raise ValueError(f'Invalid violation type: {violation_type}')
+            weights[violation_type] = ViolationPolicyService._number(
+                weight, f'weight for {violation_type}')
+
+        settings = {
+            field: ViolationPolicyService._number(
+                policy.get(field, DEFAULT_VIOLATION_POLICY[field]), field, optional=True)
+            for field in ('half_life_minutes', 'warn_at', 'lock_at', 'auto_submit_at')
+        }
+        if settings['lock_at'] is None and settings['auto_submit_at'] is None:
+            raise ValueError('violation_policy needs lock_at or auto_submit_at')
+
+        return ViolationPolicy(weights, **settings)
+
+    @staticmethod
+    def for_quiz(quiz_id: str, version, policy: Optional[Dict[str, Any]],
+                 prevent_tab_switching: bool, require_fullscreen: bool) -> ViolationPolicy:
+        """Cached evaluator for a quiz; ``version`` (its updated_at) detects edits"""
+        cached = _evaluators.get(quiz_id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        evaluator = ViolationPolicyService.compile(
+            policy, prevent_tab_switching, require_fullscreen)
+        with _evaluators_lock:
+            _evaluators[quiz_id] = (version, evaluator)
+        return evaluator
+
+    @staticmethod
+    def _number(value, name: str, optional: bool = False) -> Optional[float]:
+        if value is None and optional:
+            return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f'violation_policy {name} must be a non-negative number')
+        return float(value)
@@ -0,0 +1,157 @@
+# Caching Utilities
+# Shared helpers around the Flask-Caching ``cache`` extension
+
+# Read-heavy endpoints (dashboards, statistics) wrap their service calls in
+# ``cached_result``. Every cached value lives under a namespace whose keys
+# embed a generation token; bumping the token invalidates every key of the
+# namespace at once, regardless of the configured cache backend.
+# ``invalidate_on`` bumps the token whenever a commit touches one of the
+# given models, so cached data never outlives the rows it was built from.
+# Per-user values can also depend on scopes ("student:<id>"), each with its
+# own token, so a change to one user's rows leaves everyone else's cached.
+
+import functools
+import uuid
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import cache
+
+# Model class -> {namespace: scope function, or None for the whole namespace}
+_model_namespaces = {}
+
+# Backends whose entries only the process that wrote them can see
+PROCESS_LOCAL_CACHE_TYPES = {
+    'null', 'NullCache', 'flask_caching.backends.NullCache',
+    'simple', 'SimpleCache', 'flask_caching.backends.SimpleCache'
+}
+
+
+def is_shared_cache(cache_type):
+    """Whether every process (web servers, worker.py) sees the same entries"""
+    return cache_type not in PROCESS_LOCAL_CACHE_TYPES
+
+
+def _generation_key(namespace):
+    return f'{namespace}:generation'
+
+
+def _current_generation(namespace):
+    generation = cache.get(_generation_key(namespace))
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(_generation_key(namespace), generation, timeout=0)
+    return generation
+
+
+def _scoped(namespace, scope):
+    return f'{namespace}:{scope}'
+
+
+def namespace_version(namespace):
+    """Token that changes whenever ``namespace`` is invalidated"""
+    return _current_generation(namespace)
+
+
+def make_cache_key(namespace, *args, **kwargs):
+    """Build a versioned cache key for a namespace and call arguments"""
+    parts = [repr(a) for a in args]
+    parts.extend(f'{k}={kwargs[k]!r}' for k in sorted(kwargs))
+    return f"{namespace}:{_current_generation(namespace)}:{'|'.join(parts)}"
+
+
+def cached_result(namespace, timeout=None, scope=None):
+    """Cache a function's return value per argument tuple.
+
+    ``timeout`` defaults to the ``DASHBOARD_CACHE_TIMEOUT`` config value.
+    ``scope`` maps the call arguments to the scopes the value depends on;
+    invalidating one of them (see ``invalidate_on``) drops the value too.
+    The undecorated function stays reachable as ``.uncached``.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            key = make_cache_key(namespace, *args, **kwargs)
+            if scope is not None:
+                key += ':' + ':'.join(_current_generation(_scoped(namespace, s))
+                                      for s in scope(*args, **kwargs))
+            value = cache.get(key)
+            if value is None:
+                value = f(*args, **kwargs)
+                ttl = timeout if timeout is not None else current_app.config.get(
+                    'DASHBOARD_CACHE_TIMEOUT')
+                cache.set(key, value, timeout=ttl)
+            return value
+        wrapper.uncached = f
+        wrapper.cache_namespace = namespace
+        return wrapper
+    return decorator
+
+
+def invalidate(*namespaces):
+    """Drop every cached value stored under the given namespaces"""
+    for namespace in namespaces:
+        cache.set(_generation_key(namespace), uuid.uuid4().hex, timeout=0)
+
+
+def invalidate_on(namespace, *models, scope=None):
+    """Invalidate ``namespace`` whenever a commit changes one of ``models``.
+
+    With ``scope``, a changed instance only invalidates the scopes
+    ``scope(instance)`` returns; bulk updates and deletes, which have no
+    instances, still invalidate the whole namespace.
+    """
+    for model in models:
+        _model_namespaces.setdefault(model, {})[namespace] = scope
+
+
+def _namespaces_for(instances):
+    namespaces = set()
+    for instance in instances:
+        for model, model_namespaces in _model_namespaces.items():
+            if isinstance(instance, model):
+                for namespace, scope in model_namespaces.items():
+                    if scope is None:
+                        namespaces.add(namespace)
+                    else:
+                        namespaces.update(_scoped(namespace, s)
+                                          for s in scope(instance) if s is not None)
+    return namespaces
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_after_flush(session, flush_context):
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    namespaces = _namespaces_for(changed)
+    if namespaces:
+        session.info.setdefault('pending_cache_invalidations', set()).update(
+            namespaces)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_statements(orm_execute_state):
+    # query.update() / query.delete() bypass the flush
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    namespaces = set()
+    for model, model_namespaces in _model_namespaces.items():
+        if issubclass(mapper.class_, model):
+            namespaces.update(model_namespaces.keys())
+    if namespaces:
+        orm_execute_state.session.info.setdefault(
+            'pending_cache_invalidations', set()).update(namespaces)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    namespaces = session.info.pop('pending_cache_invalidations', None)
+    if namespaces and has_app_context():
+        invalidate(*namespaces)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('pending_cache_invalidations', None)
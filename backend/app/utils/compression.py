@@ -0,0 +1,130 @@
+# Compression Utilities
+# gzip/brotli response encoding and version-stamped strong ETags
+
+# Every JSON or text response of at least COMPRESS_MIN_SIZE bytes is encoded
+# with the client's preferred of brotli (when the module is installed) and
+# gzip. A compressed representation carries its own strong ETag, the plain
+# tag plus "-br"/"-gzip".
+#
+# ``versioned_json`` serves read-mostly resources from a version stamp the
+# caller computes cheaply (a generation token, a MAX(updated_at)): the tag
+# is derived from the stamp, so If-None-Match is answered with 304 before
+# the body is rendered. With ``precompress`` the encoded bytes are cached
+# per tag and encoding, and hot resources skip rendering and compression.
+# Stamps and encoded bodies kept in the cache are only trusted with a cache
+# every process shares (VERSIONED_RESPONSES); callers pass no version
+# otherwise and the body is rendered and tagged by its content, as
+# conditional_json does.
+
+import gzip
+import hashlib
+from flask import current_app, request
+from app import cache
+from app.utils.conditional import conditional_json
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv'}
+
+
+def init_compression(app):
+    app.after_request(_compress_response)
+
+
+def choose_encoding():
+    """The best encoding the client accepts, or None for identity"""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    level = current_app.config['COMPRESS_LEVEL']
+    if encoding == 'br':
+        # Brotli's quality scale is 0-11; keep the same relative effort
+        return brotli.compress(data, quality=min(11, level + 2))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _encoded_tag(etag: str, encoding) -> str:
+    return f'{etag}-{encoding}' if encoding else etag
+
+
+def _not_modified(etag: str, encoding):
+    # Bodies under COMPRESS_MIN_SIZE go out unencoded with the plain tag
+    for tag in dict.fromkeys((_encoded_tag(etag, encoding), etag)):
+        if request.if_none_match.contains(tag):
+            response = current_app.response_class(status=304)
+            response.set_etag(tag)
+            response.vary.add('Accept-Encoding')
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+    return None
+
+
+def versioned_json(version, render, precompress=False):
+    """JSON response whose strong ETag comes from ``version``.
+
+    ``render`` returns the body and is only called when the client's copy
+    is stale and, with ``precompress``, no encoded copy is cached. A
+    ``version`` of None tags the rendered body instead.
+    """
+    if version is None:
+        return conditional_json(render())
+
+    etag = hashlib.sha1(repr(version).encode()).hexdigest()
+    encoding = choose_encoding()
+    not_modified = _not_modified(etag, encoding)
+    if not_modified is not None:
+        return not_modified
+
+    if not precompress:
+        response = current_app.json.response(render())
+        response.set_etag(etag)
+    else:
+        key = f'responses:{etag}:{encoding or "identity"}'
+        cached = cache.get(key)
+        if cached is None:
+            body = current_app.json.dumps(render()).encode() + b'\n'
+            used = encoding if encoding and len(body) >= current_app.config[
+                'COMPRESS_MIN_SIZE'] else None
+            cached = (compress(body, used) if used else body, used)
+            cache.set(key, cached, timeout=current_app.config['RESPONSE_CACHE_TTL'])
+        body, used = cached
+        response = current_app.response_class(body, mimetype='application/json')
+        if used:
+            response.headers['Content-Encoding'] = used
+        response.set_etag(_encoded_tag(etag, used))
+
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _compress_response(response):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = choose_encoding() if len(data) >= current_app.config['COMPRESS_MIN_SIZE'] else None
+    if not encoding:
+        return response
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Tags computed from the body (conditional_json) are checked here
+        # against the encoded tag the client was given
+        not_modified = _not_modified(etag, encoding)
+        if not_modified is not None:
+            return not_modified
+        response.set_etag(_encoded_tag(etag, encoding))
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
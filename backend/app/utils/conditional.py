@@ -0,0 +1,24 @@
+# Conditional Response Utilities
+# ETag / If-None-Match handling for JSON endpoints
+
+import hashlib
+import json
+from flask import jsonify, request
+
+
+def conditional_json(body, ignore=()):
+    """jsonify ``body`` with an ETag of its content.
+
+    Answers 304 with no body when the request's If-None-Match matches.
+    Keys in ``ignore`` (e.g. a sync cursor that moves on every call) are
+    left out of the tag, so an unchanged result still validates.
+    """
+    tagged = {key: value for key, value in body.items() if key not in ignore}
+    etag = hashlib.sha1(
+        json.dumps(tagged, sort_keys=True, default=str).encode()).hexdigest()
+
+    response = jsonify(body)
+    response.set_etag(etag)
+    # Cacheable per user only, and always revalidated
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
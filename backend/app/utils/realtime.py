@@ -0,0 +1,69 @@
+# Real-time Utilities
+# Socket.IO message queue wiring shared by web and background workers
+
+# Every process that emits (gunicorn workers, the notification outbox worker,
+# CLI jobs) publishes to the same message queue; each web worker relays
+# messages to the clients connected to it. Web workers subscribe to the queue,
+# everything else is a write-only emitter.
+
+import socketio as python_socketio
+
+MEMORY_QUEUE_SCHEME = 'memory://'
+
+
+class FakeRedisManager(python_socketio.RedisManager):
+    """Redis client manager backed by an in-process fakeredis server.
+
+    Stand-in for tests: every manager in the process shares one server, so
+    several Socket.IO servers in a single process behave like separate
+    workers attached to the same Redis.
+    """
+    name = 'fakeredis'
+    _fake_server = None
+
+    def __init__(self, channel='socketio', write_only=False, logger=None, json=None):
+        super().__init__(url=MEMORY_QUEUE_SCHEME, channel=channel,
+                         write_only=write_only, logger=logger, json=json)
+
+    def initialize(self):
+        # Skip RedisManager's monkey patching check; no sockets are involved
+        python_socketio.PubSubManager.initialize(self)
+
+    def _redis_connect(self):
+        import fakeredis
+
+        if FakeRedisManager._fake_server is None:
+            FakeRedisManager._fake_server = fakeredis.FakeServer()
+        self.redis = fakeredis.FakeRedis(server=FakeRedisManager._fake_server)
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.connected = True
+
+
+def create_client_manager(url, channel, write_only=False):
+    """Build the Socket.IO client manager for a message queue URL.
+
+    Returns None when no queue is configured, keeping emits in-process.
+    redis:// and rediss:// use Redis pub/sub, memory:// the fakeredis
+    stand-in, and any other URL is handed to kombu (amqp://, etc.).
+    """
+    if not url:
+        return None
+    if url.startswith(MEMORY_QUEUE_SCHEME):
+        return FakeRedisManager(channel=channel, write_only=write_only)
+    if url.startswith(('redis://', 'rediss://')):
+        return python_socketio.RedisManager(url, channel=channel, write_only=write_only)
+    return python_socketio.KombuManager(url, channel=channel, write_only=write_only)
+
+
+def socketio_options(config):
+    """Keyword arguments for ``socketio.init_app`` from the app config.
+
+    Both keys are always passed because ``init_app`` keeps options from
+    earlier calls on the shared ``socketio`` instance.
+    """
+    return {
+        'async_mode': config.get('SOCKETIO_ASYNC_MODE'),
+        'client_manager': create_client_manager(
+            config.get('SOCKETIO_MESSAGE_QUEUE'), config['SOCKETIO_CHANNEL'],
+            write_only=config['SOCKETIO_WRITE_ONLY'])
+    }
@@ -0,0 +1,195 @@
+# Serialization Utilities
+# Field plans for model serialization with ?fields= sparse fieldsets
+
+# A plan lists, for every output field, the model columns and relationships
+# it reads and how to format them. Plans are built once at import. The
+# getters and loader options for a requested field set are compiled on
+# first use and memoized, so serializing a row is one pass over prebuilt
+# getters and the query only loads what those fields read.
+
+# With SQLALCHEMY_STRICT_LOADING (on under the test suite) the options also
+# raise on any column or relationship the plan did not load, so a field
+# that starts lazy loading per row fails the tests instead of shipping.
+
+from operator import attrgetter
+from typing import Dict, Iterable, Optional, Tuple
+from flask import current_app
+from sqlalchemy.orm import load_only, selectinload, joinedload, raiseload
+from app.models.quiz import Quiz
+from app.models.quiz_question import QuizQuestion
+from app.models.question import Question
+from app.models.class_model import Class
+from app.models.audit_log import AuditLog
+
+# Compiled field sets kept per plan; clients choose the sets, so the memo
+# is bounded and rarer sets beyond it are compiled per request
+MAX_COMPILED_FIELD_SETS = 64
+
+
+def strict_loading() -> bool:
+    return current_app.config.get('SQLALCHEMY_STRICT_LOADING', False)
+
+
+class Field:
+    """One output field: the columns it reads, a getter, and factories of
+    the loader options for relationships it reads (called with ``strict``)"""
+    __slots__ = ('columns', 'options', 'getter')
+
+    def __init__(self, getter, columns: Tuple[str, ...] = (), options: tuple = ()):
+        self.getter = getter
+        self.columns = columns
+        self.options = options
+
+
+def column(name: str) -> Field:
+    # Raw values: the app's JSON provider encodes datetimes, Enums and
+    # Decimals, so nothing is formatted per row here
+    return Field(attrgetter(name), (name,))
+
+
+class FieldPlan:
+    def __init__(self, model, fields: Dict[str, Field], default: Optional[Iterable[str]] = None):
+        self.model = model
+        self.fields = fields
+        self.default = tuple(default or fields)
+        self._compiled = {}
+
+    def select(self, requested: Optional[str]) -> Tuple[str, ...]:
+        """Field names from a ``?fields=a,b`` value; the default set if empty"""
+        if not requested:
+            return self.default
+        names = {name.strip() for name in requested.split(',') if name.strip()}
+        unknown = sorted(names - self.fields.keys())
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # The id is always returned so clients can tell rows apart; plan
+        # order makes every spelling of a set share one compiled entry
+        names.add('id')
+        return tuple(name for name in self.fields if name in names)
+
+    def options(self, names: Optional[Tuple[str, ...]] = None) -> list:
+        """Loader options that fetch exactly what ``names`` read"""
+        return self._compile(names or self.default, strict_loading())[1]
+
+    def dump(self, obj, names: Optional[Tuple[str, ...]] = None) -> dict:
+        getters = self._compile(names or self.default, False)[0]
+        return {name: getter(obj) for name, getter in getters}
+
+    def dump_many(self, objs, names: Optional[Tuple[str, ...]] = None) -> list:
+        getters = self._compile(names or self.default, False)[0]
+        return [{name: getter(obj) for name, getter in getters} for obj in objs]
+
+    def _compile(self, names, strict):
+        compiled = self._compiled.get((names, strict))
+        if compiled is None:
+            columns, factories = {}, {}
+            for name in names:
+                field = self.fields[name]
+                columns.update(dict.fromkeys(field.columns))
+                # Fields reading the same relationship share one loader
+                factories.update(dict.fromkeys(field.options))
+            loaders = [load_only(*(getattr(self.model, c) for c in columns),
+                                 raiseload=strict)] if columns else []
+            loaders += [factory(strict) for factory in factories]
+            if strict:
+                loaders.append(raiseload('*'))
+            compiled = ([(name, self.fields[name].getter) for name in names], loaders)
+            if len(self._compiled) < MAX_COMPILED_FIELD_SETS:
+                self._compiled[(names, strict)] = compiled
+        return compiled
+
+
+def _quiz_questions(strict):
+    # Quiz totals read each question's marks; the question text is not loaded
+    question = joinedload(QuizQuestion.question).load_only(
+        Question.id, Question.marks, raiseload=strict)
+    option = selectinload(Quiz.questions)
+    return option.options(question, raiseload('*')) if strict else option.options(question)
+
+
+def _quiz_classes(strict):
+    option = selectinload(Quiz.classes).load_only(
+        Class.id, Class.name, Class.section, Class.academic_year, raiseload=strict)
+    return option.options(raiseload('*')) if strict else option
+
+
+def _quiz_total_marks(quiz):
+    total = 0
+    for qq in quiz.questions:
+        marks = qq.marks_override if qq.marks_override is not None else (
+            qq.question.marks if qq.question is not None else None)
+        total += marks or 0
+    return total
+
+
+QUIZ_PLAN = FieldPlan(Quiz, {
+    'id': column('id'),
+    'title': column('title'),
+    'subject': column('subject'),
+    'description': column('description'),
+    'access_code': column('access_code'),
+    'time_limit_minutes': column('time_limit_minutes'),
+    'status': column('status'),
+    'start_date': column('start_date'),
+    'end_date': column('end_date'),
+    'created_by': column('created_by'),
+    'created_at': column('created_at'),
+    'updated_at': column('updated_at'),
+    'passing_percentage': column('passing_percentage'),
+    'max_attempts': column('max_attempts'),
+    'show_answers_after_submission': column('show_answers_after_submission'),
+    'randomize_questions': column('randomize_questions'),
+    'randomize_options': column('randomize_options'),
+    'allow_review': column('allow_review'),
+    'allow_late_submissions': column('allow_late_submissions'),
+    'retake_policy': column('retake_policy'),
+    'show_correct_answers': column('show_correct_answers'),
+    'prevent_tab_switching': column('prevent_tab_switching'),
+    'require_fullscreen': column('require_fullscreen'),
+    'enable_camera_monitoring': column('enable_camera_monitoring'),
+    'violation_policy': column('violation_policy'),
+    'show_questions_one_at_a_time': column('show_questions_one_at_a_time'),
+    'show_progress_bar': column('show_progress_bar'),
+    'enable_auto_grading': column('enable_auto_grading'),
+    'allow_partial_credit': column('allow_partial_credit'),
+    'password_protection': column('password_protection'),
+    'quiz_password': column('quiz_password'),
+    'allowed_ip_addresses': column('allowed_ip_addresses'),
+    'require_access_code': column('require_access_code'),
+    'total_questions': Field(lambda quiz: len(quiz.questions), options=(_quiz_questions,)),
+    'total_marks': Field(_quiz_total_marks, options=(_quiz_questions,)),
+    # Listings carry the class itself; counts and teachers come from /classes
+    'classes': Field(lambda quiz: [{
+        'id': c.id, 'name': c.name, 'section': c.section, 'academic_year': c.academic_year
+    } for c in quiz.classes], options=(_quiz_classes,)),
+    'class_ids': Field(lambda quiz: [c.id for c in quiz.classes], options=(_quiz_classes,))
+})
+
+QUESTION_PLAN = FieldPlan(Question, {
+    'id': column('id'),
+    'text': column('text'),
+    'type': column('type'),
+    'topic': column('topic'),
+    'difficulty': column('difficulty'),
+    'marks': column('marks'),
+    'options': column('options'),
+    'correct_answer': column('correct_answer'),
+    'sample_answer': column('sample_answer'),
+    'marking_rubric': column('marking_rubric'),
+    'created_by': column('created_by'),
+    'created_at': column('created_at'),
+    'updated_at': column('updated_at')
+})
+
+AUDIT_LOG_PLAN = FieldPlan(AuditLog, {
+    'id': column('id'),
+    'user_id': column('user_id'),
+    'action': column('action'),
+    'entity_type': column('entity_type'),
+    'entity_id': column('entity_id'),
+    'old_value': column('old_value'),
+    'new_value': column('new_value'),
+    'ip_address': column('ip_address'),
+    'user_agent': column('user_agent'),
+    'created_at': column('created_at')
+})
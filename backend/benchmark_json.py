@@ -0,0 +1,86 @@
+"""Micro-benchmark of the JSON provider on representative API payloads.
+
+Compares Flask's default provider encoding pre-formatted dicts (the
+to_dict style: isoformat() strings, float() numbers, Enum .value) with
+FastJSONProvider encoding raw column values.
+
+    python benchmark_json.py [repeat]
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.quiz import QuizStatus
+from app.models.question import QuestionType, Difficulty
+from app.models.quiz_attempt import AttemptStatus
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+NOW = datetime(2026, 10, 19, 9, 30, 15, 123456)
+
+
+def formatted(value):
+    """What the hand-written to_dict methods do to each value"""
+    if isinstance(value, dict):
+        return {key: formatted(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [formatted(item) for item in value]
+    return json_provider._default(value) if isinstance(
+        value, (datetime, Decimal, QuizStatus, QuestionType, Difficulty, AttemptStatus)) else value
+
+
+def quiz_with_questions(questions=100):
+    return {'quiz': {
+        'id': str(uuid.uuid4()), 'title': 'End of term exam', 'subject': 'Mathematics',
+        'description': 'Covers algebra, geometry and statistics. ' * 5,
+        'access_code': 'K4Q9ZT', 'time_limit_minutes': 90, 'status': QuizStatus.PUBLISHED,
+        'start_date': NOW, 'end_date': NOW + timedelta(days=1), 'created_at': NOW,
+        'updated_at': NOW, 'passing_percentage': 40, 'max_attempts': 1,
+        'total_questions': questions, 'total_marks': questions * 2,
+        'questions': [{
+            'id': str(uuid.uuid4()), 'text': f'Question {i}: ' + 'Solve for x. ' * 12,
+            'type': QuestionType.MCQ, 'difficulty': Difficulty.MEDIUM, 'marks': 2,
+            'topic': 'Algebra',
+            'options': [{'id': j, 'text': f'Option {j} ' * 4, 'is_correct': j == 1}
+                        for j in range(4)],
+            'created_at': NOW, 'updated_at': NOW
+        } for i in range(questions)]
+    }}
+
+
+def attempts_page(rows=200):
+    return {'attempts': [{
+        'id': str(uuid.uuid4()), 'quiz_id': str(uuid.uuid4()), 'student_id': str(uuid.uuid4()),
+        'attempt_number': 1, 'started_at': NOW - timedelta(minutes=i % 60),
+        'submitted_at': NOW if i % 3 == 0 else None, 'status': AttemptStatus.IN_PROGRESS,
+        'score': Decimal('17.50'), 'total_marks': 40, 'percentage': Decimal('43.75'),
+        'passed': True, 'total_violations': i % 4, 'violation_score': 1.5,
+        'locked': False, 'progress': i % 100, 'current_question_index': i % 20,
+        'last_activity_at': NOW, 'student_name': f'Student {i}',
+        'registration_number': f'REG{i:05d}', 'answered_questions': i % 20,
+        'total_questions': 20, 'violations': i % 4
+    } for i in range(rows)], 'total': rows, 'pages': 1, 'current_page': 1}
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = Flask(__name__)
+    default, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+    backend = 'orjson' if json_provider.orjson else 'stdlib fallback'
+
+    print(f'FastJSONProvider backend: {backend}; {repeat} runs each')
+    for name, payload in (('quiz with 100 questions', quiz_with_questions()),
+                          ('attempts page of 200', attempts_page())):
+        # Formatting is done up front: only the encoders are compared
+        prepared = formatted(payload)
+        baseline = timeit.timeit(lambda: default.dumps(prepared), number=repeat)
+        raw = timeit.timeit(lambda: fast.dumps(payload), number=repeat)
+        print(f'{name:>24}: default {baseline / repeat * 1e3:7.3f} ms, '
+              f'fast {raw / repeat * 1e3:7.3f} ms, {baseline / raw:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -113,6 +113,8 @@ CREATE TABLE quizzes (
     randomize_questions BOOLEAN DEFAULT FALSE,
     randomize_options BOOLEAN DEFAULT FALSE,
     allow_review BOOLEAN DEFAULT TRUE,
+    -- Anti-cheating policy (weights, decay, action thresholds)
+    violation_policy JSON,
     FOREIGN KEY (created_by) REFERENCES teachers(id) ON DELETE CASCADE,
     INDEX idx_created_by (created_by),
     INDEX idx_status (status),
@@ -206,6 +208,9 @@ CREATE TABLE quiz_attempts (
     -- Anti-cheating
     total_violations INT DEFAULT 0,
     auto_submitted_due_to_violations BOOLEAN DEFAULT FALSE,
+    violation_score DOUBLE DEFAULT 0,
+    violation_score_at TIMESTAMP NULL,
+    locked_at TIMESTAMP NULL,
     -- Browser/device info
     ip_address VARCHAR(45),
     -- IPv6 support
@@ -228,6 +233,33 @@ CREATE TABLE quiz_attempts (
         INDEX idx_attempts_reset (is_reset, reset_by)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
 -- ============================================
+-- ATTEMPT_ACCESS_CODES TABLE
+-- ============================================
+CREATE TABLE attempt_access_codes (
+    id CHAR(36) PRIMARY KEY DEFAULT (UUID()),
+    attempt_id CHAR(36) NOT NULL,
+    teacher_id CHAR(36) NOT NULL,
+    -- SHA-256 of the code; the code itself is never stored
+    code_hash CHAR(64) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    used_at TIMESTAMP NULL,
+    device_info JSON,
+    FOREIGN KEY (attempt_id) REFERENCES quiz_attempts(id) ON DELETE CASCADE,
+    FOREIGN KEY (teacher_id) REFERENCES teachers(id) ON DELETE CASCADE,
+    INDEX idx_access_codes_attempt (attempt_id),
+    INDEX idx_access_codes_teacher_expires (teacher_id, expires_at),
+    INDEX idx_access_codes_hash (code_hash)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+-- ============================================
+-- ACCESS_CODE_SEQUENCE TABLE
+-- ============================================
+-- One row per quiz access code issued; the id is permuted into the code
+CREATE TABLE access_code_sequence (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+-- ============================================
 -- STUDENT_ANSWERS TABLE
 -- ============================================
 CREATE TABLE student_answers (
@@ -274,7 +306,8 @@ CREATE TABLE violations (
     metadata JSON,
     FOREIGN KEY (attempt_id) REFERENCES quiz_attempts(id) ON DELETE CASCADE,
     INDEX idx_attempt_id (attempt_id),
-    INDEX idx_violation_type (violation_type)
+    INDEX idx_violation_type (violation_type),
+    INDEX idx_violations_attempt_detected (attempt_id, detected_at)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
 -- ============================================
 -- NOTIFICATIONS TABLE (Enhanced)
@@ -301,12 +334,20 @@ CREATE TABLE notifications (
     action_url VARCHAR(500),
     expires_at TIMESTAMP NULL,
     metadata JSON,
+    -- Coalescing of repeated events
+    coalesce_key VARCHAR(100) NULL,
+    occurrence_count INT DEFAULT 1,
+    last_seen_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_user_id (user_id),
     INDEX idx_is_read (is_read),
     INDEX idx_notifications_priority (priority),
     INDEX idx_notifications_category (category),
-    INDEX idx_notifications_expires (expires_at)
+    INDEX idx_notifications_expires (expires_at),
+    INDEX idx_notifications_category_created (category, created_at),
+    INDEX idx_notifications_read_at (read_at),
+    INDEX idx_notifications_coalesce (user_id, type, coalesce_key),
+    INDEX idx_notifications_user_created (user_id, created_at, id)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
 -- ============================================
 -- NOTIFICATION EVENTS TABLE
@@ -318,7 +359,7 @@ CREATE TABLE notification_events (
     entity_id CHAR(36) NOT NULL,
     triggered_by CHAR(36),
     recipients JSON NOT NULL,
-    -- Array of user IDs who should be notified
+    -- {"user_ids": [...], "class_ids": [...]} expanded by the outbox worker
     notification_template VARCHAR(100) NOT NULL,
     metadata JSON,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -328,7 +369,71 @@ CREATE TABLE notification_events (
     SET NULL,
         INDEX idx_events_type (event_type),
         INDEX idx_events_processed (processed),
-        INDEX idx_events_created (created_at)
+        INDEX idx_events_created (created_at),
+        INDEX idx_events_pending (processed, created_at)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+-- ============================================
+-- BROADCAST NOTIFICATIONS TABLE
+-- ============================================
+-- Class-wide notifications stored once and merged into each member's feed
+CREATE TABLE broadcast_notifications (
+    id CHAR(36) PRIMARY KEY DEFAULT (UUID()),
+    class_id CHAR(36) NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    link VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    priority VARCHAR(20) DEFAULT 'medium',
+    category VARCHAR(50) DEFAULT 'system',
+    action_url VARCHAR(500),
+    expires_at TIMESTAMP NULL,
+    extra_data JSON,
+    FOREIGN KEY (class_id) REFERENCES classes(id) ON DELETE CASCADE,
+    INDEX idx_broadcasts_class_created (class_id, created_at),
+    INDEX idx_broadcasts_expires (expires_at)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+-- ============================================
+-- NOTIFICATION RECEIPTS TABLE
+-- ============================================
+-- Per-user read/dismiss state of broadcast notifications
+CREATE TABLE notification_receipts (
+    broadcast_id CHAR(36) NOT NULL,
+    user_id CHAR(36) NOT NULL,
+    read_at TIMESTAMP NULL,
+    is_dismissed BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (broadcast_id, user_id),
+    FOREIGN KEY (broadcast_id) REFERENCES broadcast_notifications(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_receipts_user (user_id)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+-- ============================================
+-- NOTIFICATION TOMBSTONES TABLE
+-- ============================================
+CREATE TABLE notification_tombstones (
+    id CHAR(36) PRIMARY KEY DEFAULT (UUID()),
+    notification_id CHAR(36) NOT NULL,
+    user_id CHAR(36) NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_tombstones_user_deleted (user_id, deleted_at)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+-- ============================================
+-- EMAIL QUEUE TABLE
+-- ============================================
+CREATE TABLE email_queue (
+    id CHAR(36) PRIMARY KEY DEFAULT (UUID()),
+    recipient VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    body TEXT NOT NULL,
+    template VARCHAR(50),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP NULL,
+    INDEX idx_email_queue_due (status, next_attempt_at)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
 -- ============================================
 -- ATTEMPT HISTORY TABLE
@@ -0,0 +1,26 @@
+"""Notification outbox index
+
+Revision ID: a1c3e5f7b9d2
+Revises: 44b25531f631
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b9d2'
+down_revision = '44b25531f631'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification_events', schema=None) as batch_op:
+        batch_op.create_index('idx_events_pending', ['processed', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification_events', schema=None) as batch_op:
+        batch_op.drop_index('idx_events_pending')
@@ -0,0 +1,36 @@
+"""Violation policies
+
+Revision ID: a7c9e1f3b5d8
+Revises: f6b8d0e2a4c7
+Create Date: 2026-10-19 21:42:16.503918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1f3b5d8'
+down_revision = 'f6b8d0e2a4c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quizzes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('violation_policy', sa.JSON(), nullable=True))
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('violation_score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('violation_score_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('locked_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_column('locked_at')
+        batch_op.drop_column('violation_score_at')
+        batch_op.drop_column('violation_score')
+
+    with op.batch_alter_table('quizzes', schema=None) as batch_op:
+        batch_op.drop_column('violation_policy')
@@ -0,0 +1,26 @@
+"""Notification event retention index
+
+Revision ID: a9d1f3b5c7e0
+Revises: f8c0e2a4b6d9
+Create Date: 2026-10-19 22:31:09.415526
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d1f3b5c7e0'
+down_revision = 'f8c0e2a4b6d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification_events', schema=None) as batch_op:
+        batch_op.create_index('idx_events_processed_at', ['processed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification_events', schema=None) as batch_op:
+        batch_op.drop_index('idx_events_processed_at')
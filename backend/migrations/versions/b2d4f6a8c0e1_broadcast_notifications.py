@@ -0,0 +1,62 @@
+"""Broadcast notifications and read receipts
+
+Revision ID: b2d4f6a8c0e1
+Revises: a1c3e5f7b9d2
+Create Date: 2026-10-19 11:02:17.540126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c0e1'
+down_revision = 'a1c3e5f7b9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('broadcast_notifications',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('class_id', sa.String(length=36), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('link', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('action_url', sa.String(length=500), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('extra_data', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('broadcast_notifications', schema=None) as batch_op:
+        batch_op.create_index('idx_broadcasts_class_created', ['class_id', 'created_at'], unique=False)
+        batch_op.create_index('idx_broadcasts_expires', ['expires_at'], unique=False)
+
+    op.create_table('notification_receipts',
+    sa.Column('broadcast_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.Column('is_dismissed', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['broadcast_id'], ['broadcast_notifications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('broadcast_id', 'user_id')
+    )
+    with op.batch_alter_table('notification_receipts', schema=None) as batch_op:
+        batch_op.create_index('idx_receipts_user', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification_receipts', schema=None) as batch_op:
+        batch_op.drop_index('idx_receipts_user')
+
+    op.drop_table('notification_receipts')
+    with op.batch_alter_table('broadcast_notifications', schema=None) as batch_op:
+        batch_op.drop_index('idx_broadcasts_expires')
+        batch_op.drop_index('idx_broadcasts_class_created')
+
+    op.drop_table('broadcast_notifications')
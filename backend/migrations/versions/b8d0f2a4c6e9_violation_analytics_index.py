@@ -0,0 +1,27 @@
+"""Violation analytics index
+
+Revision ID: b8d0f2a4c6e9
+Revises: a7c9e1f3b5d8
+Create Date: 2026-10-19 22:31:54.208716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d0f2a4c6e9'
+down_revision = 'a7c9e1f3b5d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('violations', schema=None) as batch_op:
+        batch_op.create_index('idx_violations_attempt_detected',
+                              ['attempt_id', 'detected_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('violations', schema=None) as batch_op:
+        batch_op.drop_index('idx_violations_attempt_detected')
@@ -0,0 +1,32 @@
+"""Notification retention indexes
+
+Revision ID: c3e5a7b9d1f3
+Revises: b2d4f6a8c0e1
+Create Date: 2026-10-19 15:02:17.604913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d1f3'
+down_revision = 'b2d4f6a8c0e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        # Dropped by the initial migration; the expiry purge walks it
+        batch_op.create_index('idx_notifications_expires', ['expires_at'], unique=False)
+        batch_op.create_index('idx_notifications_category_created',
+                              ['category', 'created_at'], unique=False)
+        batch_op.create_index('idx_notifications_read_at', ['read_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('idx_notifications_read_at')
+        batch_op.drop_index('idx_notifications_category_created')
+        batch_op.drop_index('idx_notifications_expires')
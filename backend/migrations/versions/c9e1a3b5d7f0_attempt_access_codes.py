@@ -0,0 +1,46 @@
+"""Attempt access codes
+
+Revision ID: c9e1a3b5d7f0
+Revises: b8d0f2a4c6e9
+Create Date: 2026-10-19 23:05:27.640193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e1a3b5d7f0'
+down_revision = 'b8d0f2a4c6e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('attempt_access_codes',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('attempt_id', sa.String(length=36), nullable=False),
+    sa.Column('teacher_id', sa.String(length=36), nullable=False),
+    sa.Column('code_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('device_info', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['attempt_id'], ['quiz_attempts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('attempt_access_codes', schema=None) as batch_op:
+        batch_op.create_index('idx_access_codes_attempt', ['attempt_id'], unique=False)
+        batch_op.create_index('idx_access_codes_teacher_expires',
+                              ['teacher_id', 'expires_at'], unique=False)
+        batch_op.create_index('idx_access_codes_hash', ['code_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('attempt_access_codes', schema=None) as batch_op:
+        batch_op.drop_index('idx_access_codes_hash')
+        batch_op.drop_index('idx_access_codes_teacher_expires')
+        batch_op.drop_index('idx_access_codes_attempt')
+
+    op.drop_table('attempt_access_codes')
@@ -0,0 +1,29 @@
+"""Access code sequence
+
+Revision ID: d0f2b4c6e8a1
+Revises: c9e1a3b5d7f0
+Create Date: 2026-10-19 23:41:08.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0f2b4c6e8a1'
+down_revision = 'c9e1a3b5d7f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('access_code_sequence',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'),
+              autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('access_code_sequence')
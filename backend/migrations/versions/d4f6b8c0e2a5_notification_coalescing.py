@@ -0,0 +1,33 @@
+"""Notification coalescing
+
+Revision ID: d4f6b8c0e2a5
+Revises: c3e5a7b9d1f3
+Create Date: 2026-10-19 16:24:03.117582
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e2a5'
+down_revision = 'c3e5a7b9d1f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('coalesce_key', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('occurrence_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('idx_notifications_coalesce',
+                              ['user_id', 'type', 'coalesce_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('idx_notifications_coalesce')
+        batch_op.drop_column('last_seen_at')
+        batch_op.drop_column('occurrence_count')
+        batch_op.drop_column('coalesce_key')
@@ -0,0 +1,43 @@
+"""Notification incremental sync
+
+Revision ID: e5a7c9d1f3b6
+Revises: d4f6b8c0e2a5
+Create Date: 2026-10-19 17:41:52.902316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f3b6'
+down_revision = 'd4f6b8c0e2a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_tombstones',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('notification_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('notification_tombstones', schema=None) as batch_op:
+        batch_op.create_index('idx_tombstones_user_deleted', ['user_id', 'deleted_at'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('idx_notifications_user_created',
+                              ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('idx_notifications_user_created')
+
+    with op.batch_alter_table('notification_tombstones', schema=None) as batch_op:
+        batch_op.drop_index('idx_tombstones_user_deleted')
+
+    op.drop_table('notification_tombstones')
@@ -0,0 +1,32 @@
+"""Notification event retries
+
+Revision ID: e7b9d1f3a5c8
+Revises: d0f2b4c6e8a1
+Create Date: 2026-10-19 21:42:17.308415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b9d1f3a5c8'
+down_revision = 'd0f2b4c6e8a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('last_error', sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column('failed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('notification_events', schema=None) as batch_op:
+        batch_op.drop_column('failed_at')
+        batch_op.drop_column('last_error')
+        batch_op.drop_column('next_attempt_at')
+        batch_op.drop_column('attempts')
@@ -0,0 +1,42 @@
+"""Email queue
+
+Revision ID: f6b8d0e2a4c7
+Revises: e5a7c9d1f3b6
+Create Date: 2026-10-19 19:08:36.551209
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e2a4c7'
+down_revision = 'e5a7c9d1f3b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_queue',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('recipient', sa.String(length=255), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('template', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('email_queue', schema=None) as batch_op:
+        batch_op.create_index('idx_email_queue_due', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('email_queue', schema=None) as batch_op:
+        batch_op.drop_index('idx_email_queue_due')
+
+    op.drop_table('email_queue')
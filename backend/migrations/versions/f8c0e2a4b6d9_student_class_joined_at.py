@@ -0,0 +1,29 @@
+"""Student class joined at
+
+Revision ID: f8c0e2a4b6d9
+Revises: e7b9d1f3a5c8
+Create Date: 2026-10-19 22:05:41.772019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c0e2a4b6d9'
+down_revision = 'e7b9d1f3a5c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('class_joined_at', sa.DateTime(), nullable=True))
+
+    # Existing students are taken to have joined when their account was made
+    op.execute("UPDATE students SET class_joined_at = created_at WHERE class_id IS NOT NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_column('class_joined_at')
@@ -1,10 +1,14 @@
 import os
 from app import create_app, socketio
 from app.models import *
+from app.services.attempt_heartbeat_service import AttemptHeartbeatService
 
 # Create the Flask app
 app = create_app()
 
+# Writes heartbeat activity buffered in this process
+AttemptHeartbeatService.start_activity_flusher(app)
+
 if __name__ == '__main__':
     # Get environment variables
     host = os.getenv('FLASK_HOST', '127.0.0.1')
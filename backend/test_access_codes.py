@@ -0,0 +1,138 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.attempt_access_code import AttemptAccessCode
+from app.models.violation import Violation
+from app.modules.teacher.access_code_service import AccessCodeService
+
+
+class TestAccessCodes(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        for teacher_id in ('teacher-1', 'teacher-2'):
+            user = User(id=teacher_id, email=f'{teacher_id}@example.com', password_hash='x',
+                        name=teacher_id, role=UserRole.TEACHER)
+            db.session.add_all([user, Teacher(id=teacher_id, user=user)])
+        db.session.add(Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                            time_limit_minutes=30, created_by='teacher-1'))
+        for i in range(2):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([
+                user, Student(id=user.id, user=user, registration_number=f'REG{i}'),
+                QuizAttempt(id=f'attempt-{i}', quiz_id='quiz-1', student_id=user.id,
+                            locked_at=datetime.utcnow())
+            ])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_codes_are_single_use(self):
+        code = AccessCodeService.generate_access_code('attempt-0', 'teacher-1')
+        record = AttemptAccessCode.query.one()
+        self.assertNotEqual(record.code_hash, code)
+        self.assertEqual(len(record.code_hash), 64)
+
+        self.assertFalse(AccessCodeService.verify_access_code('attempt-1', code))
+        self.assertFalse(AccessCodeService.verify_access_code('attempt-0', 'WRONG123'))
+        self.assertTrue(AccessCodeService.verify_access_code(
+            'attempt-0', code.lower(), {'ip': '10.0.0.1'}))
+        self.assertFalse(AccessCodeService.verify_access_code('attempt-0', code))
+
+        db.session.expire_all()
+        self.assertEqual(AttemptAccessCode.query.one().device_info, {'ip': '10.0.0.1'})
+        self.assertIsNone(db.session.get(QuizAttempt, 'attempt-0').locked_at)
+        self.assertIsNotNone(db.session.get(QuizAttempt, 'attempt-1').locked_at)
+
+    def test_new_code_replaces_unused_one_and_expired_codes_fail(self):
+        first = AccessCodeService.generate_access_code('attempt-0', 'teacher-1')
+        second = AccessCodeService.generate_access_code('attempt-0', 'teacher-1')
+        self.assertEqual(AttemptAccessCode.query.count(), 1)
+        self.assertFalse(AccessCodeService.verify_access_code('attempt-0', first))
+
+        AttemptAccessCode.query.update({'expires_at': datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+        self.assertFalse(AccessCodeService.verify_access_code('attempt-0', second))
+
+        with self.assertRaises(ValueError):
+            AccessCodeService.generate_access_code('attempt-0', 'teacher-2')
+
+    def test_active_codes_listing_revoke_and_cleanup(self):
+        AccessCodeService.generate_access_code('attempt-0', 'teacher-1')
+        code = AccessCodeService.generate_access_code('attempt-1', 'teacher-1')
+        AccessCodeService.verify_access_code('attempt-1', code)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            active = AccessCodeService.get_active_access_codes('teacher-1')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([(c['attempt_id'], c['student_name'], c['quiz_title']) for c in active],
+                         [('attempt-0', 'Student 0', 'Algebra')])
+        self.assertEqual(AccessCodeService.get_active_access_codes('teacher-2'), [])
+
+        self.assertFalse(AccessCodeService.revoke_access_code('attempt-0', 'teacher-2'))
+        self.assertTrue(AccessCodeService.revoke_access_code('attempt-0', 'teacher-1'))
+        self.assertEqual(AccessCodeService.get_active_access_codes('teacher-1'), [])
+
+        self.assertEqual(AccessCodeService.purge_expired_codes(), 0)
+        self.assertEqual(AccessCodeService.purge_expired_codes(
+            datetime.utcnow() + timedelta(days=2)), 1)
+        self.assertEqual(AttemptAccessCode.query.count(), 0)
+
+    def test_routes_use_issued_codes_and_failed_guesses_are_not_violations(self):
+        client = self.app.test_client()
+
+        def post(url, user, body=None):
+            return client.post(url, json=body or {}, headers={
+                'Authorization': f'Bearer {create_access_token(identity=user)}'})
+
+        response = post('/api/access-codes/generate/attempt-0', 'teacher-2')
+        self.assertEqual(response.status_code, 400)
+        code = post('/api/access-codes/generate/attempt-0',
+                    'teacher-1').get_json()['access_code']
+
+        for url in ('/api/attempts/attempt-0/verify-access-code',
+                    '/api/access-codes/verify/attempt-0'):
+            response = post(url, 'student-0', {'accessCode': 'WRONG123'})
+            self.assertEqual(response.status_code, 401)
+        response = post('/api/attempts/attempt-0/verify-access-code', 'student-1',
+                        {'accessCode': code})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Violation.query.count(), 0)
+        self.assertFalse(db.session.get(QuizAttempt, 'attempt-0').total_violations)
+
+        response = post('/api/attempts/attempt-0/verify-access-code', 'student-0',
+                        {'accessCode': code})
+        self.assertEqual(response.status_code, 200)
+        db.session.expire_all()
+        self.assertIsNone(db.session.get(QuizAttempt, 'attempt-0').locked_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
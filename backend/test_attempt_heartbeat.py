@@ -0,0 +1,139 @@
+import os
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db, socketio, cache
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.services.attempt_heartbeat_service import AttemptHeartbeatService
+
+
+class TestAttemptHeartbeat(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['ATTEMPT_ACTIVITY_FLUSH_INTERVAL'] = 3600
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+        AttemptHeartbeatService.flush_activity()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                    name='Teacher', role=UserRole.TEACHER)
+        db.session.add_all([user, Teacher(id=user.id, user=user)])
+        for i in range(3):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([
+                user, Student(id=user.id, user=user, registration_number=f'REG{i}'),
+                QuizAttempt(id=f'attempt-{i}', quiz_id='quiz-1', student_id=user.id,
+                            started_at=datetime.utcnow() - timedelta(minutes=10))
+            ])
+        db.session.add(Quiz(id='quiz-1', title='Algebra', subject='Math',
+                            access_code='ABC123', time_limit_minutes=30,
+                            created_by='teacher-1'))
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        AttemptHeartbeatService.flush_activity()
+        socketio.emit = self.original_emit
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _heartbeat(self, attempt_id, student_id):
+        token = create_access_token(identity=student_id)
+        return self.client.post(f'/api/attempts/{attempt_id}/heartbeat',
+                                headers={'Authorization': f'Bearer {token}'})
+
+    def test_heartbeat_returns_timer_state(self):
+        response = self._heartbeat('attempt-0', 'student-0')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'in_progress')
+        self.assertTrue(1195 <= data['remaining_seconds'] <= 1200)
+        self.assertIn('server_time', data)
+
+        self.assertEqual(self._heartbeat('attempt-0', 'student-1').status_code, 404)
+        self.assertEqual(self._heartbeat('missing', 'student-0').status_code, 404)
+
+    def test_activity_is_written_in_one_statement(self):
+        for _ in range(5):
+            for i in range(3):
+                self.assertEqual(self._heartbeat(f'attempt-{i}', f'student-{i}').status_code, 200)
+
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            self.assertEqual(AttemptHeartbeatService.flush_activity(), 3)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('UPDATE quiz_attempts'))
+        db.session.expire_all()
+        self.assertTrue(all(attempt.last_activity_at for attempt in QuizAttempt.query))
+
+    def test_flushes_stay_off_requests_and_never_go_back(self):
+        self.app.config['ATTEMPT_ACTIVITY_FLUSH_INTERVAL'] = 0
+        self._heartbeat('attempt-0', 'student-0')
+        db.session.expire_all()
+        self.assertIsNone(db.session.get(QuizAttempt, 'attempt-0').last_activity_at)
+
+        # A submit recorded later wins over an older buffered heartbeat
+        submitted_at = datetime.utcnow() + timedelta(minutes=1)
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        attempt.last_activity_at = submitted_at
+        db.session.commit()
+        self.assertEqual(AttemptHeartbeatService.flush_activity(), 1)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(QuizAttempt, 'attempt-0').last_activity_at, submitted_at)
+
+        self._heartbeat('attempt-1', 'student-1')
+        self.assertIsNotNone(AttemptHeartbeatService.take_activity('attempt-1'))
+        self.assertEqual(AttemptHeartbeatService.flush_activity(), 0)
+
+    def test_status_change_refreshes_cached_metadata(self):
+        self._heartbeat('attempt-0', 'student-0')
+
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        attempt.status = AttemptStatus.SUBMITTED
+        db.session.commit()
+        AttemptHeartbeatService.flush_activity()
+
+        data = self._heartbeat('attempt-0', 'student-0').get_json()
+        self.assertEqual(data['status'], 'submitted')
+        # Finished attempts no longer record activity
+        self.assertEqual(AttemptHeartbeatService.flush_activity(), 0)
+
+    def test_heartbeat_throughput(self):
+        count = 20000
+        AttemptHeartbeatService.heartbeat('attempt-0', 'student-0')
+        started = time.perf_counter()
+        for i in range(count):
+            AttemptHeartbeatService.heartbeat(f'attempt-{i % 3}', f'student-{i % 3}')
+        elapsed = time.perf_counter() - started
+        print(f'\n{count} heartbeats in {elapsed:.2f}s ({count / elapsed:.0f}/s)')
+        self.assertEqual(AttemptHeartbeatService.flush_activity(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from sqlalchemy import event
+from app import create_app, db, cache
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz, QuizStatus
+from app.models.quiz_attempt import QuizAttempt
+from app.modules.admin.admin_service import AdminService
+from app.modules.student.student_service import StudentService
+
+
+class TestDashboardCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        for i, (role, active) in enumerate([
+            (UserRole.ADMIN, True),
+            (UserRole.TEACHER, True),
+            (UserRole.STUDENT, True),
+            (UserRole.STUDENT, False),
+        ]):
+            db.session.add(User(email=f'user{i}@example.com', password_hash='x',
+                                name=f'User {i}', role=role, is_active=active))
+        db.session.add(Class(name='Math 101'))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_stats_from_grouped_query(self):
+        stats = AdminService.get_dashboard_stats()
+
+        self.assertEqual(stats['total_users'], 4)
+        self.assertEqual(stats['active_users'], 3)
+        self.assertEqual(stats['inactive_users'], 1)
+        self.assertEqual(stats['admin_count'], 1)
+        self.assertEqual(stats['teacher_count'], 1)
+        self.assertEqual(stats['student_count'], 2)
+        self.assertEqual(stats['total_classes'], 1)
+        self.assertEqual(stats['total_quizzes'], 0)
+
+    def test_stats_cached_until_user_or_class_changes(self):
+        first = AdminService.get_dashboard_stats()
+
+        # A raw insert bypasses the ORM, so the cached value is served
+        db.session.execute(db.text(
+            "INSERT INTO classes (id, name) VALUES ('raw-class', 'Raw')"))
+        db.session.commit()
+        self.assertEqual(AdminService.get_dashboard_stats(), first)
+
+        db.session.add(Class(name='Physics 101'))
+        db.session.commit()
+        self.assertEqual(AdminService.get_dashboard_stats()['total_classes'], 3)
+
+        User.query.filter_by(is_active=False).update({'is_active': True})
+        db.session.commit()
+        self.assertEqual(AdminService.get_dashboard_stats()['active_users'], 4)
+
+
+class TestStudentDashboardCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+
+        teacher = User(id='teacher-1', email='t@example.com', password_hash='x',
+                       name='Teacher', role=UserRole.TEACHER)
+        db.session.add_all([teacher, Teacher(id=teacher.id, user=teacher)])
+        self.opens_at = datetime.now() + timedelta(hours=1)
+        for i in range(2):
+            class_obj = Class(id=f'class-{i}', name=f'Class {i}')
+            quiz = Quiz(id=f'quiz-{i}', title='Algebra', subject='Math',
+                        access_code=f'CODE{i}', time_limit_minutes=30,
+                        created_by='teacher-1', status=QuizStatus.PUBLISHED,
+                        start_date=self.opens_at)
+            quiz.classes = [class_obj]
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([class_obj, quiz, user,
+                                Student(id=user.id, user=user, registration_number=f'REG{i}',
+                                        class_id=class_obj.id)])
+        db.session.commit()
+
+    def tearDown(self):
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _dashboard(self, student_id):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            dashboard = StudentService.get_student_dashboard(student_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return dashboard, len(statements)
+
+    def test_availability_follows_the_clock_on_cached_dashboards(self):
+        quiz = self._dashboard('student-0')[0]['available_quizzes'][0]
+        self.assertEqual(quiz['availability_status'], 'upcoming')
+        self.assertFalse(quiz['is_available_now'])
+
+        with mock.patch.object(StudentService, '_current_time_for',
+                               return_value=self.opens_at + timedelta(minutes=1)):
+            dashboard, statements = self._dashboard('student-0')
+        # Served from the cache (only the scope lookup ran), yet now open
+        self.assertEqual(statements, 1)
+        quiz = dashboard['available_quizzes'][0]
+        self.assertEqual(quiz['availability_status'], 'open')
+        self.assertTrue(quiz['is_available_now'])
+
+    def test_attempts_and_class_edits_only_invalidate_their_own_students(self):
+        self._dashboard('student-0')
+        self._dashboard('student-1')
+
+        db.session.add(QuizAttempt(id='attempt-0', quiz_id='quiz-0', student_id='student-0'))
+        db.session.commit()
+        dashboard, statements = self._dashboard('student-0')
+        self.assertGreater(statements, 1)
+        self.assertEqual(dashboard['stats']['total_attempts'], 1)
+        self.assertEqual(self._dashboard('student-1')[1], 1)
+
+        db.session.get(Class, 'class-1').name = 'Renamed'
+        db.session.commit()
+        self.assertEqual(self._dashboard('student-0')[1], 1)
+        dashboard, statements = self._dashboard('student-1')
+        self.assertGreater(statements, 1)
+        self.assertEqual(dashboard['class']['name'], 'Renamed')
+
+        # Quiz content is shared across classes
+        db.session.get(Quiz, 'quiz-0').title = 'Geometry'
+        db.session.commit()
+        self.assertGreater(self._dashboard('student-1')[1], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
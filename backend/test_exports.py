@@ -0,0 +1,120 @@
+import csv
+import io
+import os
+import unittest
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from openpyxl import load_workbook
+from app import create_app, db
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.violation import Violation, ViolationType
+from app.modules.reports.export_service import ExportService
+
+
+class TestExports(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        teacher_user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                            name='Teacher', role=UserRole.TEACHER)
+        self.teacher = Teacher(id='teacher-1', user=teacher_user)
+        class_obj = Class(id='class-1', name='Math 101')
+        class_obj.teachers.append(self.teacher)
+        self.quiz = Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                         time_limit_minutes=30, created_by='teacher-1')
+        self.quiz.classes.append(class_obj)
+        db.session.add_all([teacher_user, self.teacher, class_obj, self.quiz])
+
+        for i in range(3):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            student = Student(id=user.id, user=user, registration_number=f'REG{i}',
+                              class_id='class-1')
+            attempt = QuizAttempt(id=f'attempt-{i}', quiz_id='quiz-1', student_id=user.id,
+                                  status=AttemptStatus.GRADED, score=7 + i,
+                                  total_marks=10, percentage=70 + 10 * i, passed=True)
+            attempt.violations.append(
+                Violation(violation_type=ViolationType.TAB_SWITCH, question_index=i))
+            db.session.add_all([user, student, attempt])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _csv_rows(self, headers, stmt):
+        body = b''.join(ExportService.stream_export(headers, stmt, 'csv'))
+        return list(csv.reader(io.StringIO(body.decode('utf-8'))))
+
+    def test_quiz_results_csv(self):
+        rows = self._csv_rows(*ExportService.quiz_results_export('quiz-1'))
+
+        self.assertEqual(rows[0][:3], ['Attempt ID', 'Student', 'Registration Number'])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][1], 'Student 0')
+        self.assertEqual(rows[1][5], 'graded')
+        self.assertEqual(rows[3][8], '90.0')
+
+    def test_class_gradebook_and_violation_log_csv(self):
+        gradebook = self._csv_rows(*ExportService.class_gradebook_export('class-1'))
+        self.assertEqual([r[0] for r in gradebook[1:]],
+                         ['Student 0', 'Student 1', 'Student 2'])
+        self.assertEqual(gradebook[1][2], 'Algebra')
+
+        violations = self._csv_rows(*ExportService.violation_log_export('quiz-1'))
+        self.assertEqual(len(violations), 4)
+        self.assertEqual({r[4] for r in violations[1:]}, {'tab_switch'})
+
+    def test_quiz_results_xlsx(self):
+        headers, stmt = ExportService.quiz_results_export('quiz-1')
+        body = b''.join(ExportService.stream_export(headers, stmt, 'xlsx', 'Results'))
+
+        sheet = load_workbook(io.BytesIO(body), read_only=True)['Results']
+        values = list(sheet.values)
+        self.assertEqual(values[0][0], 'Attempt ID')
+        self.assertEqual(len(values), 4)
+        self.assertEqual(values[2][6], 8)
+
+    def test_csv_flushes_in_batches(self):
+        headers = ['n']
+        chunks = list(ExportService.iter_csv(headers, ([i] for i in range(2500))))
+
+        # Header plus two full batches, then the remainder
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(c.count(b'\n') for c in chunks), 2501)
+
+    def test_formula_like_text_is_escaped(self):
+        names = ['=HYPERLINK("http://evil")', '+1', '-2+3']
+        for i, name in enumerate(names):
+            db.session.get(User, f'student-{i}').name = name
+        db.session.get(Class, 'class-1').name = '@SUM(A1)'
+        db.session.commit()
+
+        headers, stmt = ExportService.quiz_results_export('quiz-1')
+        rows = self._csv_rows(headers, stmt)
+        self.assertEqual(sorted(r[1] for r in rows[1:]),
+                         sorted("'" + name for name in names))
+        self.assertEqual({r[3] for r in rows[1:]}, {"'@SUM(A1)"})
+        # Numbers, including negative ones, stay numbers
+        self.assertEqual(ExportService._format_cell(-2), -2)
+        self.assertEqual(ExportService._format_cell('Ann-Marie'), 'Ann-Marie')
+
+        body = b''.join(ExportService.stream_export(headers, stmt, 'xlsx', 'Results'))
+        values = list(load_workbook(io.BytesIO(body), read_only=True)['Results'].values)
+        self.assertEqual(sorted(v[1] for v in values[1:]),
+                         sorted("'" + name for name in names))
+        self.assertEqual(sorted(v[6] for v in values[1:]), [7, 8, 9])
+
+
+if __name__ == '__main__':
+    unittest.main()
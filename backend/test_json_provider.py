@@ -0,0 +1,47 @@
+import os
+import unittest
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask import jsonify
+from app import create_app
+from app.models.quiz import QuizStatus
+from app.utils import json_provider
+
+
+class TestJsonProvider(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_native_types_encode_the_same_with_and_without_orjson(self):
+        attempt_id = uuid.uuid4()
+        payload = {'started_at': datetime(2026, 10, 19, 9, 30, 15, 120000),
+                   'due': date(2026, 10, 20), 'score': Decimal('17.50'),
+                   'status': QuizStatus.PUBLISHED, 'id': attempt_id, 'name': 'Zoë', 3: None}
+        expected = {'started_at': '2026-10-19T09:30:15.120000', 'due': '2026-10-20',
+                    'score': 17.5, 'status': 'published', 'id': str(attempt_id),
+                    'name': 'Zoë', '3': None}
+
+        self.assertIsNotNone(json_provider.orjson)
+        self.assertEqual(jsonify(payload).get_json(), expected)
+        self.assertEqual(self.app.json.loads(self.app.json.dumps(payload)), expected)
+
+        with patch.object(json_provider, 'orjson', None):
+            self.assertEqual(jsonify(payload).get_json(), expected)
+            self.assertEqual(self.app.json.loads(self.app.json.dumps(payload)), expected)
+
+        with self.assertRaises(TypeError):
+            self.app.json.dumps({'value': object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import unittest
+from datetime import date
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from app import create_app, db
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz
+from app.models.question import Question, QuestionType
+from app.models.quiz_question import QuizQuestion
+from app.models.audit_log import AuditLog
+from app.modules.admin.admin_service import AdminService
+from app.utils.serializers import QUIZ_PLAN
+
+
+class TestListQueries(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        admin = User(id='admin-1', email='a@example.com', password_hash='x', name='Admin',
+                     role=UserRole.ADMIN)
+        teacher = User(id='teacher-1', email='t@example.com', password_hash='x',
+                       name='Teacher', role=UserRole.TEACHER)
+        db.session.add_all([admin, teacher, Teacher(id=teacher.id, user=teacher, subject='Math'),
+                            Class(id='class-1', name='7A', created_by='teacher-1')])
+        for i in range(3):
+            student = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                           name=f'Student {i}', role=UserRole.STUDENT)
+            quiz = Quiz(id=f'quiz-{i}', title=f'Quiz {i}', subject='Math',
+                        access_code=f'CODE0{i}', time_limit_minutes=30, created_by='teacher-1')
+            quiz.classes = [db.session.get(Class, 'class-1')]
+            db.session.add_all([
+                student, Student(id=student.id, user=student, registration_number=f'REG{i}',
+                                 class_id='class-1', date_of_birth=date(2010, 1, i + 1)),
+                quiz,
+                Question(id=f'question-{i}', text='1 + 1?', type=QuestionType.DESCRIPTIVE,
+                         marks=1, created_by='teacher-1'),
+                QuizQuestion(quiz_id=quiz.id, question_id=f'question-{i}', order_index=0),
+                AuditLog(user_id='admin-1', action=f'action {i}', new_value={'i': i})
+            ])
+        db.session.commit()
+        db.session.expire_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _get(self, url, user_id):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        token = create_access_token(identity=user_id)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.app.test_client().get(
+                url, headers={'Authorization': f'Bearer {token}'})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json(), statements
+
+    def test_user_listing_is_one_projection(self):
+        data, statements = self._get('/api/admin/users', 'admin-1')
+        # Current user, count, page
+        self.assertEqual(len(statements), 3)
+        self.assertFalse([s for s in statements if 'password_hash' in s and 'LIMIT' in s])
+
+        db.session.expire_all()
+        for user in data['users']:
+            self.assertEqual(user, AdminService.get_user_by_id(user['id']))
+        student = next(u for u in data['users'] if u['id'] == 'student-0')
+        self.assertEqual((student['class_name'], student['date_of_birth']), ('7A', '2010-01-01'))
+
+    def test_list_endpoints_have_fixed_query_counts(self):
+        data, statements = self._get('/api/teacher/quizzes', 'teacher-1')
+        self.assertEqual(len(data['quizzes']), 3)
+        self.assertEqual(data['quizzes'][0]['total_marks'], 1)
+        # Current user, count, page, questions, classes
+        self.assertEqual(len(statements), 5)
+
+        data, statements = self._get('/api/admin/audit-logs', 'admin-1')
+        self.assertEqual(len(data['logs']), 3)
+        self.assertEqual(len(statements), 3)
+
+        _, statements = self._get('/api/quizzes/questions', 'teacher-1')
+        # Current user, version, count, page
+        self.assertEqual(len(statements), 4)
+
+    def test_strict_mode_raises_on_unplanned_loads(self):
+        self.assertTrue(self.app.config['SQLALCHEMY_STRICT_LOADING'])
+        quiz = Quiz.query.options(*QUIZ_PLAN.options(QUIZ_PLAN.select('title'))).first()
+        self.assertTrue(quiz.title)
+        with self.assertRaises(InvalidRequestError):
+            quiz.classes
+        with self.assertRaises(InvalidRequestError):
+            quiz.description
+
+        quiz = Quiz.query.options(*QUIZ_PLAN.options(QUIZ_PLAN.select('total_marks'))).first()
+        with self.assertRaises(InvalidRequestError):
+            quiz.questions[0].question.text
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+import os
+import socketserver
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app, db, socketio, mail
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz
+from app.models.question import Question, QuestionType
+from app.models.quiz_question import QuizQuestion
+from app.models.queued_email import QueuedEmail
+from app.modules.auth.auth_service import AuthService
+from app.modules.quiz.quiz_service import QuizService
+from app.services import mail_service
+from app.services.mail_service import MailService
+from app.services.notification_service import NotificationService
+
+STUDENT_COUNT = 5000
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib; rejects recipients at reject.example"""
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.wfile.write(b'220 localhost ready\r\n')
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(' ')[0].split(':')[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self.wfile.write(b'250 localhost\r\n')
+            elif command == 'MAIL':
+                recipients = []
+                self.wfile.write(b'250 OK\r\n')
+            elif command == 'RCPT':
+                if 'reject.example' in line:
+                    self.wfile.write(b'550 No such user\r\n')
+                else:
+                    recipients.append(line.split(':', 1)[1].strip('<> '))
+                    self.wfile.write(b'250 OK\r\n')
+            elif command == 'DATA':
+                self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                data = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b'.\r\n', b''):
+                        break
+                    data.append(data_line)
+                server.messages.extend((r, b''.join(data)) for r in recipients)
+                self.wfile.write(b'250 OK\r\n')
+            elif command == 'QUIT':
+                self.wfile.write(b'221 Bye\r\n')
+                return
+            else:  # RSET, NOOP
+                self.wfile.write(b'250 OK\r\n')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = []
+
+
+class TestMailQueue(unittest.TestCase):
+    def setUp(self):
+        self.smtp = LocalSMTPServer()
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+
+        self.app = create_app('testing')
+        self.app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=self.smtp.server_address[1],
+                               MAIL_USE_TLS=False, MAIL_USERNAME=None,
+                               MAIL_SUPPRESS_SEND=False,
+                               MAIL_DEFAULT_SENDER='quizmaster@school.example')
+        mail.init_app(self.app)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        mail_service._domain_sends.clear()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        user = User(id='student-1', email='ada@school.example', password_hash='x',
+                    name='Ada', role=UserRole.STUDENT)
+        db.session.add_all([Class(id='class-1', name='Math 101'), user,
+                            Student(id=user.id, user=user, registration_number='REG1',
+                                    class_id='class-1')])
+        db.session.commit()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        mail_service._domain_sends.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.smtp.shutdown()
+        self.smtp.server_close()
+
+    def test_password_reset_is_mailed_by_worker(self):
+        token = AuthService.request_password_reset('ada@school.example')
+        self.assertEqual(self.smtp.messages, [])
+
+        self.assertEqual(MailService.process_queue(), 1)
+        recipient, data = self.smtp.messages[0]
+        self.assertEqual(recipient, 'ada@school.example')
+        self.assertIn(token.encode(), data)
+        self.assertEqual(QueuedEmail.query.one().status, 'sent')
+
+        # The endpoint never reveals the code, and the retention pass drops it
+        response = self.app.test_client().post('/api/auth/forgot-password',
+                                               json={'email': 'ada@school.example'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('token', response.get_json())
+        self.assertEqual(MailService.purge_sensitive(), 1)
+        self.assertEqual(QueuedEmail.query.one().status, 'pending')
+
+    def test_graded_result_is_mailed_to_student_and_parent(self):
+        Student.query.get('student-1').parent_email = 'parent@home.example'
+        NotificationService.notify_attempt_graded('attempt-1', 'student-1', 'Algebra', 8, 10, 80)
+        db.session.commit()
+        NotificationService.process_outbox()
+
+        self.assertEqual(MailService.process_queue(), 2)
+        self.assertEqual(sorted(r for r, _ in self.smtp.messages),
+                         ['ada@school.example', 'parent@home.example'])
+
+    def test_failures_back_off_then_give_up(self):
+        self.app.config['MAIL_MAX_ATTEMPTS'] = 2
+        MailService.enqueue('nobody@reject.example', 'password_reset', {'token': '123456'})
+        MailService.enqueue('ada@school.example', 'password_reset', {'token': '123456'})
+        db.session.commit()
+
+        self.assertEqual(MailService.process_queue(), 1)
+        rejected = QueuedEmail.query.filter_by(recipient='nobody@reject.example').one()
+        self.assertEqual((rejected.status, rejected.attempts), ('pending', 1))
+        self.assertGreater(rejected.next_attempt_at, datetime.utcnow() + timedelta(seconds=50))
+
+        # Not due yet
+        self.assertEqual(MailService.process_queue(), 0)
+        self.assertEqual(rejected.attempts, 1)
+
+        rejected.next_attempt_at = datetime.utcnow()
+        db.session.commit()
+        MailService.process_queue()
+        self.assertEqual((rejected.status, rejected.attempts), ('failed', 2))
+
+    def test_domain_rate_limit_defers_without_using_attempts(self):
+        self.app.config['MAIL_DOMAIN_RATE_LIMIT'] = 2
+        for i in range(3):
+            MailService.enqueue(f'user{i}@school.example', 'password_reset', {'token': '1'})
+        MailService.enqueue('parent@home.example', 'password_reset', {'token': '1'})
+        db.session.commit()
+
+        self.assertEqual(MailService.process_queue(), 3)
+        deferred = QueuedEmail.query.filter_by(status='pending').one()
+        self.assertEqual((deferred.recipient, deferred.attempts), ('user2@school.example', 0))
+        self.assertGreater(deferred.next_attempt_at, datetime.utcnow())
+
+    def test_quiz_published_emails_leave_request_path_untouched(self):
+        teacher_user = User(id='teacher-1', email='t@school.example', password_hash='x',
+                            name='Teacher', role=UserRole.TEACHER)
+        quiz = Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                    time_limit_minutes=30, created_by='teacher-1')
+        quiz.classes.append(Class.query.get('class-1'))
+        db.session.add_all([teacher_user, Teacher(id='teacher-1', user=teacher_user), quiz,
+                            Question(id='question-1', text='1 + 1?', marks=1,
+                                     type=QuestionType.DESCRIPTIVE, created_by='teacher-1'),
+                            QuizQuestion(quiz_id='quiz-1', question_id='question-1',
+                                         order_index=0)])
+        users = [{'id': f'bulk-{i}', 'email': f'student{i}@school.example', 'password_hash': 'x',
+                  'name': f'Student {i}', 'role': UserRole.STUDENT, 'is_active': True}
+                 for i in range(STUDENT_COUNT - 1)]
+        db.session.execute(User.__table__.insert(), users)
+        db.session.execute(Student.__table__.insert(), [
+            {'id': u['id'], 'registration_number': f'BULK{i}', 'class_id': 'class-1'}
+            for i, u in enumerate(users)])
+        db.session.commit()
+
+        started = time.perf_counter()
+        QuizService.publish_quiz('quiz-1', 'teacher-1')
+        request_seconds = time.perf_counter() - started
+        self.assertEqual(QueuedEmail.query.count(), 0)
+
+        NotificationService.process_outbox()
+        self.assertEqual(QueuedEmail.query.count(), STUDENT_COUNT)
+
+        self.app.config['MAIL_DOMAIN_RATE_LIMIT'] = 0
+        started = time.perf_counter()
+        batches = 0
+        while MailService.process_queue(1000):
+            batches += 1
+        send_seconds = time.perf_counter() - started
+
+        print(f'\npublish request {request_seconds * 1000:.1f} ms; worker sent '
+              f'{len(self.smtp.messages)} emails in {send_seconds:.2f} s '
+              f'over {self.smtp.connections} SMTP connections')
+        self.assertEqual(len(self.smtp.messages), STUDENT_COUNT)
+        self.assertEqual(self.smtp.connections, batches)
+        self.assertIn(b'http://localhost:5173/student/quizzes', self.smtp.messages[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
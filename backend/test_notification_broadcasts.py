@@ -0,0 +1,126 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app, db, socketio
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.notification import Notification
+from app.models.broadcast_notification import BroadcastNotification
+from app.models.notification_receipt import NotificationReceipt
+from app.services.notification_service import NotificationService
+
+
+class TestNotificationBroadcasts(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        db.session.add_all([Class(id='class-1', name='Math 101'),
+                            Class(id='class-2', name='Physics 101')])
+        for i, class_id in enumerate(['class-1', 'class-1', 'class-2']):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([user, Student(id=user.id, user=user,
+                                              registration_number=f'REG{i}',
+                                              class_id=class_id)])
+        db.session.commit()
+
+        NotificationService.insert_broadcasts(
+            ['class-1'], 'quiz_published',
+            {'quiz_title': 'Algebra', 'subject': 'Math', 'link': '/student/quizzes'})
+        NotificationService.insert_notifications(
+            ['student-0'], 'attempt_graded',
+            {'quiz_title': 'Algebra', 'score': 5, 'total_marks': 10,
+             'percentage': '50.0', 'link': '/student/results'})
+        db.session.commit()
+        self.broadcast = BroadcastNotification.query.one()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_reads_merge_personal_and_class_broadcasts(self):
+        notifications = NotificationService.get_user_notifications('student-0')
+        self.assertEqual({n['type'] for n in notifications},
+                         {'quiz_published', 'attempt_graded'})
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 2)
+
+        self.assertEqual([n['id'] for n in NotificationService.get_user_notifications('student-1')],
+                         [self.broadcast.id])
+        self.assertEqual(NotificationService.get_user_notifications('student-2'), [])
+        self.assertEqual(NotificationService.get_unread_count('student-2'), 0)
+
+    def test_read_receipts_are_per_user(self):
+        read = NotificationService.mark_as_read(self.broadcast.id, 'student-0')
+        self.assertTrue(read['is_read'])
+
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 1)
+        self.assertEqual(NotificationService.get_unread_count('student-1'), 1)
+        self.assertEqual(NotificationReceipt.query.count(), 1)
+
+        # Other classes cannot touch the broadcast
+        self.assertIsNone(NotificationService.mark_as_read(self.broadcast.id, 'student-2'))
+
+        NotificationService.mark_all_as_read('student-1')
+        self.assertEqual(NotificationService.get_unread_count('student-1'), 0)
+        self.assertEqual(
+            NotificationService.get_user_notifications('student-1', unread_only=True), [])
+
+    def test_dismissing_hides_broadcast_for_that_user_only(self):
+        self.assertTrue(NotificationService.delete_notification(self.broadcast.id, 'student-1'))
+
+        self.assertEqual(NotificationService.get_user_notifications('student-1'), [])
+        self.assertEqual(len(NotificationService.get_user_notifications('student-0')), 2)
+        self.assertEqual(BroadcastNotification.query.count(), 1)
+
+        personal = Notification.query.one()
+        self.assertFalse(NotificationService.delete_notification(personal.id, 'student-1'))
+
+    def test_expired_broadcasts_are_hidden_and_cleaned_up(self):
+        NotificationService.mark_as_read(self.broadcast.id, 'student-0')
+        self.broadcast.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+
+        self.assertEqual(NotificationService.get_unread_count('student-1'), 0)
+
+        NotificationService.cleanup_expired_notifications()
+        self.assertEqual(BroadcastNotification.query.count(), 0)
+        self.assertEqual(NotificationReceipt.query.count(), 0)
+
+    def test_students_only_see_broadcasts_sent_after_joining(self):
+        student = db.session.get(Student, 'student-2')
+        student.class_id = 'class-1'
+        db.session.commit()
+        self.assertGreaterEqual(student.class_joined_at, self.broadcast.created_at)
+
+        self.assertEqual(NotificationService.get_user_notifications('student-2'), [])
+        self.assertEqual(NotificationService.get_unread_count('student-2'), 0)
+
+        NotificationService.insert_broadcasts(
+            ['class-1'], 'quiz_published',
+            {'quiz_title': 'Geometry', 'subject': 'Math', 'link': '/student/quizzes'})
+        db.session.commit()
+        self.assertEqual([n['title'] for n in NotificationService.get_user_notifications(
+            'student-2')], ['New Quiz Available: Geometry'])
+        self.assertEqual(NotificationService.get_unread_count('student-2'), 1)
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 3)
+
+    def test_broadcasts_expire_with_their_category_retention(self):
+        self.assertAlmostEqual(self.broadcast.expires_at - self.broadcast.created_at,
+                               timedelta(days=90), delta=timedelta(seconds=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import time
+import unittest
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app, db, socketio
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.models.notification import Notification
+from app.services import notification_service
+from app.services.notification_service import NotificationService
+
+
+class TestNotificationCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['NOTIFICATION_COALESCE_DEBOUNCE'] = 0.2
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        notification_service._debounced_updates.clear()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        user = User(id='student-1', email='s@example.com', password_hash='x',
+                    name='Student', role=UserRole.STUDENT)
+        db.session.add_all([user, Student(id=user.id, user=user, registration_number='REG1')])
+        db.session.commit()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        notification_service._debounced_updates.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _violations(self, *totals, attempt_id='attempt-1'):
+        for total in totals:
+            NotificationService.notify_violation(attempt_id, 'student-1', 'Algebra',
+                                                 'tab_switch', total)
+        db.session.commit()
+        NotificationService.process_outbox()
+
+    def _emits(self, event):
+        return [c.args[1] for c in socketio.emit.call_args_list if c.args[0] == event]
+
+    def test_repeats_within_window_update_one_notification(self):
+        self._violations(1, 2, 3)
+
+        notification = Notification.query.one()
+        self.assertEqual(notification.occurrence_count, 3)
+        self.assertIn('Violation score: 3/3', notification.message)
+        # Created and coalesced in one batch: a single new_notification
+        self.assertEqual([p['occurrence_count'] for p in self._emits('new_notification')], [3])
+
+        # Another attempt is a different entity
+        self._violations(1, attempt_id='attempt-2')
+        self.assertEqual(Notification.query.count(), 2)
+
+    def test_update_emits_are_debounced(self):
+        self._violations(1)
+        socketio.emit.reset_mock()
+
+        self._violations(2)
+        self._violations(3)
+        self._violations(4)
+        # Leading edge only; later updates wait for the interval
+        self.assertEqual([p['occurrence_count'] for p in self._emits('notification_updated')], [2])
+
+        time.sleep(0.25)
+        NotificationService.process_outbox()
+        updates = self._emits('notification_updated')
+        self.assertEqual([p['occurrence_count'] for p in updates], [2, 4])
+        self.assertIn('Violation score: 4/3', updates[-1]['message'])
+        self.assertEqual(Notification.query.one().occurrence_count, 4)
+        self.assertEqual(self._emits('new_notification'), [])
+
+    def test_read_notification_is_not_reused(self):
+        self._violations(1)
+        NotificationService.mark_as_read(Notification.query.one().id, 'student-1')
+
+        self._violations(2)
+        self.assertEqual(Notification.query.count(), 2)
+        self.assertEqual(NotificationService.get_unread_count('student-1'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import time
+import unittest
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from sqlalchemy import event
+from app import create_app, db, socketio
+from app.models.notification import Notification
+from app.services.notification_service import NotificationService, NOTIFICATION_FANOUT_CHUNK
+
+RECIPIENTS = 10000
+
+
+class TestNotificationFanout(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_fanout_benchmark_10k_recipients(self):
+        user_ids = [f'student-{i}' for i in range(RECIPIENTS)]
+        inserts = []
+
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO notifications'):
+                inserts.append(len(parameters) if executemany else 1)
+
+        event.listen(db.engine, 'before_cursor_execute', count_inserts)
+        try:
+            started = time.perf_counter()
+            payloads = NotificationService.create_notifications_bulk(
+                user_ids=user_ids,
+                notification_type='quiz_published',
+                template_data={'quiz_title': 'Algebra', 'subject': 'Math',
+                               'link': '/student/quizzes'}
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_inserts)
+
+        print(f'\nfan-out to {RECIPIENTS} recipients: {elapsed * 1000:.0f} ms '
+              f'({len(inserts)} insert round trips)')
+
+        # One executemany per chunk instead of one INSERT per row
+        self.assertEqual(len(inserts), RECIPIENTS // NOTIFICATION_FANOUT_CHUNK)
+        self.assertEqual(sum(inserts), RECIPIENTS)
+        self.assertEqual(Notification.query.count(), RECIPIENTS)
+        self.assertLess(elapsed, 10)
+
+        # Emits run in a background task; wait for it before checking
+        socketio.sleep(0)
+        deadline = time.time() + 10
+        while socketio.emit.call_count < RECIPIENTS and time.time() < deadline:
+            socketio.sleep(0.05)
+        self.assertEqual(socketio.emit.call_count, RECIPIENTS)
+
+        first = socketio.emit.call_args_list[0]
+        self.assertEqual(first.args[0], 'new_notification')
+        self.assertEqual(first.kwargs['room'], 'student-0')
+        self.assertEqual(first.args[1]['id'], payloads[0]['id'])
+
+    def test_payload_matches_stored_notification(self):
+        payloads = NotificationService.create_notifications_bulk(
+            user_ids=['user1', 'user2'],
+            notification_type='student_added',
+            template_data={'student_name': 'John Doe', 'class_name': 'Math 101'}
+        )
+
+        self.assertEqual(len({p['id'] for p in payloads}), 2)
+        for payload in payloads:
+            stored = Notification.query.get(payload['id'])
+            self.assertEqual(stored.to_dict(), payload)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app, db, socketio
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz, QuizStatus
+from app.models.question import Question, QuestionType
+from app.models.quiz_question import QuizQuestion
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.notification import Notification
+from app.models.notification_event import NotificationEvent
+from app.models.broadcast_notification import BroadcastNotification
+from app.modules.quiz.quiz_service import QuizService
+from app.modules.attempts.attempt_service import AttemptService
+from app.services.notification_service import NotificationService
+from app.modules.notifications import notification_service as notification_module
+
+
+class TestNotificationOutbox(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        teacher_user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                            name='Teacher', role=UserRole.TEACHER)
+        teacher = Teacher(id='teacher-1', user=teacher_user)
+        class_obj = Class(id='class-1', name='Math 101')
+        quiz = Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                    time_limit_minutes=30, created_by='teacher-1', prevent_tab_switching=True)
+        quiz.classes.append(class_obj)
+        question = Question(id='question-1', text='1 + 1?', type=QuestionType.DESCRIPTIVE,
+                            marks=1, created_by='teacher-1')
+        db.session.add_all([teacher_user, teacher, class_obj, quiz, question,
+                            QuizQuestion(quiz_id='quiz-1', question_id='question-1',
+                                         order_index=0)])
+        for i in range(3):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([user, Student(id=user.id, user=user,
+                                              registration_number=f'REG{i}',
+                                              class_id='class-1')])
+        db.session.commit()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_publish_writes_event_and_worker_fans_out(self):
+        QuizService.publish_quiz('quiz-1', 'teacher-1')
+
+        # Only the outbox event is written on the request path
+        self.assertEqual(Notification.query.count(), 0)
+        socketio.emit.assert_not_called()
+        event = NotificationEvent.query.one()
+        self.assertEqual(event.entity_id, 'quiz-1')
+        self.assertFalse(event.processed)
+
+        self.assertEqual(NotificationService.process_outbox(), 1)
+
+        # Class audiences are stored once and emitted to the class room
+        self.assertEqual(Notification.query.count(), 0)
+        self.assertEqual(BroadcastNotification.query.count(), 1)
+        socketio.emit.assert_called_once()
+        self.assertEqual(socketio.emit.call_args.kwargs['room'], 'class:class-1')
+        for i in range(3):
+            notifications = NotificationService.get_user_notifications(f'student-{i}')
+            self.assertEqual([n['type'] for n in notifications], ['quiz_published'])
+        self.assertTrue(NotificationEvent.query.one().processed)
+
+        # Processed events are never fanned out twice
+        self.assertEqual(NotificationService.process_outbox(), 0)
+        self.assertEqual(BroadcastNotification.query.count(), 1)
+
+    def test_module_facade_queues_through_the_outbox(self):
+        notification_module.NotificationService.notify_quiz_published(
+            'quiz-1', 'Algebra', 'Math', ['class-1'])
+
+        self.assertEqual(Notification.query.count(), 0)
+        socketio.emit.assert_not_called()
+        self.assertFalse(NotificationEvent.query.one().processed)
+        self.assertEqual(NotificationService.process_outbox(), 1)
+        self.assertEqual(BroadcastNotification.query.count(), 1)
+
+    def test_event_rolls_back_with_business_change(self):
+        with patch.object(db.session, 'commit', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                QuizService.publish_quiz('quiz-1', 'teacher-1')
+        db.session.rollback()
+
+        self.assertEqual(NotificationEvent.query.count(), 0)
+        self.assertEqual(Quiz.query.get('quiz-1').status, QuizStatus.DRAFT)
+
+    def test_failed_event_is_retried(self):
+        db.session.add(QuizAttempt(id='attempt-1', quiz_id='quiz-1', student_id='student-0',
+                                   status=AttemptStatus.IN_PROGRESS))
+        db.session.commit()
+        AttemptService.record_violation('attempt-1', 'tab_switch')
+
+        with patch.object(NotificationService, 'insert_notifications',
+                          side_effect=RuntimeError('boom')):
+            NotificationService.process_outbox()
+        event = NotificationEvent.query.one()
+        self.assertFalse(event.processed)
+        self.assertEqual((event.attempts, event.last_error), (1, 'boom'))
+        self.assertEqual(Notification.query.count(), 0)
+
+        # Backing off until next_attempt_at
+        self.assertEqual(NotificationService.process_outbox(), 0)
+        event.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        self.assertEqual(NotificationService.process_outbox(), 1)
+        notification = Notification.query.one()
+        self.assertEqual(notification.user_id, 'student-0')
+        self.assertEqual(notification.type, 'violation_warning')
+
+    def test_failing_events_do_not_block_the_queue_and_are_dead_lettered(self):
+        self.app.config.update(NOTIFICATION_OUTBOX_BATCH_SIZE=1,
+                               NOTIFICATION_OUTBOX_MAX_ATTEMPTS=2)
+        poison = NotificationService.enqueue_event(
+            'quiz_starting_soon', 'quiz', 'quiz-1', {}, user_ids=['student-0'])
+        poison.created_at = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+        QuizService.publish_quiz('quiz-1', 'teacher-1')
+
+        fan_out = NotificationService._fan_out_event
+
+        def fail_announcements(event):
+            if event.event_type == 'quiz_starting_soon':
+                raise RuntimeError('boom')
+            return fan_out(event)
+
+        with patch.object(NotificationService, '_fan_out_event',
+                          side_effect=fail_announcements):
+            self.assertEqual(NotificationService.process_outbox(), 1)
+            # The failed event backs off; the next pass reaches the publish event
+            self.assertEqual(NotificationService.process_outbox(), 1)
+            self.assertEqual(BroadcastNotification.query.count(), 1)
+
+            NotificationEvent.query.update({'next_attempt_at': None})
+            db.session.commit()
+            self.assertEqual(NotificationService.process_outbox(), 1)
+
+        dead = NotificationEvent.query.filter_by(event_type='quiz_starting_soon').one()
+        self.assertTrue(dead.processed)
+        self.assertIsNotNone(dead.failed_at)
+        self.assertEqual((dead.attempts, dead.last_error), (2, 'boom'))
+        self.assertEqual(NotificationService.process_outbox(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.notification import Notification
+from app.models.broadcast_notification import BroadcastNotification
+from app.models.notification_receipt import NotificationReceipt
+from app.models.notification_event import NotificationEvent
+from app.services.notification_retention_service import NotificationRetentionService
+from app.services.notification_service import NotificationService
+
+
+class TestNotificationRetention(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['NOTIFICATION_RETENTION_CHUNK_SIZE'] = 4
+        self.app.config['NOTIFICATION_RETENTION_PAUSE'] = 0.01
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(id='student-1', email='s@example.com', password_hash='x',
+                    name='Student', role=UserRole.STUDENT)
+        db.session.add_all([Class(id='class-1', name='Math 101'), user,
+                            Student(id=user.id, user=user, registration_number='REG1',
+                                    class_id='class-1')])
+        db.session.commit()
+        self.now = datetime.utcnow()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add(self, count, **fields):
+        for _ in range(count):
+            db.session.add(Notification(user_id='student-1', type='t', title='t',
+                                        message='m', **fields))
+        db.session.commit()
+
+    def test_purge_applies_each_rule_in_chunks(self):
+        days = timedelta(days=1)
+        self._add(10, expires_at=self.now - days)
+        self._add(3, is_read=True, read_at=self.now - 31 * days, created_at=self.now - 31 * days,
+                  category='grade')
+        self._add(2, category='system', created_at=self.now - 31 * days)
+        # Kept: recent, unread grade notifications and read ones within the window
+        self._add(2, category='grade', created_at=self.now - 100 * days)
+        self._add(1, is_read=True, read_at=self.now - 2 * days, category='quiz')
+        self._add(1, expires_at=self.now + days)
+
+        broadcast = BroadcastNotification(class_id='class-1', type='t', title='t', message='m',
+                                          expires_at=self.now - days)
+        db.session.add(broadcast)
+        db.session.flush()
+        db.session.add(NotificationReceipt(broadcast_id=broadcast.id, user_id='student-1'))
+        db.session.commit()
+
+        with patch('app.services.notification_retention_service.time.sleep') as sleep:
+            report = NotificationRetentionService.purge(self.now)
+
+        self.assertEqual(report['expired'], 10)
+        self.assertEqual(report['read'], 3)
+        self.assertEqual(report['categories']['system'], 2)
+        self.assertEqual(report['broadcasts'], 1)
+        self.assertEqual(report['total'], 16)
+        # 10 expired rows in chunks of 4 pause twice between full chunks
+        self.assertEqual(sleep.call_count, 2)
+
+        self.assertEqual(Notification.query.count(), 4)
+        self.assertEqual(BroadcastNotification.query.count(), 0)
+        self.assertEqual(NotificationReceipt.query.count(), 0)
+
+        self.assertEqual(NotificationRetentionService.purge(self.now)['total'], 0)
+
+
+    def test_admin_cleanup_is_queued_for_the_worker(self):
+        admin = User(id='admin-1', email='a@example.com', password_hash='x',
+                     name='Admin', role=UserRole.ADMIN)
+        db.session.add(admin)
+        db.session.commit()
+        self._add(3, expires_at=self.now - timedelta(days=1))
+
+        token = create_access_token(identity='admin-1')
+        with patch.object(NotificationRetentionService, 'purge') as purge:
+            response = self.app.test_client().post(
+                '/api/notifications/cleanup', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 202)
+        purge.assert_not_called()
+        self.assertEqual(Notification.query.count(), 3)
+
+        # The outbox leaves the request to the retention loop, which claims it once
+        self.assertEqual(NotificationService.process_outbox(), 0)
+        self.assertEqual(NotificationRetentionService.claim_requests(), 1)
+        self.assertEqual(NotificationRetentionService.claim_requests(), 0)
+
+    def test_processed_events_are_purged_after_the_read_window(self):
+        days = timedelta(days=1)
+        for processed, processed_at in ((True, self.now - 31 * days),
+                                        (True, self.now - 31 * days),
+                                        (True, self.now - 2 * days),
+                                        (False, None)):
+            db.session.add(NotificationEvent(
+                event_type='quiz_published', entity_type='quiz', entity_id='quiz-1',
+                recipients={'user_ids': [], 'class_ids': []},
+                notification_template='quiz_published', created_at=self.now - 40 * days,
+                processed=processed, processed_at=processed_at))
+        db.session.commit()
+        NotificationRetentionService.request_purge()
+        db.session.commit()
+        NotificationRetentionService.claim_requests()
+
+        report = NotificationRetentionService.purge(self.now)
+        self.assertEqual((report['events'], report['total']), (2, 2))
+        # The recent, the pending and the just-claimed request are kept
+        self.assertEqual(NotificationEvent.query.count(), 3)
+        self.assertEqual(NotificationEvent.query.filter_by(processed=False).count(), 1)
+
+        report = NotificationRetentionService.purge(self.now + 31 * days)
+        self.assertEqual(report['events'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db, socketio, cache
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.notification import Notification
+from app.models.broadcast_notification import BroadcastNotification
+from app.services.notification_service import NotificationService
+from app.services.notification_retention_service import NotificationRetentionService
+
+
+class TestNotificationSync(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        user = User(id='student-1', email='s@example.com', password_hash='x',
+                    name='Student', role=UserRole.STUDENT)
+        db.session.add_all([Class(id='class-1', name='Math 101'), user,
+                            Student(id=user.id, user=user, registration_number='REG1',
+                                    class_id='class-1')])
+        db.session.commit()
+
+        self.client = self.app.test_client()
+        self.headers = {'Authorization': f"Bearer {create_access_token(identity='student-1')}"}
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _notify(self, title, created_at):
+        notification = Notification(user_id='student-1', type='t', title=title, message='m',
+                                    created_at=created_at, last_seen_at=created_at)
+        db.session.add(notification)
+        db.session.commit()
+        return notification.id
+
+    def _get(self, **params):
+        return self.client.get('/api/notifications/', query_string=params,
+                               headers=self.headers)
+
+    def test_since_cursor_returns_only_changes(self):
+        base = datetime.utcnow() - timedelta(minutes=10)
+        first = self._notify('first', base)
+        second = self._notify('second', base + timedelta(minutes=1))
+
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        cursor = response.get_json()['cursor']
+
+        unchanged = self._get(since=cursor).get_json()
+        self.assertEqual(unchanged['notifications'], [])
+        self.assertEqual(unchanged['deleted'], [])
+
+        third = self._notify('third', datetime.utcnow())
+        NotificationService.mark_as_read(first, 'student-1')
+        NotificationService.delete_notification(second, 'student-1')
+        NotificationService.insert_broadcasts(['class-1'], 'quiz_published', {
+            'quiz_title': 'Algebra', 'subject': 'Math'})
+        db.session.commit()
+
+        delta = self._get(since=cursor).get_json()
+        self.assertEqual(delta['deleted'], [second])
+        by_id = {n['id']: n for n in delta['notifications']}
+        self.assertTrue(by_id[first]['is_read'])
+        self.assertIn(third, by_id)
+        self.assertEqual(len(by_id), 3)
+        self.assertFalse(delta['has_more'])
+
+        # Nothing new after the returned cursor
+        caught_up = self._get(since=delta['cursor']).get_json()
+        self.assertEqual(caught_up['notifications'], [])
+
+    def test_unchanged_list_revalidates_with_304(self):
+        self._notify('first', datetime.utcnow())
+
+        response = self._get()
+        etag = response.headers['ETag']
+        self.assertTrue(etag)
+
+        not_modified = self.client.get('/api/notifications/',
+                                       headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.data, b'')
+
+        self._notify('second', datetime.utcnow())
+        modified = self.client.get('/api/notifications/',
+                                   headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(modified.status_code, 200)
+        self.assertEqual(len(modified.get_json()['notifications']), 2)
+
+    def test_limit_pages_through_new_items(self):
+        cursor = self._get().get_json()['cursor']
+        base = datetime.utcnow() - timedelta(minutes=1)
+        ids = [self._notify(f'n{i}', base + timedelta(seconds=i)) for i in range(5)]
+
+        page = self._get(since=cursor, limit=3).get_json()
+        self.assertTrue(page['has_more'])
+        self.assertEqual([n['id'] for n in page['notifications']], ids[:3])
+
+        page = self._get(since=page['cursor'], limit=3).get_json()
+        self.assertFalse(page['has_more'])
+        self.assertEqual([n['id'] for n in page['notifications']], ids[3:])
+
+    def test_malformed_cursor_is_rejected(self):
+        self.assertEqual(self._get(since='not-a-cursor').status_code, 400)
+
+
+    def test_purged_notifications_are_reported_deleted(self):
+        now = datetime.utcnow()
+        expiring = Notification(user_id='student-1', type='t', title='Expiring', message='m',
+                                created_at=now - timedelta(hours=2),
+                                expires_at=now + timedelta(minutes=1))
+        broadcast = BroadcastNotification(class_id='class-1', type='t', title='Class',
+                                          message='m', created_at=now - timedelta(hours=2),
+                                          expires_at=now + timedelta(minutes=1))
+        db.session.add_all([expiring, broadcast])
+        db.session.commit()
+        purged = sorted([expiring.id, broadcast.id])
+        kept = self._notify('Kept', now - timedelta(hours=1))
+        cursor = self._get().get_json()['cursor']
+
+        NotificationRetentionService.purge(now + timedelta(minutes=5))
+        body = self._get(since=cursor).get_json()
+        self.assertFalse(body['full'])
+        self.assertEqual(sorted(body['deleted']), purged)
+        self.assertNotIn(kept, body['deleted'])
+
+    def test_unread_only_sync_drops_read_items(self):
+        now = datetime.utcnow()
+        first = self._notify('First', now - timedelta(hours=2))
+        cursor = self._get(unread_only='true').get_json()['cursor']
+
+        NotificationService.mark_as_read(first, 'student-1')
+        later = Notification(user_id='student-1', type='t', title='Already read', message='m',
+                             is_read=True, read_at=now, created_at=now, last_seen_at=now)
+        db.session.add(later)
+        db.session.commit()
+
+        body = self._get(since=cursor, unread_only='true').get_json()
+        self.assertEqual(body['notifications'], [])
+        self.assertEqual(body['deleted'], [first])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db, socketio, cache
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.models.class_model import Class
+from app.services.notification_service import NotificationService
+from app.services.unread_counter_service import UnreadCounterService
+
+
+class TestUnreadCounters(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        # One process here, so the default simple cache is safe to count in
+        self.app.config['NOTIFICATION_UNREAD_COUNT_CACHE'] = True
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        db.session.add(Class(id='class-1', name='Math 101'))
+        teacher = User(id='teacher-1', email='t@example.com', password_hash='x',
+                       name='Teacher', role=UserRole.TEACHER)
+        db.session.add(teacher)
+        for i in range(2):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([user, Student(id=user.id, user=user,
+                                              registration_number=f'REG{i}',
+                                              class_id='class-1')])
+        db.session.commit()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _unread_emits(self):
+        return [(c.kwargs['room'], c.args[1]) for c in socketio.emit.call_args_list
+                if c.args[0] == 'unread_count']
+
+    def test_cached_count_is_served_without_recounting(self):
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 0)
+
+        with patch.object(NotificationService, 'count_unread') as count_unread:
+            self.assertEqual(NotificationService.get_unread_count('student-0'), 0)
+        count_unread.assert_not_called()
+
+    def test_counters_follow_fan_out_and_reads(self):
+        NotificationService.get_unread_count('student-0')
+        socketio.emit.reset_mock()
+
+        payloads = NotificationService.create_notifications_bulk(
+            ['student-0', 'student-1'], 'attempt_graded',
+            {'quiz_title': 'Algebra', 'score': 5, 'total_marks': 10, 'percentage': 50})
+
+        # Only the live counter is bumped and pushed; the other recounts on read
+        self.assertEqual(self._unread_emits(), [('student-0', {'unread_count': 1})])
+        self.assertEqual(NotificationService.get_unread_count('student-1'), 1)
+
+        NotificationService.insert_broadcasts(['class-1'], 'quiz_published', {
+            'quiz_title': 'Algebra', 'subject': 'Math', 'quiz_id': 'quiz-1'})
+        db.session.commit()
+        broadcast = NotificationService.get_user_notifications('student-0')[0]
+        NotificationService.emit_notifications([broadcast])
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 2)
+        self.assertEqual(NotificationService.get_unread_count('student-1'), 2)
+
+        socketio.emit.reset_mock()
+        NotificationService.mark_as_read(payloads[0]['id'], 'student-0')
+        NotificationService.mark_as_read(payloads[0]['id'], 'student-0')
+        self.assertEqual(self._unread_emits(), [('student-0', {'unread_count': 1})])
+
+        NotificationService.delete_notification(broadcast['id'], 'student-0')
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 0)
+
+        NotificationService.mark_all_as_read('student-1')
+        self.assertEqual(self._unread_emits()[-1], ('student-1', {'unread_count': 0}))
+        with patch.object(NotificationService, 'count_unread') as count_unread:
+            self.assertEqual(NotificationService.get_unread_count('student-1'), 0)
+        count_unread.assert_not_called()
+
+        # The counters agree with the tables
+        for user_id in ('student-0', 'student-1'):
+            self.assertEqual(NotificationService.get_unread_count(user_id),
+                             NotificationService.count_unread(user_id))
+
+    def test_expired_counters_are_not_recreated(self):
+        NotificationService.get_unread_count('student-0')
+        cache.delete('notifications:unread:student-0')
+
+        self.assertEqual(UnreadCounterService.increment_many({'student-0': 2}), {})
+        self.assertIsNone(UnreadCounterService.decrement('student-0'))
+        self.assertIsNone(cache.get('notifications:unread:student-0'))
+
+    def test_counters_are_off_without_a_shared_cache(self):
+        self.app.config['NOTIFICATION_UNREAD_COUNT_CACHE'] = False
+        self.assertFalse(create_app('testing').config['NOTIFICATION_UNREAD_COUNT_CACHE'])
+
+        NotificationService.get_unread_count('student-0')
+        self.assertIsNone(cache.get('notifications:unread:student-0'))
+        NotificationService.create_notifications_bulk(
+            ['student-0'], 'attempt_graded',
+            {'quiz_title': 'Algebra', 'score': 5, 'total_marks': 10, 'percentage': 50})
+        self.assertEqual(self._unread_emits(), [])
+        self.assertEqual(NotificationService.get_unread_count('student-0'), 1)
+
+    def test_bulk_endpoint_bumps_and_pushes_counts(self):
+        NotificationService.get_unread_count('student-0')
+        socketio.emit.reset_mock()
+
+        token = create_access_token(identity='teacher-1')
+        response = self.app.test_client().post(
+            '/api/notifications/bulk', headers={'Authorization': f'Bearer {token}'},
+            json={'user_ids': ['student-0', 'student-1'], 'type': 'announcement',
+                  'title': 'Reminder', 'message': 'Bring a calculator'})
+        self.assertEqual(response.status_code, 201)
+
+        rooms = [c.kwargs['room'] for c in socketio.emit.call_args_list
+                 if c.args[0] == 'new_notification']
+        self.assertEqual(sorted(rooms), ['student-0', 'student-1'])
+        self.assertEqual(self._unread_emits(), [('student-0', {'unread_count': 1})])
+        with patch.object(NotificationService, 'count_unread') as count_unread:
+            self.assertEqual(NotificationService.get_unread_count('student-0'), 1)
+        count_unread.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
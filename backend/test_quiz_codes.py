@@ -0,0 +1,145 @@
+import os
+import re
+import unittest
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db, cache
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz, QuizStatus
+from app.modules.quiz.quiz_service import QuizService
+from app.services import quiz_code_service
+from app.services.quiz_code_service import QuizCodeService, CODE_SPACE
+
+
+class TestQuizCodes(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['QUIZ_CODE_MAX_FAILURES_PER_USER'] = 3
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+        quiz_code_service._local_codes.clear()
+
+        teacher = User(id='teacher-1', email='t@example.com', password_hash='x',
+                       name='Teacher', role=UserRole.TEACHER)
+        student = User(id='student-1', email='s@example.com', password_hash='x',
+                       name='Student', role=UserRole.STUDENT)
+        db.session.add_all([
+            teacher, Teacher(id=teacher.id, user=teacher),
+            student, Student(id=student.id, user=student, registration_number='REG1'),
+            Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                 time_limit_minutes=30, created_by='teacher-1', status=QuizStatus.PUBLISHED),
+            Quiz(id='quiz-2', title='Draft', subject='Math', access_code='DRAFT1',
+                 time_limit_minutes=30, created_by='teacher-1')
+        ])
+        db.session.commit()
+        quiz_code_service._local_codes.clear()
+
+    def tearDown(self):
+        cache.clear()
+        quiz_code_service._local_codes.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count_statements(self, fn):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            result = fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return result, statements
+
+    def _get(self, code):
+        token = create_access_token(identity='student-1')
+        return self.app.test_client().get(f'/api/quizzes/access-code/{code}',
+                                          headers={'Authorization': f'Bearer {token}'})
+
+    def test_committed_quizzes_resolve_without_queries(self):
+        entry, statements = self._count_statements(lambda: QuizCodeService.lookup(' abc123 '))
+        self.assertEqual(entry, {'quiz_id': 'quiz-1', 'status': 'published'})
+        self.assertEqual(statements, [])
+
+        # The shared cache alone is enough once the local entry is gone
+        quiz_code_service._local_codes.clear()
+        _, statements = self._count_statements(lambda: QuizCodeService.lookup('ABC123'))
+        self.assertEqual(statements, [])
+
+        with self.assertRaisesRegex(ValueError, 'not available'):
+            QuizService.get_quiz_by_access_code('DRAFT1')
+
+    def test_unknown_codes_are_cached_as_misses(self):
+        self.assertIsNone(QuizCodeService.lookup('NOPE99'))
+        quiz_code_service._local_codes.clear()
+        result, statements = self._count_statements(lambda: QuizCodeService.lookup('NOPE99'))
+        self.assertIsNone(result)
+        self.assertEqual(statements, [])
+
+        # A quiz created with the code replaces the cached miss on commit
+        db.session.add(Quiz(id='quiz-3', title='New', subject='Math', access_code='NOPE99',
+                            time_limit_minutes=30, created_by='teacher-1'))
+        db.session.commit()
+        self.assertEqual(QuizCodeService.lookup('NOPE99')['quiz_id'], 'quiz-3')
+
+    def test_code_and_status_changes_follow_commits(self):
+        quiz = db.session.get(Quiz, 'quiz-1')
+        quiz.access_code = 'XYZ789'
+        quiz.status = QuizStatus.ARCHIVED
+        db.session.commit()
+        self.assertIsNone(QuizCodeService.lookup('ABC123'))
+        self.assertEqual(QuizCodeService.lookup('XYZ789'),
+                         {'quiz_id': 'quiz-1', 'status': 'archived'})
+
+        quiz.access_code = 'ROLLED'
+        db.session.flush()
+        db.session.rollback()
+        self.assertIsNone(QuizCodeService.lookup('ROLLED'))
+
+        db.session.delete(db.session.get(Quiz, 'quiz-1'))
+        db.session.commit()
+        self.assertIsNone(QuizCodeService.lookup('XYZ789'))
+
+    def test_wrong_guesses_are_throttled(self):
+        self.assertEqual(self._get('ABC123').status_code, 200)
+        for _ in range(3):
+            self.assertEqual(self._get('WRONG1').status_code, 404)
+
+        response = self._get('ABC123')
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(QuizCodeService.is_throttled('student-2', None))
+
+    def test_generated_codes_are_unique_without_lookups(self):
+        codes = {QuizCodeService.encode(sequence) for sequence in range(1, 20001)}
+        self.assertEqual(len(codes), 20000)
+        self.assertTrue(all(re.fullmatch(r'[0-9A-Z]{6}', code) for code in codes))
+        self.assertEqual(QuizCodeService.encode(5), QuizCodeService.encode(5 + CODE_SPACE))
+
+        quiz, statements = self._count_statements(lambda: QuizService.create_quiz(
+            'teacher-1', {'title': 'Geometry', 'subject': 'Math', 'time_limit_minutes': 20}, []))
+        self.assertFalse([s for s in statements if s.lstrip().upper().startswith('SELECT')
+                          and 'quizzes' in s and 'access_code' in s])
+        self.assertEqual(QuizCodeService.lookup(quiz.access_code)['quiz_id'], quiz.id)
+
+        token = create_access_token(identity='teacher-1')
+        response = self.app.test_client().post(
+            '/api/teacher/quizzes/quiz-1/access-code',
+            headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        new_code = response.get_json()['access_code']
+        self.assertNotIn(new_code, ('ABC123', quiz.access_code))
+        self.assertEqual(QuizCodeService.lookup(new_code)['quiz_id'], 'quiz-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import unittest
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db, socketio
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.student_answer import StudentAnswer
+from app.models.question import Question, QuestionType
+from app.models.quiz_question import QuizQuestion
+from app.models.violation import Violation, ViolationType
+
+
+class TestQuizMonitor(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        for teacher_id in ('teacher-1', 'teacher-2'):
+            user = User(id=teacher_id, email=f'{teacher_id}@example.com', password_hash='x',
+                        name=teacher_id, role=UserRole.TEACHER)
+            db.session.add_all([user, Teacher(id=teacher_id, user=user)])
+        for i in range(2):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([user, Student(id=user.id, user=user,
+                                              registration_number=f'REG{i}')])
+        db.session.add_all([
+            Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                 time_limit_minutes=30, created_by='teacher-1'),
+            Question(id='question-1', text='1 + 1?', type=QuestionType.DESCRIPTIVE,
+                     marks=1, created_by='teacher-1'),
+            QuizAttempt(id='attempt-0', quiz_id='quiz-1', student_id='student-0',
+                        progress=50, current_question_index=1)
+        ])
+        db.session.add(StudentAnswer(attempt_id='attempt-0', question_id='question-1',
+                                     answer_text='2'))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _connect(self, user_id):
+        token = create_access_token(identity=user_id)
+        return socketio.test_client(self.app, auth={'token': token})
+
+    def _events(self, client, name):
+        return [event['args'][0] for event in client.get_received() if event['name'] == name]
+
+    def test_owner_gets_snapshot_then_deltas(self):
+        client = self._connect('teacher-1')
+        ack = client.emit('join_quiz_monitor', {'quiz_id': 'quiz-1'}, callback=True)
+        self.assertEqual(ack, {'success': True})
+
+        snapshot = self._events(client, 'quiz_monitor_snapshot')[0]
+        self.assertEqual(snapshot['attempts'], [{
+            'attempt_id': 'attempt-0', 'student_id': 'student-0', 'student_name': 'Student 0',
+            'registration_number': 'REG0', 'status': 'in_progress', 'progress': 50,
+            'current_question_index': 1, 'violations': 0, 'answered_questions': 1,
+            'started_at': snapshot['attempts'][0]['started_at'], 'last_activity_at': None
+        }])
+
+        db.session.add(QuizAttempt(id='attempt-1', quiz_id='quiz-1', student_id='student-1',
+                                   progress=0, current_question_index=0))
+        db.session.commit()
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        attempt.total_violations = 1
+        attempt.progress = 75
+        db.session.commit()
+        # Untracked fields do not produce deltas
+        attempt.user_agent = 'Firefox'
+        db.session.commit()
+
+        deltas = self._events(client, 'attempt_delta')
+        self.assertEqual(len(deltas), 2)
+        self.assertTrue(deltas[0]['new'])
+        self.assertEqual(deltas[0]['student_name'], 'Student 1')
+        self.assertEqual(deltas[1], {
+            'attempt_id': 'attempt-0', 'student_id': 'student-0', 'quiz_id': 'quiz-1',
+            'status': 'in_progress', 'progress': 75, 'current_question_index': 1,
+            'violations': 1})
+
+        client.emit('leave_quiz_monitor', {'quiz_id': 'quiz-1'}, callback=True)
+        attempt.status = AttemptStatus.SUBMITTED
+        db.session.commit()
+        self.assertEqual(self._events(client, 'attempt_delta'), [])
+        client.disconnect()
+
+    def test_other_teacher_is_refused(self):
+        client = self._connect('teacher-2')
+        ack = client.emit('join_quiz_monitor', {'quiz_id': 'quiz-1'}, callback=True)
+        self.assertIn('error', ack)
+
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        attempt.progress = 100
+        db.session.commit()
+        self.assertEqual(self._events(client, 'attempt_delta'), [])
+        self.assertEqual(self._events(client, 'quiz_monitor_snapshot'), [])
+        client.disconnect()
+
+    def test_attempt_list_is_a_fixed_number_of_queries(self):
+        db.session.add_all([
+            QuizQuestion(quiz_id='quiz-1', question_id='question-1', order_index=0),
+            QuizAttempt(id='attempt-1', quiz_id='quiz-1', student_id='student-1'),
+            Violation(attempt_id='attempt-0', violation_type=ViolationType.TAB_SWITCH),
+            Violation(attempt_id='attempt-0', violation_type=ViolationType.COPY_ATTEMPT),
+            StudentAnswer(attempt_id='attempt-1', question_id='question-1', answer_text='')
+        ])
+        db.session.commit()
+        db.session.expire_all()
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        token = create_access_token(identity='teacher-1')
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.app.test_client().get(
+                '/api/attempts/quiz/quiz-1', headers={'Authorization': f'Bearer {token}'})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        self.assertEqual(response.status_code, 200)
+        # One of them is the current user lookup in the decorator
+        self.assertEqual(len(statements), 4)
+        data = response.get_json()
+        self.assertEqual(data['total'], 2)
+        attempts = {attempt['id']: attempt for attempt in data['attempts']}
+        self.assertEqual(
+            {attempt_id: (a['student_name'], a['answered_questions'], a['violations'],
+                          a['total_questions'], a['current_question_number'])
+             for attempt_id, a in attempts.items()},
+            {'attempt-0': ('Student 0', 1, 2, 1, 2), 'attempt-1': ('Student 1', 0, 0, 1, 1)})
+        self.assertNotIn('answers', attempts['attempt-0'])
+
+        token = create_access_token(identity='teacher-2')
+        response = self.app.test_client().get(
+            '/api/attempts/quiz/quiz-1', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app, db
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz
+from app.models.question import Question, QuestionType
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.student_answer import StudentAnswer
+from app.modules.reports.report_card_service import ReportCardService
+
+
+class TestReportCards(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.cache_dir = tempfile.mkdtemp()
+        self.app.config['REPORT_CARD_CACHE_DIR'] = self.cache_dir
+        self.app.config['REPORT_RENDER_WORKERS'] = 2
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        teacher_user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                            name='Teacher', role=UserRole.TEACHER)
+        self.teacher_user = teacher_user
+        teacher = Teacher(id='teacher-1', user=teacher_user)
+        class_obj = Class(id='class-1', name='Math 101')
+        quiz = Quiz(id='quiz-1', title='Algebra <1>', subject='Math', access_code='ABC123',
+                    time_limit_minutes=30, created_by='teacher-1')
+        question = Question(id='question-1', text='Explain x < y', type=QuestionType.DESCRIPTIVE,
+                            marks=5, created_by='teacher-1')
+        db.session.add_all([teacher_user, teacher, class_obj, quiz, question])
+
+        for i in range(3):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            student = Student(id=user.id, user=user, registration_number=f'REG{i}',
+                              class_id='class-1')
+            attempt = QuizAttempt(id=f'attempt-{i}', quiz_id='quiz-1', student_id=user.id,
+                                  status=AttemptStatus.GRADED, score=i, total_marks=5,
+                                  percentage=20 * i, passed=i > 1)
+            attempt.answers.append(StudentAnswer(question_id='question-1', answer_text='...',
+                                                 marks_awarded=i, feedback='Good & clear'))
+            db.session.add_all([user, student, attempt])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_single_report_card_is_cached_per_grade_version(self):
+        path = ReportCardService.get_report_card('attempt-0', self.teacher_user)
+        with open(path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'%PDF'))
+        self.assertEqual(ReportCardService.get_report_card('attempt-0', self.teacher_user), path)
+
+        answer = StudentAnswer.query.filter_by(attempt_id='attempt-0').first()
+        answer.marks_awarded = 4
+        answer.feedback = 'Regraded'
+        db.session.commit()
+
+        regraded = ReportCardService.get_report_card('attempt-0', self.teacher_user)
+        self.assertNotEqual(regraded, path)
+        self.assertFalse(os.path.exists(path))
+
+    def test_class_batch_streams_zip(self):
+        body = b''.join(ReportCardService.stream_class_report_cards('class-1', 'quiz-1'))
+
+        archive = zipfile.ZipFile(io.BytesIO(body))
+        self.assertEqual(sorted(archive.namelist()),
+                         ['REG0_attempt1.pdf', 'REG1_attempt1.pdf', 'REG2_attempt1.pdf'])
+        for name in archive.namelist():
+            self.assertTrue(archive.read(name).startswith(b'%PDF'))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+        # Second download is served entirely from the cache
+        again = b''.join(ReportCardService.stream_class_report_cards('class-1', 'quiz-1'))
+        self.assertEqual(len(zipfile.ZipFile(io.BytesIO(again)).namelist()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
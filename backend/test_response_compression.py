@@ -0,0 +1,202 @@
+import gzip
+import json
+import os
+import unittest
+from unittest import mock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db, cache
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.quiz import Quiz, QuizStatus
+from app.models.question import Question, QuestionType
+from app.models.quiz_question import QuizQuestion
+from app.models.notification import Notification
+from app.utils import compression
+
+
+class TestResponseCompression(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+        self.app.config['VERSIONED_RESPONSES'] = True
+
+        teacher = User(id='teacher-1', email='t@example.com', password_hash='x',
+                       name='Teacher', role=UserRole.TEACHER)
+        student = User(id='student-1', email='s@example.com', password_hash='x',
+                       name='Student', role=UserRole.STUDENT)
+        db.session.add_all([
+            teacher, Teacher(id=teacher.id, user=teacher),
+            Class(id='class-1', name='7A', created_by='teacher-1'),
+            student, Student(id=student.id, user=student, registration_number='REG1',
+                             class_id='class-1')
+        ])
+        quiz = Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                    time_limit_minutes=30, created_by='teacher-1', status=QuizStatus.PUBLISHED)
+        quiz.classes = [db.session.get(Class, 'class-1')]
+        db.session.add(quiz)
+        for i in range(20):
+            db.session.add_all([
+                Question(id=f'question-{i}', text=f'Question {i}: ' + 'Solve for x. ' * 20,
+                         type=QuestionType.DESCRIPTIVE, marks=2, topic='Algebra',
+                         created_by='teacher-1'),
+                QuizQuestion(quiz_id='quiz-1', question_id=f'question-{i}', order_index=i)
+            ])
+        db.session.commit()
+
+    def tearDown(self):
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _get(self, url, user='teacher-1', **headers):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        headers['Authorization'] = f'Bearer {create_access_token(identity=user)}'
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.app.test_client().get(url, headers=headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return response, statements
+
+    def test_quiz_is_compressed_and_revalidated_without_rendering(self):
+        url = '/api/quizzes/quiz-1?include_questions=true'
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        etag, weak = response.get_etag()
+        self.assertFalse(weak)
+        self.assertTrue(etag.endswith('-gzip'))
+        quiz = json.loads(gzip.decompress(response.get_data()))['quiz']
+        self.assertEqual(len(quiz['questions']), 20)
+        self.assertEqual(quiz['class_ids'], ['class-1'])
+
+        # Only the permission projection runs; the quiz is never loaded
+        response, statements = self._get(url, **{'Accept-Encoding': 'gzip',
+                                                 'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+        self.assertFalse([s for s in statements if 'quiz_questions' in s])
+
+        # Students get the same cached bytes, from the cache
+        with mock.patch.object(compression, 'compress', wraps=compression.compress) as encode:
+            response, statements = self._get(url, user='student-1',
+                                             **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag()[0], etag)
+        encode.assert_not_called()
+        self.assertFalse([s for s in statements if 'questions' in s])
+
+        # Identity clients get their own representation and tag
+        response, _ = self._get(url)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.get_etag()[0], etag[:-len('-gzip')])
+        self.assertEqual(len(response.get_json()['quiz']['questions']), 20)
+
+    def test_committed_changes_change_the_tag(self):
+        url = '/api/quizzes/quiz-1?include_questions=true'
+        etag = self._get(url, **{'Accept-Encoding': 'gzip'})[0].get_etag()[0]
+
+        db.session.get(Question, 'question-3').text = 'Rewritten'
+        db.session.commit()
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip',
+                                        'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0], etag)
+        quiz = json.loads(gzip.decompress(response.get_data()))['quiz']
+        self.assertIn('Rewritten', [q['text'] for q in quiz['questions']])
+
+        # Query parameters are part of the version
+        self.assertNotEqual(self._get('/api/quizzes/quiz-1')[0].get_etag()[0],
+                            self._get(url)[0].get_etag()[0])
+
+    def test_question_bank_versions_on_the_teachers_questions(self):
+        url = '/api/quizzes/questions?per_page=50'
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        etag = response.get_etag()[0]
+
+        response, statements = self._get(url, **{'Accept-Encoding': 'gzip',
+                                                 'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([s for s in statements if 'LIMIT' in s])
+
+        db.session.add(Question(id='question-new', text='New', type=QuestionType.DESCRIPTIVE,
+                                marks=1, created_by='teacher-1'))
+        db.session.commit()
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip',
+                                        'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(gzip.decompress(response.get_data()))['total'], 21)
+
+    def test_small_responses_are_sent_as_is(self):
+        response, _ = self._get('/api/quizzes/questions?fields=topic&per_page=1',
+                                **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertFalse(response.get_etag()[0].endswith('-gzip'))
+
+    def test_small_versioned_responses_revalidate_on_the_plain_tag(self):
+        url = '/api/quizzes/questions?fields=topic&per_page=1'
+        etag = self._get(url, **{'Accept-Encoding': 'gzip'})[0].get_etag()[0]
+
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip',
+                                        'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag()[0], etag)
+
+    def test_quiz_is_tagged_by_its_body_without_a_shared_cache(self):
+        self.app.config['VERSIONED_RESPONSES'] = False
+        url = '/api/quizzes/quiz-1?include_questions=true'
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        etag = response.get_etag()[0]
+        self.assertTrue(etag.endswith('-gzip'))
+        self.assertFalse([key for key in cache.cache._cache if key.startswith('responses:')])
+
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip',
+                                        'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+
+        # Another process's commit shows up without any shared generation
+        db.session.get(Question, 'question-3').text = 'Rewritten'
+        db.session.commit()
+        cache.clear()
+        response, _ = self._get(url, **{'Accept-Encoding': 'gzip',
+                                        'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_body_tags_are_checked_against_the_encoded_tag(self):
+        for i in range(10):
+            db.session.add(Notification(user_id='student-1', type='t', title=f'Title {i}',
+                                        message='m' * 200))
+        db.session.commit()
+
+        response, _ = self._get('/api/notifications/', user='student-1',
+                                **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        etag = response.get_etag()[0]
+        self.assertTrue(etag.endswith('-gzip'))
+
+        response, _ = self._get('/api/notifications/', user='student-1',
+                                **{'Accept-Encoding': 'gzip', 'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag()[0], etag)
+
+
+if __name__ == '__main__':
+    unittest.main()
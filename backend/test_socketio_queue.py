@@ -0,0 +1,180 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app
+from app.utils.realtime import FakeRedisManager, create_client_manager
+
+try:
+    import fakeredis
+    import socketio as python_socketio
+    import redis
+    import websocket  # noqa: F401  (websocket-client, used by the test client)
+except ImportError:
+    fakeredis = None
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+EMIT_COUNT = 500
+
+SERVER_SCRIPT = """
+from app import create_app, db, socketio
+app = create_app('testing')
+with app.app_context():
+    db.create_all()
+socketio.run(app, host='127.0.0.1', port={port}, debug=False, use_reloader=False,
+             allow_unsafe_werkzeug=True)
+"""
+
+EMITTER_SCRIPT = """
+import time
+from app import create_app, socketio
+app = create_app('testing')
+started = time.perf_counter()
+for seq in range({count}):
+    socketio.emit('new_notification', {{'id': str(seq), 'seq': seq}}, room='student-1')
+print(time.perf_counter() - started)
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+@unittest.skipUnless(fakeredis, 'fakeredis is required')
+class TestClientManagerSelection(unittest.TestCase):
+    def test_queue_url_selects_manager(self):
+        self.assertIsNone(create_client_manager(None, 'quizmaster'))
+        self.assertIsInstance(create_client_manager('memory://', 'quizmaster'),
+                              FakeRedisManager)
+        redis_manager = create_client_manager('redis://localhost:6379/0', 'quizmaster',
+                                              write_only=True)
+        self.assertIsInstance(redis_manager, python_socketio.RedisManager)
+        self.assertTrue(redis_manager.write_only)
+
+    def test_write_only_emitter_publishes_to_memory_queue(self):
+        emitter = create_client_manager('memory://', 'quizmaster', write_only=True)
+        emitter._redis_connect()
+        pubsub = emitter.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe('quizmaster')
+
+        emitter.emit('new_notification', {'id': 'n-1'}, room='student-1')
+
+        # The first read consumes the subscribe confirmation
+        message = pubsub.get_message(timeout=1) or pubsub.get_message(timeout=1)
+        self.assertIn(b'student-1', message['data'])
+        self.assertIn(b'n-1', message['data'])
+
+
+@unittest.skipUnless(fakeredis, 'fakeredis and websocket-client are required')
+class TestCrossWorkerDelivery(unittest.TestCase):
+    """Two web workers and a write-only emitter share one Redis channel"""
+
+    def setUp(self):
+        redis_port = _free_port()
+        self.redis = fakeredis.TcpFakeServer(('127.0.0.1', redis_port))
+        threading.Thread(target=self.redis.serve_forever, daemon=True).start()
+        self.redis_client = redis.Redis(port=redis_port)
+
+        self.env = dict(os.environ,
+                        DATABASE_URL='sqlite://',
+                        SOCKETIO_MESSAGE_QUEUE=f'redis://127.0.0.1:{redis_port}/0',
+                        SOCKETIO_ASYNC_MODE='threading')
+        self.processes = []
+        self.clients = []
+
+        app = create_app('testing')
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            self.token = create_access_token(identity='student-1')
+
+    def tearDown(self):
+        for client in self.clients:
+            client.disconnect()
+        for process in self.processes:
+            process.terminate()
+            process.wait(timeout=10)
+        self.redis_client.close()
+        self.redis.shutdown()
+        self.redis.server_close()
+
+    def _start_worker(self):
+        port = _free_port()
+        self.processes.append(subprocess.Popen(
+            [sys.executable, '-c', SERVER_SCRIPT.format(port=port)],
+            cwd=BACKEND_DIR, env=self.env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        _wait_for_port(port)
+        return port
+
+    def _wait_for_subscribers(self, count, timeout=10):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            channels = dict(self.redis_client.pubsub_numsub('quizmaster-socketio'))
+            if channels.get(b'quizmaster-socketio', 0) >= count:
+                return
+            time.sleep(0.05)
+        self.fail(f'{count} workers did not subscribe to the message queue')
+
+    def _connect(self, port):
+        received = []
+        client = python_socketio.Client()
+        client.on('new_notification', received.append)
+        client.connect(f'http://127.0.0.1:{port}', auth={'token': self.token},
+                       transports=['websocket'], wait_timeout=10)
+        self.clients.append(client)
+        return received
+
+    def test_emits_reach_clients_on_every_worker(self):
+        ports = [self._start_worker(), self._start_worker()]
+        inboxes = [self._connect(port) for port in ports]
+        self._wait_for_subscribers(len(ports))
+
+        started = time.perf_counter()
+        emitter = subprocess.run(
+            [sys.executable, '-c', EMITTER_SCRIPT.format(count=EMIT_COUNT)],
+            cwd=BACKEND_DIR, env=dict(self.env, SOCKETIO_WRITE_ONLY='True'),
+            capture_output=True, text=True, timeout=60)
+        self.assertEqual(emitter.returncode, 0, emitter.stderr)
+        publish_seconds = float(emitter.stdout.strip().splitlines()[-1])
+
+        deadline = time.time() + 30
+        while time.time() < deadline and any(len(i) < EMIT_COUNT for i in inboxes):
+            time.sleep(0.05)
+        delivered_seconds = time.perf_counter() - started
+
+        print(f'\npublished {EMIT_COUNT} emits in {publish_seconds * 1000:.0f} ms '
+              f'({EMIT_COUNT / publish_seconds:.0f}/s); delivered to clients on '
+              f'{len(ports)} workers {delivered_seconds:.2f} s after launching the emitter')
+
+        for inbox in inboxes:
+            self.assertEqual([m['seq'] for m in inbox], list(range(EMIT_COUNT)))
+
+    def test_connection_requires_token(self):
+        port = self._start_worker()
+        client = python_socketio.Client()
+        with self.assertRaises(python_socketio.exceptions.ConnectionError):
+            client.connect(f'http://127.0.0.1:{port}', transports=['websocket'],
+                           wait_timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import unittest
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.class_model import Class
+from app.models.quiz import Quiz
+from app.models.question import Question, QuestionType
+from app.models.quiz_question import QuizQuestion
+from app.utils.serializers import QUIZ_PLAN
+
+
+class TestSparseFields(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                    name='Teacher', role=UserRole.TEACHER)
+        db.session.add_all([user, Teacher(id=user.id, user=user),
+                            Class(id='class-1', name='7A', created_by='teacher-1')])
+        for i in range(3):
+            quiz = Quiz(id=f'quiz-{i}', title=f'Quiz {i}', subject='Math',
+                        access_code=f'CODE0{i}', time_limit_minutes=30, created_by='teacher-1')
+            quiz.classes = [db.session.get(Class, 'class-1')]
+            db.session.add_all([
+                quiz,
+                Question(id=f'question-{i}', text='x' * 500, type=QuestionType.DESCRIPTIVE,
+                         marks=2, topic='Algebra', created_by='teacher-1'),
+                QuizQuestion(quiz_id=quiz.id, question_id=f'question-{i}', order_index=0)
+            ])
+        db.session.commit()
+        db.session.expire_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _get(self, url):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        token = create_access_token(identity='teacher-1')
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.app.test_client().get(
+                url, headers={'Authorization': f'Bearer {token}'})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return response, statements
+
+    def test_default_quiz_listing_matches_model_fields(self):
+        response, statements = self._get('/api/quizzes/')
+        self.assertEqual(response.status_code, 200)
+        quiz = response.get_json()['quizzes'][0]
+
+        expected = db.session.get(Quiz, quiz['id']).to_dict(include_classes=True)
+        expected['classes'] = [{'id': 'class-1', 'name': '7A', 'section': None,
+                                'academic_year': None}]
+        self.assertEqual(quiz, expected)
+        # User, count, page, then one load each for questions and classes
+        self.assertEqual(len(statements), 5)
+
+    def test_sparse_fieldset_loads_only_requested_columns(self):
+        response, statements = self._get('/api/quizzes/?fields=title,total_marks')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['quizzes'][0].keys(),
+                         {'id', 'title', 'total_marks'})
+        self.assertEqual(response.get_json()['quizzes'][0]['total_marks'], 2)
+        page_query = [s for s in statements if 'FROM quizzes' in s and 'LIMIT' in s][0]
+        self.assertNotIn('description', page_query)
+        self.assertFalse([s for s in statements if 'quiz_classes' in s])
+        self.assertEqual(QUIZ_PLAN.select('total_marks, title'),
+                         QUIZ_PLAN.select('title,total_marks,id'))
+
+        response, statements = self._get('/api/quizzes/questions?fields=topic,marks')
+        self.assertEqual(response.get_json()['questions'][0],
+                         {'id': 'question-2', 'topic': 'Algebra', 'marks': 2})
+        page_query = [s for s in statements if 'FROM questions' in s and 'LIMIT' in s][0]
+        self.assertNotIn('questions.text', page_query)
+
+        response, _ = self._get('/api/quizzes/?fields=title,secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.get_json()['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db, cache
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.violation import Violation, ViolationType
+from app.modules.reports import violation_analytics_service
+from app.modules.reports.violation_analytics_service import ViolationAnalyticsService
+
+
+class TestViolationAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+
+        for teacher_id in ('teacher-1', 'teacher-2'):
+            user = User(id=teacher_id, email=f'{teacher_id}@example.com', password_hash='x',
+                        name=teacher_id, role=UserRole.TEACHER)
+            db.session.add_all([user, Teacher(id=teacher_id, user=user)])
+        db.session.add(Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                            time_limit_minutes=30, created_by='teacher-1'))
+        for i in range(3):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([
+                user, Student(id=user.id, user=user, registration_number=f'REG{i}'),
+                QuizAttempt(id=f'attempt-{i}', quiz_id='quiz-1', student_id=user.id)
+            ])
+
+        self.start = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(minutes=10)
+        self._add('attempt-0', ViolationType.TAB_SWITCH, 0, self.start)
+        self._add('attempt-0', ViolationType.TAB_SWITCH, 0, self.start + timedelta(seconds=30))
+        self._add('attempt-0', ViolationType.COPY_ATTEMPT, 2, self.start + timedelta(minutes=1))
+        self._add('attempt-1', ViolationType.TAB_SWITCH, None, self.start + timedelta(minutes=3))
+        db.session.commit()
+
+    def tearDown(self):
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add(self, attempt_id, violation_type, question_index, detected_at):
+        db.session.add(Violation(attempt_id=attempt_id, violation_type=violation_type,
+                                 question_index=question_index, detected_at=detected_at))
+
+    def _get(self, teacher_id='teacher-1'):
+        token = create_access_token(identity=teacher_id)
+        return self.app.test_client().get(
+            '/api/reports/quizzes/quiz-1/violation-analytics',
+            headers={'Authorization': f'Bearer {token}'})
+
+    def test_quiz_analytics(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+
+        self.assertEqual(data['total_violations'], 4)
+        self.assertEqual(data['heatmap'], [
+            {'violation_type': 'copy_attempt', 'question_index': 2, 'count': 1},
+            {'violation_type': 'tab_switch', 'question_index': None, 'count': 1},
+            {'violation_type': 'tab_switch', 'question_index': 0, 'count': 2}
+        ])
+        minute = self.start.strftime('%Y-%m-%dT%H:%M')
+        self.assertEqual(data['timeline'][0], {'minute': minute, 'count': 2})
+        self.assertEqual([bucket['count'] for bucket in data['timeline']], [2, 1, 1])
+        self.assertEqual(data['window']['start'], minute)
+        self.assertEqual([(o['student_id'], o['violations']) for o in data['top_offenders']],
+                         [('student-0', 3), ('student-1', 1)])
+        self.assertEqual(data['top_offenders'][0]['student_name'], 'Student 0')
+
+        self.assertEqual(self._get('teacher-2').status_code, 403)
+
+    def test_new_violations_are_merged_incrementally(self):
+        self.app.config['VIOLATION_ANALYTICS_SETTLE_SECONDS'] = 0
+        ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+
+        now = datetime.utcnow()
+        self._add('attempt-2', ViolationType.RIGHT_CLICK, 1, now)
+        self._add('attempt-1', ViolationType.TAB_SWITCH, None, now)
+        db.session.commit()
+
+        with patch.object(ViolationAnalyticsService, '_merge',
+                          wraps=ViolationAnalyticsService._merge) as merge:
+            incremental = ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+        self.assertIsNotNone(merge.call_args_list[0].args[2])
+
+        ViolationAnalyticsService.invalidate('quiz-1')
+        rebuilt = ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+
+        self.assertEqual(incremental['total_violations'], 6)
+        for field in ('heatmap', 'timeline', 'top_offenders', 'total_violations'):
+            self.assertEqual(incremental[field], rebuilt[field])
+        self.assertEqual([(o['student_id'], o['violations']) for o in rebuilt['top_offenders']],
+                         [('student-0', 3), ('student-1', 2), ('student-2', 1)])
+
+    def test_late_commits_within_the_settle_window_are_counted(self):
+        self.app.config['VIOLATION_ANALYTICS_SETTLE_SECONDS'] = 60
+        recent = datetime.utcnow() - timedelta(seconds=20)
+        self._add('attempt-2', ViolationType.RIGHT_CLICK, 1, recent)
+        db.session.commit()
+        self.assertEqual(ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+                         ['total_violations'], 5)
+        # Only settled violations are cached
+        self.assertEqual(cache.get('violations:analytics:quiz-1')['total'], 4)
+
+        # Detected before the last read but committed after it, e.g. behind
+        # an auto-submit: still inside the unsettled tail, so not missed
+        self._add('attempt-1', ViolationType.TAB_SWITCH, None, recent)
+        db.session.commit()
+        data = ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+        self.assertEqual(data['total_violations'], 6)
+
+        with patch.object(violation_analytics_service, 'datetime') as clock:
+            clock.utcnow.return_value = datetime.utcnow() + timedelta(minutes=2)
+            clock.fromisoformat = datetime.fromisoformat
+            settled = ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+        self.assertEqual(settled['total_violations'], 6)
+        self.assertEqual(cache.get('violations:analytics:quiz-1')['total'], 6)
+
+    def test_deleting_an_attempt_drops_cached_analytics(self):
+        ViolationAnalyticsService.get_quiz_analytics('quiz-1')
+        db.session.delete(db.session.get(QuizAttempt, 'attempt-0'))
+        db.session.commit()
+
+        self.assertEqual(ViolationAnalyticsService.get_quiz_analytics('quiz-1')['total_violations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
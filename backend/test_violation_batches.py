@@ -0,0 +1,154 @@
+import os
+import unittest
+from unittest.mock import MagicMock
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db, socketio
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.violation import Violation
+from app.models.question import Question, QuestionType
+from app.models.student_answer import StudentAnswer
+from app.models.notification_event import NotificationEvent
+from app.modules.attempts.attempt_service import AttemptService
+
+
+class TestViolationBatches(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                    name='Teacher', role=UserRole.TEACHER)
+        db.session.add_all([user, Teacher(id=user.id, user=user)])
+        for i in range(2):
+            user = User(id=f'student-{i}', email=f's{i}@example.com', password_hash='x',
+                        name=f'Student {i}', role=UserRole.STUDENT)
+            db.session.add_all([user, Student(id=user.id, user=user,
+                                              registration_number=f'REG{i}')])
+        db.session.add_all([
+            Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                 time_limit_minutes=30, created_by='teacher-1',
+                 prevent_tab_switching=True, require_fullscreen=True),
+            QuizAttempt(id='attempt-0', quiz_id='quiz-1', student_id='student-0',
+                        total_marks=0)
+        ])
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _post_batch(self, violation_types, student_id='student-0'):
+        token = create_access_token(identity=student_id)
+        return self.client.post(
+            '/api/attempts/attempt-0/violations/batch',
+            json={'violations': [{'violation_type': violation_type, 'question_index': 0}
+                                 for violation_type in violation_types]},
+            headers={'Authorization': f'Bearer {token}'})
+
+    def _events(self, notification_type):
+        return NotificationEvent.query.filter_by(event_type=notification_type).count()
+
+    def test_burst_is_one_insert_and_one_counter_update(self):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self._post_batch(['focus_lost', 'tab_switch'])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()
+        self.assertEqual(data['total_violations'], 2)
+        self.assertFalse(data['auto_submitted'])
+        self.assertEqual([v['violation_type'] for v in data['violations']],
+                         ['focus_lost', 'tab_switch'])
+
+        self.assertEqual(len([s for s in statements if s.startswith('INSERT INTO violations')]), 1)
+        self.assertEqual(len([s for s in statements if s.startswith('UPDATE quiz_attempts')
+                              and 'total_violations' in s]), 1)
+        self.assertEqual(Violation.query.count(), 2)
+        self.assertEqual(self._events('violation_warning'), 1)
+
+        deltas = [c.args[1] for c in socketio.emit.call_args_list if c.args[0] == 'attempt_delta']
+        self.assertEqual(deltas[-1]['violations'], 2)
+
+    def test_only_the_crossing_batch_auto_submits(self):
+        self._post_batch(['focus_lost', 'tab_switch'])
+        data = self._post_batch(['fullscreen_exit', 'tab_switch']).get_json()
+        self.assertEqual(data['total_violations'], 4)
+        self.assertTrue(data['auto_submitted'])
+
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        self.assertEqual(attempt.status, AttemptStatus.AUTO_SUBMITTED)
+        self.assertTrue(attempt.auto_submitted_due_to_violations)
+        self.assertEqual(self._events('attempt_auto_submitted'), 1)
+
+        # Later bursts are rejected rather than counted or submitted again
+        response = self._post_batch(['tab_switch'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(db.session.get(QuizAttempt, 'attempt-0').total_violations, 4)
+        self.assertEqual(self._events('attempt_auto_submitted'), 1)
+
+    def test_auto_submitted_attempt_is_scored(self):
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        attempt.total_marks = 4
+        db.session.add_all([
+            Question(id='question-1', text='2 + 2?', type=QuestionType.MCQ, marks=3,
+                     options=['3', '4'], correct_answer=1, created_by='teacher-1'),
+            Question(id='question-2', text='3 + 3?', type=QuestionType.MCQ, marks=1,
+                     options=['6', '7'], correct_answer=0, created_by='teacher-1'),
+            StudentAnswer(attempt_id='attempt-0', question_id='question-1', answer_option=1),
+            StudentAnswer(attempt_id='attempt-0', question_id='question-2', answer_option=1)
+        ])
+        db.session.commit()
+
+        self.assertTrue(self._post_batch(['tab_switch'] * 4).get_json()['auto_submitted'])
+        db.session.expire_all()
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        self.assertEqual(attempt.status, AttemptStatus.AUTO_SUBMITTED)
+        self.assertEqual((float(attempt.score), float(attempt.percentage)), (3.0, 75.0))
+        self.assertTrue(attempt.passed)
+        self.assertIsNotNone(attempt.submitted_at)
+
+    def test_stale_loaded_attempt_does_not_lose_updates(self):
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        self.assertEqual(attempt.total_violations, 0)
+        # Another worker records two violations behind this session's back
+        db.session.execute(QuizAttempt.__table__.update().values(
+            total_violations=2, violation_score=2))
+
+        violation = AttemptService.record_violation('attempt-0', 'copy_attempt')
+        self.assertEqual(violation['violation_type'], 'copy_attempt')
+        self.assertEqual(attempt.total_violations, 3)
+        self.assertEqual(attempt.status, AttemptStatus.AUTO_SUBMITTED)
+
+    def test_rejects_invalid_batches(self):
+        self.assertEqual(self._post_batch(['tab_switch'], 'student-1').status_code, 400)
+        self.assertEqual(self._post_batch(['not_a_violation']).status_code, 400)
+        self.assertEqual(self._post_batch([]).status_code, 400)
+        self.assertEqual(Violation.query.count(), 0)
+        self.assertEqual(db.session.get(QuizAttempt, 'attempt-0').total_violations, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
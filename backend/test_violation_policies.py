@@ -0,0 +1,196 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db, socketio
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt, AttemptStatus
+from app.models.violation import Violation
+from app.modules.attempts.attempt_service import AttemptService
+from app.modules.quiz.quiz_service import QuizService
+from app.modules.student.student_service import StudentService
+from app.modules.teacher.access_code_service import AccessCodeService
+from app.services.violation_policy_service import (
+    ViolationPolicyService, ACTION_NONE, ACTION_WARN, ACTION_LOCK, ACTION_AUTO_SUBMIT)
+
+
+class TestViolationPolicyCompilation(unittest.TestCase):
+    def test_custom_policy_follows_security_settings(self):
+        # Without a policy every violation counts, whatever the settings
+        default = ViolationPolicyService.compile()
+        self.assertEqual(default.score(0, None, ['tab_switch', 'fullscreen_exit'],
+                                       datetime.utcnow()), 2)
+        self.assertEqual(default.action(2), ACTION_WARN)
+        self.assertEqual(default.action(3), ACTION_AUTO_SUBMIT)
+
+        relaxed = ViolationPolicyService.compile({'auto_submit_at': 5})
+        self.assertEqual(relaxed.score(0, None, ['tab_switch', 'fullscreen_exit'],
+                                       datetime.utcnow()), 0)
+
+        strict = ViolationPolicyService.compile({'auto_submit_at': 5}, prevent_tab_switching=True,
+                                                require_fullscreen=True)
+        self.assertEqual(strict.score(0, None, ['tab_switch', 'fullscreen_exit'],
+                                      datetime.utcnow()), 2)
+
+    def test_weights_decay_and_actions(self):
+        policy = ViolationPolicyService.compile({
+            'weights': {'copy_attempt': 2, 'right_click': 0.5},
+            'half_life_minutes': 1,
+            'warn_at': 1,
+            'lock_at': 3,
+            'auto_submit_at': 5
+        })
+        now = datetime.utcnow()
+        self.assertEqual(policy.severity('copy_attempt'), 'high')
+        self.assertEqual(policy.severity('right_click'), 'low')
+        self.assertEqual(policy.action(0.5), ACTION_NONE)
+        self.assertEqual(policy.action(3), ACTION_LOCK)
+
+        # A score of 4 a minute ago has decayed to 2 before the new weight is added
+        score = policy.score(4, now - timedelta(minutes=1), ['copy_attempt'], now)
+        self.assertAlmostEqual(score, 4)
+
+    def test_invalid_policies_are_rejected(self):
+        for policy in ({'weights': {'sneezing': 1}}, {'warn_at': -1}, {'lock_at': 'x'},
+                       {'auto_submit_at': None}, {'threshold': 3}, ['warn_at']):
+            with self.assertRaises(ValueError):
+                ViolationPolicyService.compile(policy)
+
+
+class TestViolationPolicies(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.original_emit = socketio.emit
+        socketio.emit = MagicMock()
+
+        user = User(id='teacher-1', email='t@example.com', password_hash='x',
+                    name='Teacher', role=UserRole.TEACHER)
+        db.session.add_all([user, Teacher(id=user.id, user=user)])
+        user = User(id='student-0', email='s0@example.com', password_hash='x',
+                    name='Student 0', role=UserRole.STUDENT)
+        db.session.add_all([
+            user, Student(id=user.id, user=user, registration_number='REG0'),
+            Quiz(id='quiz-1', title='Algebra', subject='Math', access_code='ABC123',
+                 time_limit_minutes=30, created_by='teacher-1', prevent_tab_switching=True,
+                 violation_policy={'weights': {'copy_attempt': 2}, 'warn_at': 1,
+                                   'lock_at': 2, 'auto_submit_at': 4}),
+            QuizAttempt(id='attempt-0', quiz_id='quiz-1', student_id='student-0',
+                        total_marks=0)
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        socketio.emit = self.original_emit
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _record(self, *violation_types):
+        return AttemptService.record_violations(
+            'attempt-0', [{'violation_type': violation_type}
+                          for violation_type in violation_types], student_id='student-0')
+
+    def test_lock_then_auto_submit(self):
+        result = self._record('tab_switch')
+        self.assertEqual((result['violation_score'], result['action']), (1, ACTION_WARN))
+
+        result = self._record('copy_attempt')
+        self.assertEqual((result['violation_score'], result['action']), (3, ACTION_LOCK))
+        self.assertTrue(result['locked'])
+        self.assertEqual(Violation.query.filter_by(severity='high').count(), 1)
+        with self.assertRaises(ValueError):
+            StudentService.submit_answer('student-0', 'attempt-0', 'question-1', {})
+
+        # The teacher's access code lifts the lock
+        code = AccessCodeService.generate_access_code('attempt-0', 'teacher-1')
+        self.assertTrue(AccessCodeService.verify_access_code('attempt-0', code))
+        self.assertIsNone(db.session.get(QuizAttempt, 'attempt-0').locked_at)
+
+        result = self._record('focus_lost')
+        self.assertEqual(result['action'], ACTION_AUTO_SUBMIT)
+        attempt = db.session.get(QuizAttempt, 'attempt-0')
+        self.assertEqual(attempt.status, AttemptStatus.AUTO_SUBMITTED)
+        self.assertEqual(attempt.violation_score, 4)
+
+    def test_locked_attempt_is_unlocked_through_the_api(self):
+        client = self.app.test_client()
+
+        def post(url, user, body=None):
+            return client.post(url, json=body or {}, headers={
+                'Authorization': f'Bearer {create_access_token(identity=user)}'})
+
+        answer = {'question_id': 'question-1', 'answer': 'x = 2'}
+        response = post('/api/attempts/attempt-0/violations/batch', 'student-0',
+                        {'violations': [{'violation_type': 'tab_switch'},
+                                        {'violation_type': 'copy_attempt'}]})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.get_json()['locked'])
+        response = post('/api/student/attempt/attempt-0/answer', 'student-0', answer)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('locked', response.get_json()['error'])
+
+        code = post('/api/access-codes/generate/attempt-0', 'teacher-1').get_json()['access_code']
+        response = post('/api/attempts/attempt-0/verify-access-code', 'student-0',
+                        {'accessCode': 'WRONG123'})
+        self.assertEqual(response.status_code, 401)
+        response = post('/api/attempts/attempt-0/verify-access-code', 'student-0',
+                        {'accessCode': code, 'deviceInfo': {'ip': '10.0.0.1'}})
+        self.assertEqual(response.status_code, 200)
+
+        response = post('/api/student/attempt/attempt-0/answer', 'student-0', answer)
+        self.assertEqual(response.status_code, 200)
+        # Codes are single use
+        response = post('/api/attempts/attempt-0/verify-access-code', 'student-0',
+                        {'accessCode': code})
+        self.assertEqual(response.status_code, 401)
+
+    def test_default_quiz_auto_submits_after_three_tab_switches(self):
+        db.session.add_all([
+            Quiz(id='quiz-2', title='Legacy', subject='Math', access_code='LEGACY',
+                 time_limit_minutes=30, created_by='teacher-1'),
+            QuizAttempt(id='attempt-2', quiz_id='quiz-2', student_id='student-0',
+                        total_marks=0)
+        ])
+        db.session.commit()
+
+        for expected in (ACTION_WARN, ACTION_WARN, ACTION_AUTO_SUBMIT):
+            result = AttemptService.record_violations(
+                'attempt-2', [{'violation_type': 'tab_switch'}], student_id='student-0')
+            self.assertEqual(result['action'], expected)
+        self.assertEqual(db.session.get(QuizAttempt, 'attempt-2').status,
+                         AttemptStatus.AUTO_SUBMITTED)
+
+    def test_evaluator_is_compiled_once_per_quiz_version(self):
+        self._record('right_click')
+        with patch.object(ViolationPolicyService, 'compile',
+                          wraps=ViolationPolicyService.compile) as compile_policy:
+            self._record('right_click')
+            compile_policy.assert_not_called()
+
+            QuizService.update_quiz('quiz-1', 'teacher-1', {
+                'violation_policy': {'weights': {'right_click': 0}, 'auto_submit_at': 10}})
+            compile_policy.reset_mock()
+            result = self._record('right_click')
+            compile_policy.assert_called_once()
+
+        self.assertEqual((result['violation_score'], result['action']), (2, ACTION_WARN))
+
+    def test_update_rejects_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            QuizService.update_quiz('quiz-1', 'teacher-1', {'violation_policy': {'lock_at': -1}})
+        self.assertEqual(db.session.get(Quiz, 'quiz-1').violation_policy['lock_at'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
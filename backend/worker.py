@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+# The worker serves no clients: publish to the Socket.IO message queue only
+os.environ.setdefault('SOCKETIO_WRITE_ONLY', 'True')
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'threading')
+
+from app import create_app, db
+from app.services.notification_service import NotificationService
+from app.services.notification_retention_service import NotificationRetentionService
+from app.services.mail_service import MailService
+from app.modules.teacher.access_code_service import AccessCodeService
+
+# Create the Flask app
+app = create_app()
+
+
+def run_outbox_worker():
+    """Poll the notification outbox until interrupted"""
+    batch_size = app.config['NOTIFICATION_OUTBOX_BATCH_SIZE']
+    interval = app.config['NOTIFICATION_OUTBOX_POLL_INTERVAL']
+
+    while True:
+        with app.app_context():
+            try:
+                processed = NotificationService.process_outbox(batch_size)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Notification outbox pass failed: {str(e)}")
+                processed = 0
+            finally:
+                db.session.remove()
+
+        # Drain a backlog back to back; otherwise wait for new events
+        if processed < batch_size:
+            time.sleep(interval)
+
+
+def run_mail_worker():
+    """Send queued emails until interrupted"""
+    batch_size = app.config['MAIL_QUEUE_BATCH_SIZE']
+    interval = app.config['MAIL_QUEUE_POLL_INTERVAL']
+
+    while True:
+        with app.app_context():
+            try:
+                sent = MailService.process_queue(batch_size)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Mail queue pass failed: {str(e)}")
+                sent = 0
+            finally:
+                db.session.remove()
+
+        if sent < batch_size:
+            time.sleep(interval)
+
+
+def run_retention_job():
+    """Purge aged-out notifications and access codes every retention interval,
+    and whenever an admin queues a cleanup"""
+    interval = app.config['NOTIFICATION_RETENTION_INTERVAL']
+    poll_interval = app.config['NOTIFICATION_OUTBOX_POLL_INTERVAL']
+    next_run = time.monotonic()
+
+    while True:
+        with app.app_context():
+            try:
+                requested = NotificationRetentionService.claim_requests()
+                if requested or time.monotonic() >= next_run:
+                    next_run = time.monotonic() + interval
+                    NotificationRetentionService.purge()
+                    AccessCodeService.purge_expired_codes()
+                    MailService.purge_sensitive()
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Notification retention run failed: {str(e)}")
+            finally:
+                db.session.remove()
+
+        time.sleep(poll_interval)
+
+
+if __name__ == '__main__':
+    print("Starting QuizMaster notification worker...")
+    print(f"Database URL: {app.config['SQLALCHEMY_DATABASE_URI']}")
+    print(f"Socket.IO message queue: {app.config['SOCKETIO_MESSAGE_QUEUE'] or 'none (in-process only)'}")
+    print(f"Notification retention runs every {app.config['NOTIFICATION_RETENTION_INTERVAL']:.0f}s")
+    if not app.config['SOCKETIO_MESSAGE_QUEUE']:
+        # Rows are still written and clients pick them up on their next sync,
+        # but live pushes from this process never reach the web servers
+        app.logger.warning("SOCKETIO_MESSAGE_QUEUE is not set: real-time notification "
+                           "and unread count emits from the worker are dropped")
+    threading.Thread(target=run_retention_job, daemon=True).start()
+    threading.Thread(target=run_mail_worker, daemon=True).start()
+    run_outbox_worker()